@@ -1,4 +1,5 @@
 from .aes import cifrar_ctr, descifrar_ctr, cifrar_ecb, descifrar_ecb, cifrar_cbc, descifrar_cbc
 from .dh import generar_par_claves_25519, generar_par_claves_secp256r1, calcular_secreto_compartido_25519, calcular_secreto_compartido_secp256r1
+from .dh import generar_pares_claves_25519, calcular_secretos_compartidos_25519
 from .kdf import derivar_clave
 from .crypto_system import SistemaCriptografico
\ No newline at end of file
@@ -0,0 +1,79 @@
+'''
+Herramienta de línea de comandos para cifrar y descifrar archivos con AES-128 en modo CTR, CBC o ECB.
+Los archivos se procesan por fragmentos de tamaño fijo, así que la memoria usada no depende de su tamaño.
+
+Ejemplos:
+    python -m src cifrar --modo ctr --clave 000102030405060708090a0b0c0d0e0f entrada.bin salida.bin
+    python -m src descifrar --modo cbc --clave <hex> --iv <hex> salida.bin recuperado.bin
+'''
+
+import argparse
+import os
+import secrets
+import sys
+import time
+from typing import List, Optional
+from .aes.aes_archivos import MODOS, TAMAÑO_FRAGMENTO, cifrar_archivo, descifrar_archivo
+
+
+def _hexadecimal(valor: str) -> bytes:
+
+    try:
+        return bytes.fromhex(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{valor}' no es una cadena hexadecimal válida")
+
+
+def crear_analizador() -> argparse.ArgumentParser:
+
+    analizador = argparse.ArgumentParser(prog='python -m src', description="Cifrado de archivos con AES-128")
+    subcomandos = analizador.add_subparsers(dest='operacion', required=True)
+
+    for operacion, ayuda in (('cifrar', "Cifra un archivo"), ('descifrar', "Descifra un archivo")):
+        sub = subcomandos.add_parser(operacion, help=ayuda)
+        sub.add_argument('entrada', help="Archivo de entrada")
+        sub.add_argument('salida', help="Archivo de salida")
+        sub.add_argument('--modo', choices=MODOS, default='ctr', help="Modo de operación (por defecto ctr)")
+        sub.add_argument('--clave', type=_hexadecimal, required=True, help="Clave de 16 bytes en hexadecimal")
+        sub.add_argument('--nonce', type=_hexadecimal, help="Nonce del modo CTR en hexadecimal (al menos 8 bytes)")
+        sub.add_argument('--iv', type=_hexadecimal, help="Vector inicial del modo CBC en hexadecimal (16 bytes)")
+        sub.add_argument('--fragmento', type=int, default=TAMAÑO_FRAGMENTO,
+                         help=f"Tamaño de fragmento en bytes, múltiplo de 16 (por defecto {TAMAÑO_FRAGMENTO})")
+
+    return analizador
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+
+    args = crear_analizador().parse_args(argumentos)
+    valor_inicial = args.nonce if args.modo == 'ctr' else args.iv if args.modo == 'cbc' else None
+
+    # Al cifrar sin nonce o vector inicial se genera uno aleatorio y se muestra para poder descifrar después
+    if valor_inicial is None and args.modo != 'ecb':
+        if args.operacion == 'descifrar':
+            print(f"Error: el modo {args.modo.upper()} necesita --{'nonce' if args.modo == 'ctr' else 'iv'}", file=sys.stderr)
+            return 2
+        valor_inicial = secrets.token_bytes(8 if args.modo == 'ctr' else 16)
+        print(f"{'Nonce' if args.modo == 'ctr' else 'Vector inicial'} generado: {valor_inicial.hex()}", file=sys.stderr)
+
+    funcion = cifrar_archivo if args.operacion == 'cifrar' else descifrar_archivo
+
+    try:
+        # Se mide antes de procesar: la salida puede sustituir a la propia entrada
+        leidos = os.path.getsize(args.entrada)
+        inicio = time.perf_counter()
+        escritos = funcion(args.modo, args.entrada, args.salida, args.clave, valor_inicial, args.fragmento)
+        tiempo = time.perf_counter() - inicio
+    except (ValueError, TypeError, OSError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+    rendimiento = leidos / tiempo / (1024 * 1024) if tiempo > 0 else 0.0
+    print(f"{leidos} bytes leídos, {escritos} bytes escritos en {tiempo:.3f} segundos ({rendimiento:.2f} MB/s)",
+          file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
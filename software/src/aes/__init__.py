@@ -1,3 +1,9 @@
-from .aes_ctr import cifrar_ctr, descifrar_ctr
-from .aes_ecb import cifrar_ecb, descifrar_ecb
-from .aes_cbc import cifrar_cbc, descifrar_cbc
+from .aes_ctr import cifrar_ctr, descifrar_ctr, descifrar_ctr_rango, generar_flujo_clave, cifrar_ctr_into, descifrar_ctr_into, cifrar_ctr_lote, descifrar_ctr_lote
+from .aes_ecb import cifrar_ecb, descifrar_ecb, cifrar_ecb_into, descifrar_ecb_into
+from .aes_cbc import cifrar_cbc, descifrar_cbc, cifrar_cbc_into, descifrar_cbc_into
+from .aes_clave import ClaveAES, obtener_clave, estadisticas_cache_claves, limpiar_cache_claves
+from .aes_paralelo import cifrar_ctr_paralelo, descifrar_ctr_paralelo, descifrar_cbc_paralelo
+from .aes_archivos import cifrar_archivo, descifrar_archivo
+from .aes_sesion import SesionCTR
+from .aes_motores import registrar_motor, obtener_motor, motores_disponibles
+from .aes_gcm import cifrar_gcm, descifrar_gcm
@@ -0,0 +1,120 @@
+"""
+Este módulo cifra y descifra archivos de cualquier tamaño con AES-128 en modo CTR, CBC o ECB con memoria acotada.
+La entrada se proyecta en memoria con mmap y se recorre en fragmentos de tamaño fijo, que se cifran
+con las funciones *_into sobre un único búfer reutilizado. El contador CTR y el bloque de encadenamiento
+CBC se arrastran entre fragmentos, por lo que el archivo de salida es idéntico al que producirían las
+funciones en memoria (cifrar_ctr, cifrar_cbc, cifrar_ecb) sobre el archivo completo.
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+import traceback
+from typing import Union, List, Optional
+from .aes_clave import ClaveAES, obtener_clave
+from .aes_ctr import cifrar_ctr_into
+from .aes_cbc import cifrar_cbc_into, descifrar_cbc_into
+from .aes_ecb import cifrar_ecb_into, descifrar_ecb_into
+
+MODOS: tuple = ('ctr', 'cbc', 'ecb')
+TAMAÑO_FRAGMENTO: int = 4 * 1024 * 1024
+
+
+def _procesar_fragmentos(cifrar: bool, modo: str, archivo_entrada, archivo_salida, clave_aes: ClaveAES,
+                         valor_inicial: Optional[bytes], tamaño_fragmento: int) -> int:
+    # Recorre la entrada por fragmentos y escribe cada resultado en la salida. Devuelve los bytes escritos.
+
+    bufer = bytearray(tamaño_fragmento + 16)  # Espacio extra para el bloque de relleno final
+    escritos = 0
+    longitud = archivo_entrada.seek(0, 2)
+    proyeccion = mmap.mmap(archivo_entrada.fileno(), 0, access=mmap.ACCESS_READ) if longitud else None
+
+    try:
+        if proyeccion is not None and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            proyeccion.madvise(mmap.MADV_SEQUENTIAL)
+        encadenamiento = valor_inicial
+
+        # Las vistas se liberan también cuando un fragmento falla: mmap no se puede cerrar mientras
+        # queden vistas exportadas y el BufferError ocultaría el error original
+        with memoryview(proyeccion) if proyeccion is not None else memoryview(b'') as vista:
+            # Un archivo vacío también se recorre una vez para producir el bloque de relleno
+            for inicio in range(0, max(longitud, 1), tamaño_fragmento):
+                fin = min(inicio + tamaño_fragmento, longitud)
+                ultimo = fin == longitud
+
+                with vista[inicio:fin] as fragmento:
+                    if modo == 'ctr':
+                        n = cifrar_ctr_into(fragmento, bufer, clave_aes, valor_inicial, inicio // 16)
+                    elif modo == 'cbc' and cifrar:
+                        n = cifrar_cbc_into(fragmento, bufer, clave_aes, encadenamiento, rellenar=ultimo)
+                        encadenamiento = bytes(bufer[n - 16:n]) if n else encadenamiento
+                    elif modo == 'cbc':
+                        siguiente = bytes(fragmento[-16:])
+                        n = descifrar_cbc_into(fragmento, bufer, clave_aes, encadenamiento, quitar_relleno=ultimo)
+                        encadenamiento = siguiente
+                    elif cifrar:
+                        n = cifrar_ecb_into(fragmento, bufer, clave_aes, rellenar=ultimo)
+                    else:
+                        n = descifrar_ecb_into(fragmento, bufer, clave_aes, quitar_relleno=ultimo)
+
+                archivo_salida.write(memoryview(bufer)[:n])
+                escritos += n
+    except BaseException as error:
+        # La función *_into que falla deja en su marco de la traza su propia vista del fragmento;
+        # se vacían esos marcos para que no queden vistas exportadas al cerrar la proyección
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        if proyeccion is not None:
+            proyeccion.close()
+
+    return escritos
+
+
+def _procesar_archivo(cifrar: bool, modo: str, ruta_entrada: str, ruta_salida: str,
+                      clave: Union[List[int], bytes, ClaveAES], valor_inicial: Optional[bytes],
+                      tamaño_fragmento: int) -> int:
+    # Valida los parámetros y procesa la entrada hacia la salida. Devuelve los bytes escritos.
+
+    if modo not in MODOS:
+        raise ValueError(f"Modo no soportado. Usa uno de {', '.join(MODOS)}.")
+    if tamaño_fragmento <= 0 or tamaño_fragmento % 16 != 0:
+        raise ValueError("El tamaño de fragmento debe ser un múltiplo positivo de 16 bytes")
+    if modo in ('ctr', 'cbc') and valor_inicial is None:
+        raise ValueError("Los modos CTR y CBC necesitan un nonce o vector inicial")
+
+    clave_aes = obtener_clave(clave)
+
+    with open(ruta_entrada, 'rb') as archivo_entrada:
+        # La salida se escribe en un temporal del mismo directorio y solo sustituye al destino al terminar:
+        # así la entrada y la salida pueden ser el mismo archivo y un fallo a medias no deja una salida truncada
+        directorio = os.path.dirname(os.path.abspath(ruta_salida))
+        descriptor, ruta_temporal = tempfile.mkstemp(prefix=f".{os.path.basename(ruta_salida)}.", dir=directorio)
+
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo_salida:
+                escritos = _procesar_fragmentos(cifrar, modo, archivo_entrada, archivo_salida, clave_aes,
+                                                valor_inicial, tamaño_fragmento)
+            if os.path.exists(ruta_salida):
+                shutil.copymode(ruta_salida, ruta_temporal)
+            os.replace(ruta_temporal, ruta_salida)
+        except BaseException:
+            if os.path.exists(ruta_temporal):
+                os.unlink(ruta_temporal)
+            raise
+
+    return escritos
+
+
+def cifrar_archivo(modo: str, ruta_entrada: str, ruta_salida: str, clave: Union[List[int], bytes, ClaveAES],
+                   valor_inicial: Optional[bytes] = None, tamaño_fragmento: int = TAMAÑO_FRAGMENTO) -> int:
+    # valor_inicial es el nonce en CTR y el vector inicial en CBC; ECB no lo usa
+
+    return _procesar_archivo(True, modo, ruta_entrada, ruta_salida, clave, valor_inicial, tamaño_fragmento)
+
+
+def descifrar_archivo(modo: str, ruta_entrada: str, ruta_salida: str, clave: Union[List[int], bytes, ClaveAES],
+                      valor_inicial: Optional[bytes] = None, tamaño_fragmento: int = TAMAÑO_FRAGMENTO) -> int:
+
+    return _procesar_archivo(False, modo, ruta_entrada, ruta_salida, clave, valor_inicial, tamaño_fragmento)
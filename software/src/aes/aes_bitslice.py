@@ -0,0 +1,219 @@
+"""
+Este módulo implementa un motor AES-128 con bitslicing sobre enteros de Python, sin NumPy y con un
+SubBytes sin tablas de búsqueda. Un lote de N bloques se transpone en 8 planos de bits, uno por
+cada bit de byte: el plano b es un entero de 16N bits cuyo segmento k (bits [kN, (k+1)N)) contiene el bit b
+del byte k de todos los bloques. Así cada operación &, ^ sobre los planos procesa los 16N bytes a la vez:
+
+- SubBytes es un circuito booleano: la inversa en GF(2^8) como x^254 (cuatro multiplicaciones y
+  elevaciones al cuadrado, que son lineales) seguida de la transformación afín.
+- ShiftRows y MixColumns mueven segmentos completos con desplazamientos y máscaras.
+- AddRoundKey es una XOR con planos de clave en los que cada bit se repite en todo su segmento.
+
+La transposición usa bytes.translate para convertir cada bit en un carácter '0'/'1' e int(texto, 2).
+
+Solo las rondas están libres de búsquedas indexadas por datos secretos. La transposición indexa una tabla
+de traducción con cada byte de entrada (el texto plano en ECB), y las claves de ronda salen de la
+expansión de clave con S-box por tablas de expandir_clave_palabras.
+"""
+
+import struct
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+from .aes_common import multiplicacion_galois
+
+# Por encima de este tamaño de lote los enteros dejan de caber en caché y el rendimiento no mejora
+BLOQUES_POR_LOTE_BITSLICE: int = 1 << 12
+
+Planos = List[int]
+
+# Traducen cada byte al carácter '1' o '0' según su bit b, y de vuelta al valor 1 << b
+_TABLAS_ENTRADA = [bytes(0x31 if (v >> b) & 1 else 0x30 for v in range(256)) for b in range(8)]
+_TABLAS_SALIDA = [bytes((1 << b) if v == 0x31 else 0 for v in range(256)) for b in range(8)]
+
+
+def _matriz_potencia(exponente: int) -> Tuple[Tuple[int, ...], ...]:
+    # x -> x^(2^k) es lineal en GF(2^8). Para cada bit de salida devuelve los bits de entrada que lo forman.
+
+    imagenes = []
+    for i in range(8):
+        v = 1 << i
+        for _ in range(exponente):
+            v = multiplicacion_galois(v, v)
+        imagenes.append(v)
+
+    return tuple(tuple(i for i in range(8) if (imagenes[i] >> j) & 1) for j in range(8))
+
+
+_CUADRADO = _matriz_potencia(1)
+_POTENCIA_4 = _matriz_potencia(2)
+_POTENCIA_16 = _matriz_potencia(4)
+
+
+def _lineal(planos: Planos, matriz: Tuple[Tuple[int, ...], ...]) -> Planos:
+
+    salida = []
+    for entradas in matriz:
+        v = 0
+        for i in entradas:
+            v ^= planos[i]
+        salida.append(v)
+
+    return salida
+
+
+def _multiplicar(a: Planos, b: Planos) -> Planos:
+    # Producto en GF(2^8): multiplicación de polinomios y reducción con x^8 = x^4 + x^3 + x + 1
+
+    c = [0] * 15
+    for i in range(8):
+        ai = a[i]
+        for j in range(8):
+            c[i + j] ^= ai & b[j]
+
+    for k in range(14, 7, -1):
+        ck = c[k]
+        c[k - 4] ^= ck
+        c[k - 5] ^= ck
+        c[k - 7] ^= ck
+        c[k - 8] ^= ck
+
+    return c[:8]
+
+
+def _sustituir_bytes(x: Planos, todo: int) -> Planos:
+    # Inversa multiplicativa como x^254 (el 0 va al 0) y después la transformación afín de la S-box
+
+    x2 = _lineal(x, _CUADRADO)
+    x3 = _multiplicar(x2, x)
+    x12 = _lineal(x3, _POTENCIA_4)
+    x15 = _multiplicar(x12, x3)
+    x240 = _lineal(x15, _POTENCIA_16)
+    x252 = _multiplicar(x240, x12)
+    b = _multiplicar(x252, x2)
+
+    # s_j = b_j ^ b_(j+4) ^ b_(j+5) ^ b_(j+6) ^ b_(j+7) ^ bit j de 0x63
+    s = [b[j] ^ b[(j + 4) % 8] ^ b[(j + 5) % 8] ^ b[(j + 6) % 8] ^ b[(j + 7) % 8] for j in range(8)]
+    for j in (0, 1, 5, 6):
+        s[j] ^= todo
+
+    return s
+
+
+def _grupos_desplazamiento(origen: Sequence[int], n: int) -> Tuple[Tuple[int, int], ...]:
+    # Agrupa los segmentos de salida por la distancia a su segmento de origen: (bits a desplazar, máscara)
+
+    grupos = {}
+    for k, fuente in enumerate(origen):
+        grupos[fuente - k] = grupos.get(fuente - k, 0) | (((1 << n) - 1) << (k * n))
+
+    return tuple((distancia * n, mascara) for distancia, mascara in grupos.items())
+
+
+@lru_cache(maxsize=8)
+def _preparar_lote(n: int):
+    # Máscaras que solo dependen del número de bloques del lote
+
+    todo = (1 << (16 * n)) - 1
+    # ShiftRows: el byte (fila r, columna c) viene de (r, c + r); el byte k = r + 4c
+    desplazar_filas = _grupos_desplazamiento([k % 4 + 4 * ((k // 4 + k % 4) % 4) for k in range(16)], n)
+    # Rotaciones de filas dentro de cada columna para MixColumns
+    rotar_1 = _grupos_desplazamiento([(k + 1) % 4 + 4 * (k // 4) for k in range(16)], n)
+    rotar_2 = _grupos_desplazamiento([(k + 2) % 4 + 4 * (k // 4) for k in range(16)], n)
+    segmentos = [((1 << n) - 1) << (k * n) for k in range(16)]
+
+    return todo, desplazar_filas, rotar_1, rotar_2, segmentos
+
+
+def _mover(x: int, grupos: Tuple[Tuple[int, int], ...]) -> int:
+
+    salida = 0
+    for desplazamiento, mascara in grupos:
+        if desplazamiento >= 0:
+            salida |= (x >> desplazamiento) & mascara
+        else:
+            salida |= (x << -desplazamiento) & mascara
+
+    return salida
+
+
+def _mezclar_columnas(a: Planos, rotar_1, rotar_2) -> Planos:
+    # out_r = 2·a_r ^ 3·a_(r+1) ^ a_(r+2) ^ a_(r+3) = xtime(t) ^ a_(r+1) ^ t_(r+2), con t_r = a_r ^ a_(r+1)
+
+    a1 = [_mover(p, rotar_1) for p in a]
+    t = [p ^ q for p, q in zip(a, a1)]
+    t2 = [_mover(p, rotar_2) for p in t]
+    # xtime sobre planos: desplazar un bit y reducir con 0x1B
+    t7 = t[7]
+    doble = [t7, t[0] ^ t7, t[1], t[2] ^ t7, t[3] ^ t7, t[4], t[5], t[6]]
+
+    return [doble[j] ^ a1[j] ^ t2[j] for j in range(8)]
+
+
+def _planos_clave(palabras_clave: Sequence[int], segmentos: List[int]) -> List[Planos]:
+    # Cada bit de la clave de ronda se repite en todo su segmento, con una máscara en lugar de una rama
+
+    claves = []
+    for ronda in range(11):
+        clave_ronda = struct.pack('>4I', *palabras_clave[4 * ronda:4 * ronda + 4])
+        planos = [0] * 8
+        for k, byte in enumerate(clave_ronda):
+            for b in range(8):
+                planos[b] |= segmentos[k] & -((byte >> b) & 1)
+        claves.append(planos)
+
+    return claves
+
+
+def transponer(datos: bytes, n: int) -> Planos:
+    # N bloques de 16 bytes -> 8 planos. Los bytes se agrupan por posición (k de 15 a 0) y cada bit se
+    # convierte en un carácter para leerlo con int(_, 2); el bloque i queda en el bit k·N + (N - 1 - i).
+
+    agrupados = b''.join(datos[k::16] for k in range(15, -1, -1))
+
+    return [int(agrupados.translate(_TABLAS_ENTRADA[b]), 2) for b in range(8)]
+
+
+def destransponer(planos: Planos, n: int) -> bytes:
+    # Inversa de transponer
+
+    longitud = 16 * n
+    acumulado = 0
+    for b in range(8):
+        texto = format(planos[b], f'0{longitud}b').encode('ascii')
+        acumulado |= int.from_bytes(texto.translate(_TABLAS_SALIDA[b]), 'big')
+
+    agrupados = acumulado.to_bytes(longitud, 'big')
+    salida = bytearray(longitud)
+    for k in range(16):
+        salida[k::16] = agrupados[(15 - k) * n:(16 - k) * n]
+
+    return bytes(salida)
+
+
+def cifrar_lote(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Cifra len(datos) // 16 bloques a la vez
+
+    n = len(datos) // 16
+    todo, desplazar_filas, rotar_1, rotar_2, segmentos = _preparar_lote(n)
+    claves = _planos_clave(palabras_clave, segmentos)
+    estado = [p ^ k for p, k in zip(transponer(datos, n), claves[0])]
+
+    for ronda in range(1, 11):
+        estado = _sustituir_bytes(estado, todo)
+        estado = [_mover(p, desplazar_filas) for p in estado]
+        if ronda != 10:
+            estado = _mezclar_columnas(estado, rotar_1, rotar_2)
+        estado = [p ^ k for p, k in zip(estado, claves[ronda])]
+
+    return destransponer(estado, n)
+
+
+def cifrar_bloques(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Equivalente con bitslicing de aes_tablas.cifrar_bloques para datos de longitud múltiplo de 16
+
+    bytes_por_lote = BLOQUES_POR_LOTE_BITSLICE * 16
+
+    return b''.join(
+        cifrar_lote(datos[inicio:inicio + bytes_por_lote], palabras_clave)
+        for inicio in range(0, len(datos), bytes_por_lote)
+    )
@@ -1,16 +1,49 @@
 # Este módulo proporciona funciones para cifrar y descifrar datos utilizando AES-128 en modo CBC (). 
 
-from typing import Union, List
-from .aes_common import (
-    sustituir_bytes, sustituir_bytes_inverso, desplazar_filas, desplazar_filas_inverso,
-    multiplicacion_galois, mezclar_columnas, mezclar_columnas_inverso, agregar_clave_ronda,
-    expandir_clave, padding, quitar_padding
-)
+from typing import Union, List, Sequence, Optional
+import struct
+from .aes_common import padding, quitar_padding, vista_lectura, vista_escritura, BYTES_POR_FRAGMENTO
+from .aes_tablas import cifrar_palabras, descifrar_palabras
+from .aes_clave import ClaveAES, obtener_clave
+from . import aes_numpy, aes_motores
 
-def cifrar_cbc(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes], vector_inicial: bytes) -> bytes:
 
-    if len(clave) != 16:
-        raise ValueError("La clave debe tener 16 bytes de longitud")
+def cifrar_bloques_cbc(datos: bytes, palabras_clave: Sequence[int], vector_inicial: bytes) -> bytes:
+    # Cifra los bloques encadenados, ya rellenados. El último bloque devuelto es el siguiente vector de encadenamiento.
+
+    texto_cifrado: List[int] = []
+    p0, p1, p2, p3 = struct.unpack('>4I', vector_inicial)
+
+    # Cada bloque se combina con el bloque cifrado anterior antes de cifrarse
+    for s0, s1, s2, s3 in struct.iter_unpack('>4I', datos):
+        p0, p1, p2, p3 = cifrar_palabras(s0 ^ p0, s1 ^ p1, s2 ^ p2, s3 ^ p3, palabras_clave)
+        texto_cifrado.extend((p0, p1, p2, p3))
+
+    return struct.pack(f'>{len(texto_cifrado)}I', *texto_cifrado)
+
+
+def descifrar_bloques_cbc(datos: bytes, palabras_descifrado: Sequence[int], vector_inicial: bytes) -> bytes:
+    # Descifra los bloques encadenados sin quitar el relleno.
+    # Cada P_i solo depende de C_i y C_{i-1}, así que con muchos bloques se descifran todos juntos con NumPy.
+
+    if aes_numpy.NUMPY_DISPONIBLE and len(datos) // 16 >= aes_numpy.UMBRAL_BLOQUES_NUMPY:
+        return aes_numpy.descifrar_cbc_bloques(datos, palabras_descifrado, vector_inicial)
+
+    texto_plano: List[int] = []
+    p0, p1, p2, p3 = struct.unpack('>4I', vector_inicial)
+
+    for c0, c1, c2, c3 in struct.iter_unpack('>4I', datos):
+        d0, d1, d2, d3 = descifrar_palabras(c0, c1, c2, c3, palabras_descifrado)
+        texto_plano.extend((d0 ^ p0, d1 ^ p1, d2 ^ p2, d3 ^ p3))
+        p0, p1, p2, p3 = c0, c1, c2, c3
+
+    return struct.pack(f'>{len(texto_plano)}I', *texto_plano)
+
+
+def cifrar_cbc(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES], vector_inicial: bytes,
+               motor: Optional[str] = None) -> bytes:
+
+    clave_aes = obtener_clave(clave)
     
     if isinstance(texto_plano, str):
         texto_plano = texto_plano.encode()
@@ -19,37 +52,19 @@ def cifrar_cbc(texto_plano: Union[str, List[int], bytes], clave: Union[str, List
 
     if not isinstance(texto_plano, bytes):
         raise TypeError("El texto plano debe ser bytes, una lista de enteros o una cadena")
+
+    if len(vector_inicial) != 16:
+        raise ValueError("El vector inicial debe tener 16 bytes de longitud")
     
     texto_plano = padding(texto_plano)
-    clave_expandida = expandir_clave(list(clave))
-    texto_cifrado = bytearray()
-    bloque_previo = vector_inicial
-
-    for i in range(0, len(texto_plano), 16):
-        bloque = bytearray(texto_plano[i:i+16])
-        bloque = bytes([b ^ p for b, p in zip(bloque, bloque_previo)])
-        bloque = agregar_clave_ronda(bloque, clave_expandida[:16])
-        
-        for ronda in range(1, 10):
-            bloque = sustituir_bytes(bloque)
-            bloque = desplazar_filas(bloque)
-            bloque = mezclar_columnas(bloque)
-            bloque = agregar_clave_ronda(bloque, clave_expandida[ronda*16:(ronda+1)*16])
-        
-        bloque = sustituir_bytes(bloque)
-        bloque = desplazar_filas(bloque)
-        bloque = agregar_clave_ronda(bloque, clave_expandida[-16:])
-
-        texto_cifrado.extend(bloque)
-        bloque_previo = bloque
-    
-    return bytes(texto_cifrado)
 
+    return aes_motores.obtener_motor(motor).cifrar_cbc(texto_plano, clave_aes, vector_inicial)
 
-def descifrar_cbc(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes], vector_inicial: bytes) -> bytes:
+
+def descifrar_cbc(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES], vector_inicial: bytes,
+                  motor: Optional[str] = None) -> bytes:
     
-    if len(clave) != 16:
-        raise ValueError("La clave debe tener 16 bytes de longitud")
+    clave_aes = obtener_clave(clave)
     
     if isinstance(texto_cifrado, str):
         try:
@@ -65,26 +80,72 @@ def descifrar_cbc(texto_cifrado: Union[str, List[int], bytes], clave: Union[str,
     if len(texto_cifrado) % 16 != 0:
         raise ValueError("La longitud del texto cifrado debe ser múltiplo de 16 bytes")
 
-    clave_expandida = expandir_clave(list(clave))
-    texto_plano_rellenado = bytearray()
-    bloque_previo = vector_inicial
-
-    for i in range(0, len(texto_cifrado), 16):
-        bloque = bytearray(texto_cifrado[i:i+16])
-        bloque_descifrado = bloque.copy()
-        bloque_descifrado = agregar_clave_ronda(bloque_descifrado, clave_expandida[-16:])
-        
-        for ronda in range(9, 0, -1):
-            bloque_descifrado = desplazar_filas_inverso(bloque_descifrado)
-            bloque_descifrado = sustituir_bytes_inverso(bloque_descifrado)
-            bloque_descifrado = agregar_clave_ronda(bloque_descifrado, clave_expandida[ronda*16:(ronda+1)*16])
-            bloque_descifrado = mezclar_columnas_inverso(bloque_descifrado)
-        
-        bloque_descifrado = desplazar_filas_inverso(bloque_descifrado)
-        bloque_descifrado = sustituir_bytes_inverso(bloque_descifrado)
-        bloque_descifrado = agregar_clave_ronda(bloque_descifrado, clave_expandida[:16])
-        bloque_descifrado = bytes([d ^ p for d, p in zip(bloque_descifrado, bloque_previo)])
-        texto_plano_rellenado.extend(bloque_descifrado)
-        bloque_previo = bloque
-    
-    return quitar_padding(bytes(texto_plano_rellenado))
\ No newline at end of file
+    if len(vector_inicial) != 16:
+        raise ValueError("El vector inicial debe tener 16 bytes de longitud")
+
+    texto_plano_rellenado = aes_motores.obtener_motor(motor).descifrar_cbc(texto_cifrado, clave_aes, vector_inicial)
+
+    return quitar_padding(texto_plano_rellenado)
+
+
+def cifrar_cbc_into(origen, destino, clave: Union[str, List[int], bytes, ClaveAES], vector_inicial: bytes,
+                    rellenar: bool = True) -> int:
+    # Cifra cualquier objeto con protocolo de búfer directamente en el búfer escribible destino.
+    # El relleno PKCS7 solo se construye para el último bloque. Devuelve el número de bytes escritos.
+
+    clave_aes = obtener_clave(clave)
+    entrada = vista_lectura(origen)
+    longitud = len(entrada)
+
+    if len(vector_inicial) != 16:
+        raise ValueError("El vector inicial debe tener 16 bytes de longitud")
+    if not rellenar and longitud % 16 != 0:
+        raise ValueError("Sin relleno, la longitud del texto plano debe ser múltiplo de 16 bytes")
+
+    completos = longitud - longitud % 16
+    longitud_salida = completos + 16 if rellenar else completos
+    salida = vista_escritura(destino, longitud_salida)
+    palabras_clave = clave_aes.palabras_cifrado
+    anterior = bytes(vector_inicial)
+
+    for inicio in range(0, completos, BYTES_POR_FRAGMENTO):
+        fin = min(inicio + BYTES_POR_FRAGMENTO, completos)
+        fragmento_cifrado = cifrar_bloques_cbc(entrada[inicio:fin], palabras_clave, anterior)
+        salida[inicio:fin] = fragmento_cifrado
+        anterior = fragmento_cifrado[-16:]
+
+    if rellenar:
+        salida[completos:longitud_salida] = cifrar_bloques_cbc(padding(bytes(entrada[completos:])), palabras_clave, anterior)
+
+    return longitud_salida
+
+
+def descifrar_cbc_into(origen, destino, clave: Union[str, List[int], bytes, ClaveAES], vector_inicial: bytes,
+                       quitar_relleno: bool = True) -> int:
+    # Descifra en el búfer destino (puede ser el mismo que el origen). Devuelve la longitud del texto plano,
+    # sin el relleno si quitar_relleno.
+
+    clave_aes = obtener_clave(clave)
+    entrada = vista_lectura(origen)
+    longitud = len(entrada)
+
+    if longitud % 16 != 0:
+        raise ValueError("La longitud del texto cifrado debe ser múltiplo de 16 bytes")
+    if len(vector_inicial) != 16:
+        raise ValueError("El vector inicial debe tener 16 bytes de longitud")
+
+    salida = vista_escritura(destino, longitud)
+    palabras_descifrado = clave_aes.palabras_descifrado
+    anterior = bytes(vector_inicial)
+
+    for inicio in range(0, longitud, BYTES_POR_FRAGMENTO):
+        fin = min(inicio + BYTES_POR_FRAGMENTO, longitud)
+        # Se guarda el último bloque cifrado antes de escribir, por si origen y destino coinciden
+        siguiente = bytes(entrada[fin - 16:fin])
+        salida[inicio:fin] = descifrar_bloques_cbc(entrada[inicio:fin], palabras_descifrado, anterior)
+        anterior = siguiente
+
+    if quitar_relleno and longitud:
+        return longitud - 16 + len(quitar_padding(bytes(salida[longitud - 16:longitud])))
+
+    return longitud
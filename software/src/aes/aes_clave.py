@@ -0,0 +1,60 @@
+"""
+Este módulo define la clave AES-128 expandida reutilizable. Un objeto ClaveAES guarda las claves de ronda
+de cifrado y de descifrado como palabras de 32 bits empaquetadas, de modo que los modos de operación
+pueden reutilizarlas entre llamadas. Las claves que llegan como bytes pasan por una caché LRU acotada.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Union, List
+from .aes_tablas import expandir_clave_palabras, expandir_clave_descifrado
+
+TAMAÑO_CACHE_CLAVES: int = 256
+
+
+class ClaveAES:
+
+    __slots__ = ('palabras_cifrado', 'palabras_descifrado', 'funciones_compiladas')
+
+    def __init__(self, clave: Union[bytes, bytearray, List[int]]):
+
+        if len(clave) != 16:
+            raise ValueError("La clave debe tener 16 bytes de longitud")
+
+        palabras = expandir_clave_palabras(clave)
+        self.palabras_cifrado = array('I', palabras)
+        self.palabras_descifrado = array('I', expandir_clave_descifrado(palabras))
+        # Funciones de cifrado especializadas para esta clave; aes_compilado las genera bajo demanda
+        self.funciones_compiladas = None
+
+    def __repr__(self) -> str:
+        # No se muestra el material de clave
+        return f"<ClaveAES en 0x{id(self):x}>"
+
+
+@lru_cache(maxsize=TAMAÑO_CACHE_CLAVES)
+def _expandir_clave_en_cache(clave: bytes) -> ClaveAES:
+
+    return ClaveAES(clave)
+
+
+def obtener_clave(clave: Union[str, List[int], bytes, ClaveAES]) -> ClaveAES:
+    # Devuelve la clave expandida, reutilizando la de la caché si la clave ya se usó antes
+
+    if isinstance(clave, ClaveAES):
+        return clave
+    if len(clave) != 16:
+        raise ValueError("La clave debe tener 16 bytes de longitud")
+
+    return _expandir_clave_en_cache(bytes(clave))
+
+
+def estadisticas_cache_claves():
+    # Aciertos, fallos, tamaño máximo y ocupación actual de la caché
+
+    return _expandir_clave_en_cache.cache_info()
+
+
+def limpiar_cache_claves() -> None:
+
+    _expandir_clave_en_cache.cache_clear()
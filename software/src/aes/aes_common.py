@@ -6,6 +6,9 @@ esenciales para el cifrado y descifrado AES, además de añadir o quitar padding
 
 from typing import List
 
+# Tamaño de los fragmentos con que se recorren los búferes grandes para acotar la memoria temporal
+BYTES_POR_FRAGMENTO: int = 1 << 18
+
 sbox: List[int] = [
     0x63, 0x7C, 0x77, 0x7B, 0xF2, 0x6B, 0x6F, 0xC5, 0x30, 0x01, 0x67, 0x2B, 0xFE, 0xD7, 0xAB, 0x76,
     0xCA, 0x82, 0xC9, 0x7D, 0xFA, 0x59, 0x47, 0xF0, 0xAD, 0xD4, 0xA2, 0xAF, 0x9C, 0xA4, 0x72, 0xC0,
@@ -87,6 +90,11 @@ def multiplicacion_galois(a: int, b: int) -> int:
 # Precalculamos las multiplicaciones por 2 y 3 para optimizar
 mul2: List[int] = [multiplicacion_galois(i, 2) for i in range(256)]
 mul3: List[int] = [multiplicacion_galois(i, 3) for i in range(256)]
+# Y por 9, 11, 13 y 14 para la mezcla de columnas inversa
+mul9: List[int] = [multiplicacion_galois(i, 9) for i in range(256)]
+mul11: List[int] = [multiplicacion_galois(i, 11) for i in range(256)]
+mul13: List[int] = [multiplicacion_galois(i, 13) for i in range(256)]
+mul14: List[int] = [multiplicacion_galois(i, 14) for i in range(256)]
 
 def mezclar_columnas(estado: List[int]) -> List[int]:
     # Realiza el paso de mezclar las columnas
@@ -114,14 +122,10 @@ def mezclar_columnas_inverso(estado: List[int]) -> List[int]:
     for i in range(4):
         columna = estado[i*4:(i+1)*4]
         nueva_columna = [
-            multiplicacion_galois(columna[0], 14) ^ multiplicacion_galois(columna[1], 11) ^
-            multiplicacion_galois(columna[2], 13) ^ multiplicacion_galois(columna[3], 9),
-            multiplicacion_galois(columna[0], 9) ^ multiplicacion_galois(columna[1], 14) ^
-            multiplicacion_galois(columna[2], 11) ^ multiplicacion_galois(columna[3], 13),
-            multiplicacion_galois(columna[0], 13) ^ multiplicacion_galois(columna[1], 9) ^
-            multiplicacion_galois(columna[2], 14) ^ multiplicacion_galois(columna[3], 11),
-            multiplicacion_galois(columna[0], 11) ^ multiplicacion_galois(columna[1], 13) ^
-            multiplicacion_galois(columna[2], 9) ^ multiplicacion_galois(columna[3], 14)
+            mul14[columna[0]] ^ mul11[columna[1]] ^ mul13[columna[2]] ^ mul9[columna[3]],
+            mul9[columna[0]] ^ mul14[columna[1]] ^ mul11[columna[2]] ^ mul13[columna[3]],
+            mul13[columna[0]] ^ mul9[columna[1]] ^ mul14[columna[2]] ^ mul11[columna[3]],
+            mul11[columna[0]] ^ mul13[columna[1]] ^ mul9[columna[2]] ^ mul14[columna[3]]
         ]
         nuevo_estado.extend(nueva_columna)
 
@@ -151,6 +155,47 @@ def expandir_clave(clave: List[int]) -> List[int]:
     return clave_expandida
 
 
+def cifrar_bloque_referencia(bloque: List[int], clave_expandida: List[int]) -> List[int]:
+    # Cifra un bloque aplicando las funciones de ronda una a una, tal y como las define FIPS-197.
+    # Se conserva como referencia para verificar los motores optimizados.
+
+    bloque = agregar_clave_ronda(bloque, clave_expandida[:16])
+
+    for ronda in range(1, 10):
+        bloque = sustituir_bytes(bloque)
+        bloque = desplazar_filas(bloque)
+        bloque = mezclar_columnas(bloque)
+        bloque = agregar_clave_ronda(bloque, clave_expandida[ronda*16:(ronda+1)*16])
+
+    bloque = sustituir_bytes(bloque)
+    bloque = desplazar_filas(bloque)
+
+    return agregar_clave_ronda(bloque, clave_expandida[-16:])
+
+
+def descifrar_bloque_referencia(bloque: List[int], clave_expandida: List[int]) -> List[int]:
+    # Descifra un bloque aplicando las funciones de ronda inversas una a una
+
+    bloque = agregar_clave_ronda(bloque, clave_expandida[-16:])
+
+    for ronda in range(9, 0, -1):
+        bloque = desplazar_filas_inverso(bloque)
+        bloque = sustituir_bytes_inverso(bloque)
+        bloque = agregar_clave_ronda(bloque, clave_expandida[ronda*16:(ronda+1)*16])
+        bloque = mezclar_columnas_inverso(bloque)
+
+    bloque = desplazar_filas_inverso(bloque)
+    bloque = sustituir_bytes_inverso(bloque)
+
+    return agregar_clave_ronda(bloque, clave_expandida[:16])
+
+
+def xor_bytes(a: bytes, b: bytes) -> bytes:
+    # XOR de dos secuencias de la misma longitud usando aritmética de enteros grandes
+
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
 def padding(datos: bytes) -> bytes:
     # Aplica relleno PKCS7 a los datos de entrada.
 
@@ -176,3 +221,25 @@ def quitar_padding(datos_rellenados: bytes) -> bytes:
             return datos_rellenados  
         
     return datos_rellenados[:-longitud_relleno]
+
+
+def vista_lectura(origen) -> memoryview:
+    # Vista plana de bytes sobre cualquier objeto con protocolo de búfer (bytes, bytearray, memoryview, mmap), sin copiarlo
+
+    vista = memoryview(origen)
+    if vista.ndim != 1 or vista.format != 'B':
+        vista = vista.cast('B')
+
+    return vista
+
+
+def vista_escritura(destino, longitud_minima: int) -> memoryview:
+    # Igual que vista_lectura, comprobando que el destino sea escribible y tenga espacio suficiente
+
+    vista = vista_lectura(destino)
+    if vista.readonly:
+        raise TypeError("El destino debe ser un búfer escribible")
+    if len(vista) < longitud_minima:
+        raise ValueError(f"El destino debe tener al menos {longitud_minima} bytes")
+
+    return vista
@@ -0,0 +1,78 @@
+"""
+Este módulo genera, para una clave concreta, funciones de cifrado AES-128 especializadas. El código fuente
+se construye con las diez rondas desenrolladas y las palabras de la clave de ronda escritas como constantes,
+y se compila con compile()/exec(). En el camino de cada bloque no queda ningún bucle de rondas, índice
+sobre la clave expandida ni llamada a funciones de ronda. Las funciones se guardan en el objeto ClaveAES,
+así que una clave de larga duración solo se compila una vez.
+"""
+
+import struct
+from typing import Callable, Dict, Sequence, Tuple
+from .aes_tablas import Te0, Te1, Te2, Te3, Se0, Se1, Se2, Se3
+from .aes_clave import ClaveAES
+
+# Columnas que alimentan cada palabra de salida de una ronda de cifrado (ShiftRows)
+_COLUMNAS = ((0, 1, 2, 3), (1, 2, 3, 0), (2, 3, 0, 1), (3, 0, 1, 2))
+
+
+def _lineas_rondas(palabras_clave: Sequence[int], sangria: str) -> list:
+    # Rondas desenrolladas sobre s0..s3; el resultado queda en r0..r3
+
+    lineas = [f"{sangria}s{i} ^= 0x{palabras_clave[i]:08x}" for i in range(4)]
+    entrada, salida = 's', 't'
+
+    for ronda in range(1, 10):
+        for i, (a, b, c, d) in enumerate(_COLUMNAS):
+            lineas.append(
+                f"{sangria}{salida}{i} = te0[{entrada}{a} >> 24] ^ te1[({entrada}{b} >> 16) & 255] ^ "
+                f"te2[({entrada}{c} >> 8) & 255] ^ te3[{entrada}{d} & 255] ^ 0x{palabras_clave[4 * ronda + i]:08x}"
+            )
+        entrada, salida = salida, entrada
+
+    for i, (a, b, c, d) in enumerate(_COLUMNAS):
+        lineas.append(
+            f"{sangria}r{i} = se0[{entrada}{a} >> 24] ^ se1[({entrada}{b} >> 16) & 255] ^ "
+            f"se2[({entrada}{c} >> 8) & 255] ^ se3[{entrada}{d} & 255] ^ 0x{palabras_clave[40 + i]:08x}"
+        )
+
+    return lineas
+
+
+def generar_codigo(palabras_clave: Sequence[int]) -> str:
+    # Código de dos funciones: cifrar_palabras (un bloque como cuatro palabras) y cifrar_bloques (bytes)
+
+    tablas = "te0=Te0, te1=Te1, te2=Te2, te3=Te3, se0=Se0, se1=Se1, se2=Se2, se3=Se3"
+    lineas = [f"def cifrar_palabras(s0, s1, s2, s3, {tablas}):"]
+    lineas += _lineas_rondas(palabras_clave, "    ")
+    lineas.append("    return r0, r1, r2, r3")
+    lineas.append("")
+    lineas.append(f"def cifrar_bloques(datos, {tablas}, iter_unpack=iter_unpack, pack=pack):")
+    lineas.append("    salida = []")
+    lineas.append("    extender = salida.extend")
+    lineas.append("    for s0, s1, s2, s3 in iter_unpack('>4I', datos):")
+    lineas += _lineas_rondas(palabras_clave, "        ")
+    lineas.append("        extender((r0, r1, r2, r3))")
+    lineas.append("    return pack(f'>{len(salida)}I', *salida)")
+
+    return "\n".join(lineas) + "\n"
+
+
+def compilar(palabras_clave: Sequence[int]) -> Tuple[Callable, Callable]:
+    # Compila el código generado y devuelve (cifrar_palabras, cifrar_bloques)
+
+    espacio: Dict[str, object] = {
+        'Te0': Te0, 'Te1': Te1, 'Te2': Te2, 'Te3': Te3, 'Se0': Se0, 'Se1': Se1, 'Se2': Se2, 'Se3': Se3,
+        'iter_unpack': struct.iter_unpack, 'pack': struct.pack,
+    }
+    exec(compile(generar_codigo(palabras_clave), "<aes_compilado>", "exec"), espacio)
+
+    return espacio['cifrar_palabras'], espacio['cifrar_bloques']
+
+
+def funciones_compiladas(clave_aes: ClaveAES) -> Tuple[Callable, Callable]:
+    # Devuelve las funciones especializadas de la clave, compilándolas la primera vez
+
+    if clave_aes.funciones_compiladas is None:
+        clave_aes.funciones_compiladas = compilar(clave_aes.palabras_cifrado)
+
+    return clave_aes.funciones_compiladas
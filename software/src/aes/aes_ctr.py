@@ -1,10 +1,12 @@
 # Este módulo proporciona funciones para cifrar y descifrar datos utilizando AES-128 en modo CTR (). 
 
-from typing import Union, List
-from .aes_common import (
-    sustituir_bytes, desplazar_filas, mezclar_columnas, agregar_clave_ronda,
-    expandir_clave
-)
+from typing import Union, List, Sequence, Optional, Tuple
+from .aes_common import xor_bytes, vista_lectura, vista_escritura, BYTES_POR_FRAGMENTO
+from .aes_tablas import cifrar_bloques
+from .aes_clave import ClaveAES, obtener_clave
+from . import aes_numpy, aes_motores, aes_rondas
+
+MASCARA_CONTADOR: int = (1 << 64) - 1  # El contador ocupa los últimos 8 bytes del bloque
 
 
 def incrementar_contador(contador: bytearray) -> bytearray:
@@ -18,9 +20,40 @@ def incrementar_contador(contador: bytearray) -> bytearray:
     return contador
 
 
-def cifrar_ctr(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes], nonce: bytes) -> bytes:
-    if len(clave) != 16:
-        raise ValueError("La clave debe tener 16 bytes de longitud")
+def generar_bloques_contador(nonce: bytes, contador_inicial: int, num_bloques: int) -> bytes:
+    # Genera los bloques de contador (nonce || contador de 64 bits) que se cifran para obtener el flujo de clave.
+    # El contador da la vuelta módulo 2^64 igual que incrementar_contador sobre los últimos 8 bytes.
+
+    nonce = bytes(nonce)
+
+    return b''.join(
+        (nonce + ((contador_inicial + i) & MASCARA_CONTADOR).to_bytes(8, 'big'))[:16]
+        for i in range(num_bloques)
+    )
+
+
+def aplicar_flujo_clave(datos: bytes, palabras_clave: Sequence[int], nonce: bytes, contador_inicial: int = 0) -> bytes:
+    # Combina los datos con el flujo de clave que empieza en el bloque contador_inicial.
+    # Usa las tablas T para pocos bloques, las rondas sobre todo el búfer para cantidades intermedias
+    # (o cualquiera si no hay NumPy) y el motor vectorizado para las grandes.
+
+    num_bloques = (len(datos) + 15) // 16
+
+    if aes_numpy.NUMPY_DISPONIBLE and num_bloques >= aes_rondas.MAXIMO_BLOQUES_RONDAS:
+        return aes_numpy.aplicar_flujo_ctr(datos, palabras_clave, nonce, contador_inicial)
+
+    bloques_contador = generar_bloques_contador(nonce, contador_inicial, num_bloques)
+    if num_bloques >= aes_rondas.UMBRAL_BLOQUES_RONDAS:
+        flujo_clave = aes_rondas.cifrar_bloques(bloques_contador, palabras_clave)
+    else:
+        flujo_clave = cifrar_bloques(bloques_contador, palabras_clave)
+
+    return xor_bytes(datos, flujo_clave[:len(datos)])
+
+
+def cifrar_ctr(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes,
+               motor: Optional[str] = None) -> bytes:
+    clave_aes = obtener_clave(clave)
     
     if isinstance(texto_plano, str):
         texto_plano = texto_plano.encode()
@@ -30,32 +63,144 @@ def cifrar_ctr(texto_plano: Union[str, List[int], bytes], clave: Union[str, List
     if not isinstance(texto_plano, bytes):
         raise TypeError("El texto plano debe ser bytes, una lista de enteros o una cadena")
     
+    if len(nonce) < 8:
+        raise ValueError("El nonce debe tener al menos 8 bytes de longitud")
+
     # No usamos padding porque es un cifrado en flujo
-    clave_expandida = expandir_clave(list(clave))
-    texto_cifrado = bytearray()
-    contador = bytearray(16)  
-    
-    for i in range(0, len(texto_plano), 16):
-        bloque = nonce + contador[8:]  # Usamos los últimos 8 bytes del contador
-        bloque = agregar_clave_ronda(bloque, clave_expandida[:16])
-        
-        for ronda in range(1, 10):
-            bloque = sustituir_bytes(bloque)
-            bloque = desplazar_filas(bloque)
-            bloque = mezclar_columnas(bloque)
-            bloque = agregar_clave_ronda(bloque, clave_expandida[ronda*16:(ronda+1)*16])
-        
-        bloque = sustituir_bytes(bloque)
-        bloque = desplazar_filas(bloque)
-        bloque = agregar_clave_ronda(bloque, clave_expandida[-16:])
-        
-        for j in range(min(16, len(texto_plano) - i)):
-            texto_cifrado.append(texto_plano[i + j] ^ bloque[j])
-        
-        contador = incrementar_contador(contador)
-    
-    return bytes(texto_cifrado)
+    return aes_motores.obtener_motor(motor).aplicar_flujo_ctr(texto_plano, clave_aes, nonce)
+
+def descifrar_ctr(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes,
+                  motor: Optional[str] = None) -> bytes:
+    # Se hace de la misma forma que el cifrado
+    return cifrar_ctr(texto_cifrado, clave, nonce, motor)
+
+
+def generar_flujo_clave(clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes, desplazamiento: int, longitud: int) -> bytes:
+    # Devuelve los bytes [desplazamiento, desplazamiento + longitud) del flujo de clave.
+    # El bloque de contador y la posición dentro del bloque se calculan directamente, sin recorrer el flujo.
+
+    clave_aes = obtener_clave(clave)
+
+    if len(nonce) < 8:
+        raise ValueError("El nonce debe tener al menos 8 bytes de longitud")
+    if desplazamiento < 0 or longitud < 0:
+        raise ValueError("El desplazamiento y la longitud no pueden ser negativos")
+
+    bloque_inicial, salto = divmod(desplazamiento, 16)
+    flujo_clave = aplicar_flujo_clave(bytes(salto + longitud), clave_aes.palabras_cifrado, nonce, bloque_inicial)
+
+    return flujo_clave[salto:]
+
+
+def descifrar_ctr_rango(texto_cifrado: bytes, clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes,
+                        desplazamiento: int, longitud: int) -> bytes:
+    # Descifra solo los bytes [desplazamiento, desplazamiento + longitud) de un texto cifrado en modo CTR.
+    # Acepta cualquier objeto con protocolo de búfer (bytes, bytearray, memoryview, mmap) y solo lee el rango pedido.
+
+    if desplazamiento < 0 or longitud < 0:
+        raise ValueError("El desplazamiento y la longitud no pueden ser negativos")
+    if desplazamiento + longitud > len(texto_cifrado):
+        raise ValueError("El rango solicitado excede la longitud del texto cifrado")
+
+    with memoryview(texto_cifrado) as vista:
+        fragmento = bytes(vista[desplazamiento:desplazamiento + longitud])
+
+    return xor_bytes(fragmento, generar_flujo_clave(clave, nonce, desplazamiento, longitud))
+
+
+def cifrar_ctr_into(origen, destino, clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes,
+                    contador_inicial: int = 0) -> int:
+    # Cifra cualquier objeto con protocolo de búfer directamente en el búfer escribible destino
+    # (puede ser el mismo que el origen). Devuelve el número de bytes escritos.
+
+    clave_aes = obtener_clave(clave)
+
+    if len(nonce) < 8:
+        raise ValueError("El nonce debe tener al menos 8 bytes de longitud")
+
+    entrada = vista_lectura(origen)
+    longitud = len(entrada)
+    salida = vista_escritura(destino, longitud)
+    palabras_clave = clave_aes.palabras_cifrado
+
+    for inicio in range(0, longitud, BYTES_POR_FRAGMENTO):
+        fin = min(inicio + BYTES_POR_FRAGMENTO, longitud)
+        salida[inicio:fin] = aplicar_flujo_clave(entrada[inicio:fin], palabras_clave, nonce, contador_inicial + inicio // 16)
+
+    return longitud
+
+
+def descifrar_ctr_into(origen, destino, clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes,
+                       contador_inicial: int = 0) -> int:
+    # Se hace de la misma forma que el cifrado
+    return cifrar_ctr_into(origen, destino, clave, nonce, contador_inicial)
+
+
+def cifrar_ctr_lote(mensajes: Sequence[Tuple[Union[str, List[int], bytes, ClaveAES], bytes, Union[str, List[int], bytes]]]) -> List[bytes]:
+    # Cifra muchos mensajes independientes, cada uno con su (clave, nonce, texto_plano), en una sola pasada
+    # vectorizada. El resultado i coincide con cifrar_ctr(texto_plano_i, clave_i, nonce_i).
+
+    # Las claves en bytes se agrupan por valor y se expanden todas juntas; los objetos ClaveAES ya lo están
+    claves: List[Union[bytes, ClaveAES]] = []
+    filas = {}
+    indices_clave = []
+    nonces = []
+    textos = []
+
+    for clave, nonce, texto_plano in mensajes:
+        if not isinstance(clave, ClaveAES):
+            if len(clave) != 16:
+                raise ValueError("La clave debe tener 16 bytes de longitud")
+            clave = bytes(clave)
+
+        if isinstance(texto_plano, str):
+            texto_plano = texto_plano.encode()
+        elif isinstance(texto_plano, list):
+            texto_plano = bytes(texto_plano)
+
+        if not isinstance(texto_plano, bytes):
+            raise TypeError("El texto plano debe ser bytes, una lista de enteros o una cadena")
+
+        if len(nonce) < 8:
+            raise ValueError("El nonce debe tener al menos 8 bytes de longitud")
+
+        if clave not in filas:
+            filas[clave] = len(claves)
+            claves.append(clave)
+        indices_clave.append(filas[clave])
+        nonces.append(bytes(nonce))
+        textos.append(texto_plano)
+
+    if not aes_numpy.NUMPY_DISPONIBLE:
+        return [aplicar_flujo_clave(texto, obtener_clave(claves[i]).palabras_cifrado, nonce)
+                for texto, i, nonce in zip(textos, indices_clave, nonces)]
+
+    np = aes_numpy.np
+    tabla_claves = np.empty((len(claves), 44), dtype=np.uint32)
+    en_bytes = [i for i, clave in enumerate(claves) if isinstance(clave, bytes)]
+    if en_bytes:
+        bytes_claves = np.frombuffer(b''.join(claves[i] for i in en_bytes), dtype=np.uint8).reshape(-1, 16)
+        tabla_claves[en_bytes] = aes_numpy.expandir_claves(bytes_claves)
+    for i, clave in enumerate(claves):
+        if isinstance(clave, ClaveAES):
+            tabla_claves[i] = clave.palabras_cifrado
+
+    num_bloques = [(len(texto) + 15) // 16 for texto in textos]
+    flujo_clave = aes_numpy.flujo_clave_multiclave(nonces, num_bloques, indices_clave, tabla_claves)
+
+    # Cada mensaje se rellena con ceros hasta su último bloque para alinearlo con su flujo de clave
+    datos = np.frombuffer(b''.join(texto + bytes(-len(texto) % 16) for texto in textos), dtype=np.uint8)
+    cifrado = np.bitwise_xor(datos, flujo_clave).tobytes()
+    resultados = []
+    inicio = 0
+
+    for texto, bloques in zip(textos, num_bloques):
+        resultados.append(cifrado[inicio:inicio + len(texto)])
+        inicio += bloques * 16
+
+    return resultados
+
 
-def descifrar_ctr(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes], nonce: bytes) -> bytes:
+def descifrar_ctr_lote(mensajes: Sequence[Tuple[Union[str, List[int], bytes, ClaveAES], bytes, Union[List[int], bytes]]]) -> List[bytes]:
     # Se hace de la misma forma que el cifrado
-    return cifrar_ctr(texto_cifrado, clave, nonce)
\ No newline at end of file
+    return cifrar_ctr_lote(mensajes)
@@ -1,16 +1,38 @@
 # Este módulo proporciona funciones para cifrar y descifrar datos utilizando AES-128 en modo ECB (Electronic Codebook). 
 
-from typing import Union, List
-from .aes_common import (
-    sustituir_bytes, sustituir_bytes_inverso, desplazar_filas, desplazar_filas_inverso, 
-    multiplicacion_galois, mezclar_columnas, mezclar_columnas_inverso, agregar_clave_ronda, 
-    expandir_clave, padding, quitar_padding
-)
+from typing import Union, List, Sequence, Optional
+from .aes_common import padding, quitar_padding, vista_lectura, vista_escritura, BYTES_POR_FRAGMENTO
+from .aes_tablas import cifrar_bloques, descifrar_bloques
+from .aes_clave import ClaveAES, obtener_clave
+from . import aes_numpy, aes_motores, aes_rondas
 
-def cifrar_ecb(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes]) -> bytes:
 
-    if len(clave) != 16:
-        raise ValueError("La clave debe tener 16 bytes de longitud")
+def cifrar_bloques_ecb(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Cifra bloques independientes: tablas T para pocos bloques, rondas sobre todo el búfer para
+    # cantidades intermedias (o cualquiera si no hay NumPy) y el motor vectorizado para las grandes
+
+    num_bloques = len(datos) // 16
+
+    if num_bloques < aes_rondas.UMBRAL_BLOQUES_RONDAS:
+        return cifrar_bloques(datos, palabras_clave)
+    if aes_numpy.NUMPY_DISPONIBLE and num_bloques >= aes_rondas.MAXIMO_BLOQUES_RONDAS:
+        return aes_numpy.cifrar_bloques(datos, palabras_clave)
+
+    return aes_rondas.cifrar_bloques(datos, palabras_clave)
+
+
+def descifrar_bloques_ecb(datos: bytes, palabras_descifrado: Sequence[int]) -> bytes:
+
+    if aes_numpy.NUMPY_DISPONIBLE and len(datos) // 16 >= aes_numpy.UMBRAL_BLOQUES_NUMPY:
+        return aes_numpy.descifrar_bloques(datos, palabras_descifrado)
+
+    return descifrar_bloques(datos, palabras_descifrado)
+
+
+def cifrar_ecb(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+               motor: Optional[str] = None) -> bytes:
+
+    clave_aes = obtener_clave(clave)
     
     if isinstance(texto_plano, str):
         texto_plano = texto_plano.encode()
@@ -21,32 +43,14 @@ def cifrar_ecb(texto_plano: Union[str, List[int], bytes], clave: Union[str, List
         raise TypeError("El texto plano debe ser bytes, una lista de enteros o una cadena")
     
     texto_plano = padding(texto_plano)
-    clave_expandida = expandir_clave(list(clave))
-    texto_cifrado = bytearray()
-    
-    for i in range(0, len(texto_plano), 16):
-        bloque = bytearray(texto_plano[i:i+16])
-        bloque = agregar_clave_ronda(bloque, clave_expandida[:16])
-        
-        for ronda in range(1, 10):
-            bloque = sustituir_bytes(bloque)
-            bloque = desplazar_filas(bloque)
-            bloque = mezclar_columnas(bloque)
-            bloque = agregar_clave_ronda(bloque, clave_expandida[ronda*16:(ronda+1)*16])
-        
-        bloque = sustituir_bytes(bloque)
-        bloque = desplazar_filas(bloque)
-        bloque = agregar_clave_ronda(bloque, clave_expandida[-16:])
-        
-        texto_cifrado.extend(bloque)
-    
-    return bytes(texto_cifrado)
 
+    return aes_motores.obtener_motor(motor).cifrar_bloques(texto_plano, clave_aes)
 
-def descifrar_ecb(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes]) -> bytes:
 
-    if len(clave) != 16:
-        raise ValueError("La clave debe tener 16 bytes de longitud")
+def descifrar_ecb(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+                  motor: Optional[str] = None) -> bytes:
+
+    clave_aes = obtener_clave(clave)
     
     if isinstance(texto_cifrado, str):
         try:
@@ -61,23 +65,53 @@ def descifrar_ecb(texto_cifrado: Union[str, List[int], bytes], clave: Union[str,
     if len(texto_cifrado) % 16 != 0:
         raise ValueError("La longitud del texto cifrado debe ser múltiplo de 16 bytes")
 
-    clave_expandida = expandir_clave(list(clave))
-    texto_plano_rellenado = bytearray()
-
-    for i in range(0, len(texto_cifrado), 16):
-        bloque = bytearray(texto_cifrado[i:i+16])
-        bloque = agregar_clave_ronda(bloque, clave_expandida[-16:])
-        
-        for ronda in range(9, 0, -1):
-            bloque = desplazar_filas_inverso(bloque)
-            bloque = sustituir_bytes_inverso(bloque)
-            bloque = agregar_clave_ronda(bloque, clave_expandida[ronda*16:(ronda+1)*16])
-            bloque = mezclar_columnas_inverso(bloque)
-        
-        bloque = desplazar_filas_inverso(bloque)
-        bloque = sustituir_bytes_inverso(bloque)
-        bloque = agregar_clave_ronda(bloque, clave_expandida[:16])
-        
-        texto_plano_rellenado.extend(bloque)
-    
-    return quitar_padding(bytes(texto_plano_rellenado))
\ No newline at end of file
+    return quitar_padding(aes_motores.obtener_motor(motor).descifrar_bloques(texto_cifrado, clave_aes))
+
+
+def cifrar_ecb_into(origen, destino, clave: Union[str, List[int], bytes, ClaveAES], rellenar: bool = True) -> int:
+    # Cifra cualquier objeto con protocolo de búfer directamente en el búfer escribible destino.
+    # El relleno PKCS7 solo se construye para el último bloque. Devuelve el número de bytes escritos.
+
+    clave_aes = obtener_clave(clave)
+    entrada = vista_lectura(origen)
+    longitud = len(entrada)
+
+    if not rellenar and longitud % 16 != 0:
+        raise ValueError("Sin relleno, la longitud del texto plano debe ser múltiplo de 16 bytes")
+
+    completos = longitud - longitud % 16
+    longitud_salida = completos + 16 if rellenar else completos
+    salida = vista_escritura(destino, longitud_salida)
+    palabras_clave = clave_aes.palabras_cifrado
+
+    for inicio in range(0, completos, BYTES_POR_FRAGMENTO):
+        fin = min(inicio + BYTES_POR_FRAGMENTO, completos)
+        salida[inicio:fin] = cifrar_bloques_ecb(entrada[inicio:fin], palabras_clave)
+
+    if rellenar:
+        salida[completos:longitud_salida] = cifrar_bloques(padding(bytes(entrada[completos:])), palabras_clave)
+
+    return longitud_salida
+
+
+def descifrar_ecb_into(origen, destino, clave: Union[str, List[int], bytes, ClaveAES], quitar_relleno: bool = True) -> int:
+    # Descifra en el búfer destino. Devuelve la longitud del texto plano, sin el relleno si quitar_relleno.
+
+    clave_aes = obtener_clave(clave)
+    entrada = vista_lectura(origen)
+    longitud = len(entrada)
+
+    if longitud % 16 != 0:
+        raise ValueError("La longitud del texto cifrado debe ser múltiplo de 16 bytes")
+
+    salida = vista_escritura(destino, longitud)
+    palabras_descifrado = clave_aes.palabras_descifrado
+
+    for inicio in range(0, longitud, BYTES_POR_FRAGMENTO):
+        fin = min(inicio + BYTES_POR_FRAGMENTO, longitud)
+        salida[inicio:fin] = descifrar_bloques_ecb(entrada[inicio:fin], palabras_descifrado)
+
+    if quitar_relleno and longitud:
+        return longitud - 16 + len(quitar_padding(bytes(salida[longitud - 16:longitud])))
+
+    return longitud
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Este módulo implementa AES-128 en modo GCM (Galois/Counter Mode, NIST SP 800-38D): cifrado autenticado
+en una sola pasada. El cifrado reutiliza el flujo de clave del modo CTR a través del motor seleccionado y la
+autenticación usa GHASH con tablas precalculadas por clave al estilo de Shoup con ventanas de 8 bits:
+para cada una de las 16 posiciones de byte se guarda el producto de sus 256 valores por H, de modo que
+multiplicar un bloque por H son 16 búsquedas y 16 XOR, sin recorrer el bloque bit a bit.
+"""
+
+import hmac
+from functools import lru_cache
+from typing import Union, List, Optional, Tuple
+from .aes_clave import ClaveAES, obtener_clave
+from . import aes_motores
+
+TAMAÑO_CACHE_GHASH: int = 32
+# Polinomio de reducción x^128 + x^7 + x^2 + x + 1 en el orden de bits de GCM
+REDUCCION_GHASH: int = 0xE1 << 120
+MASCARA_32: int = 0xFFFFFFFF
+
+
+@lru_cache(maxsize=TAMAÑO_CACHE_GHASH)
+def tablas_ghash(h: int) -> Tuple[Tuple[int, ...], ...]:
+    # tablas[j][b] = (byte b en la posición j) · H. En GCM el bit más significativo es el coeficiente de x^0,
+    # así que multiplicar por x es desplazar a la derecha y reducir si sale un 1.
+
+    potencias = []
+    v = h
+    for _ in range(128):
+        potencias.append(v)  # H · x^k
+        v = (v >> 1) ^ REDUCCION_GHASH if v & 1 else v >> 1
+
+    tablas = []
+    for j in range(16):
+        tabla = [0] * 256
+        for b in range(1, 256):
+            # El bit más significativo del byte es x^(8j); se añade el bit más bajo a la entrada ya calculada
+            bit = (b & -b).bit_length() - 1
+            tabla[b] = tabla[b & (b - 1)] ^ potencias[8 * j + 7 - bit]
+        tablas.append(tuple(tabla))
+
+    return tuple(tablas)
+
+
+def ghash(tablas: Tuple[Tuple[int, ...], ...], datos: bytes, y: int = 0) -> int:
+    # Acumula Y = (Y XOR X_i) · H sobre los bloques de datos, que debe tener longitud múltiplo de 16
+
+    t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11, t12, t13, t14, t15 = tablas
+    desde_bytes = int.from_bytes
+
+    for i in range(0, len(datos), 16):
+        b = (y ^ desde_bytes(datos[i:i + 16], 'big')).to_bytes(16, 'big')
+        y = (t0[b[0]] ^ t1[b[1]] ^ t2[b[2]] ^ t3[b[3]] ^ t4[b[4]] ^ t5[b[5]] ^ t6[b[6]] ^ t7[b[7]] ^
+             t8[b[8]] ^ t9[b[9]] ^ t10[b[10]] ^ t11[b[11]] ^ t12[b[12]] ^ t13[b[13]] ^ t14[b[14]] ^ t15[b[15]])
+
+    return y
+
+
+def _rellenar_a_bloque(datos: bytes) -> bytes:
+    # GHASH completa con ceros (no PKCS7) hasta un múltiplo de 16
+
+    return datos + bytes(-len(datos) % 16)
+
+
+def _preparar(clave_aes: ClaveAES, vector_inicial: bytes, motor) -> Tuple[Tuple[Tuple[int, ...], ...], bytes]:
+    # Devuelve las tablas GHASH de la clave y el bloque contador inicial J0
+
+    h = int.from_bytes(motor.cifrar_bloques(bytes(16), clave_aes), 'big')
+    tablas = tablas_ghash(h)
+
+    if len(vector_inicial) == 12:
+        j0 = bytes(vector_inicial) + b'\x00\x00\x00\x01'
+    else:
+        bloque_longitud = (len(vector_inicial) * 8).to_bytes(16, 'big')
+        j0 = ghash(tablas, _rellenar_a_bloque(bytes(vector_inicial)) + bloque_longitud).to_bytes(16, 'big')
+
+    return tablas, j0
+
+
+def _flujo_gcm(datos: bytes, clave_aes: ClaveAES, j0: bytes, motor) -> bytes:
+    # El contador de GCM son los 32 bits bajos de J0 (inc32). Con el nonce de 8 bytes del modo CTR el contador
+    # de 64 bits es J0[8:16], así que basta con partir los datos donde los 32 bits bajos dan la vuelta.
+
+    nonce = j0[:8]
+    alto = int.from_bytes(j0[8:12], 'big') << 32
+    bajo = (int.from_bytes(j0[12:16], 'big') + 1) & MASCARA_32
+    partes = []
+    inicio = 0
+
+    while inicio < len(datos) or not partes:
+        fin = min(len(datos), inicio + ((1 << 32) - bajo) * 16)
+        partes.append(motor.aplicar_flujo_ctr(datos[inicio:fin], clave_aes, nonce, alto | bajo))
+        inicio, bajo = fin, 0
+
+    return b''.join(partes)
+
+
+def _etiqueta(tablas, clave_aes: ClaveAES, j0: bytes, datos_asociados: bytes, texto_cifrado: bytes, motor) -> bytes:
+
+    bloque_longitudes = (len(datos_asociados) * 8).to_bytes(8, 'big') + (len(texto_cifrado) * 8).to_bytes(8, 'big')
+    y = ghash(tablas, _rellenar_a_bloque(datos_asociados))
+    y = ghash(tablas, _rellenar_a_bloque(texto_cifrado), y)
+    y = ghash(tablas, bloque_longitudes, y)
+
+    return (y ^ int.from_bytes(motor.cifrar_bloques(j0, clave_aes), 'big')).to_bytes(16, 'big')
+
+
+def _validar_entrada(datos: Union[str, List[int], bytes], nombre: str) -> bytes:
+
+    if isinstance(datos, str):
+        datos = datos.encode()
+    elif isinstance(datos, list):
+        datos = bytes(datos)
+
+    if not isinstance(datos, bytes):
+        raise TypeError(f"{nombre} debe ser bytes, una lista de enteros o una cadena")
+
+    return datos
+
+
+def cifrar_gcm(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+               vector_inicial: bytes, datos_asociados: bytes = b'', motor: Optional[str] = None) -> Tuple[bytes, bytes]:
+    # Devuelve (texto_cifrado, etiqueta). Los datos asociados se autentican pero no se cifran.
+
+    clave_aes = obtener_clave(clave)
+    texto_plano = _validar_entrada(texto_plano, "El texto plano")
+    datos_asociados = _validar_entrada(datos_asociados, "Los datos asociados")
+
+    if len(vector_inicial) == 0:
+        raise ValueError("El vector inicial no puede estar vacío")
+
+    motor = aes_motores.obtener_motor(motor)
+    tablas, j0 = _preparar(clave_aes, vector_inicial, motor)
+    texto_cifrado = _flujo_gcm(texto_plano, clave_aes, j0, motor)
+
+    return texto_cifrado, _etiqueta(tablas, clave_aes, j0, datos_asociados, texto_cifrado, motor)
+
+
+def descifrar_gcm(texto_cifrado: Union[List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+                  vector_inicial: bytes, etiqueta: bytes, datos_asociados: bytes = b'',
+                  motor: Optional[str] = None) -> bytes:
+    # Comprueba la etiqueta antes de descifrar; si no coincide no se devuelve ningún dato
+
+    clave_aes = obtener_clave(clave)
+    texto_cifrado = _validar_entrada(texto_cifrado, "El texto cifrado")
+    datos_asociados = _validar_entrada(datos_asociados, "Los datos asociados")
+
+    if len(vector_inicial) == 0:
+        raise ValueError("El vector inicial no puede estar vacío")
+    if len(etiqueta) != 16:
+        raise ValueError("La etiqueta debe tener 16 bytes de longitud")
+
+    motor = aes_motores.obtener_motor(motor)
+    tablas, j0 = _preparar(clave_aes, vector_inicial, motor)
+
+    if not hmac.compare_digest(_etiqueta(tablas, clave_aes, j0, datos_asociados, texto_cifrado, motor), bytes(etiqueta)):
+        raise ValueError("Etiqueta de autenticación inválida")
+
+    return _flujo_gcm(texto_cifrado, clave_aes, j0, motor)
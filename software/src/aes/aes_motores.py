@@ -0,0 +1,177 @@
+"""
+Este módulo define el registro de motores AES-128. Un motor implementa las operaciones de bajo nivel sobre
+datos ya rellenados (bloques ECB, encadenamiento CBC y flujo CTR) y los modos de operación delegan en él.
+Se incluyen el motor 'python' (tablas T y NumPy), el motor 'bitslice' (circuito booleano sobre enteros, con
+SubBytes sin búsquedas en tablas), el motor 'compilado' (funciones generadas para cada clave), el motor 'rondas' (ronda a
+ronda sobre todo el búfer con bytes.translate) y, si pycryptodome está instalado, el motor 'pycryptodome'
+basado en Crypto.Cipher.AES.
+Todos los motores producen exactamente la misma salida.
+
+El motor se elige por llamada (argumento motor), por instancia de SistemaCriptografico o con la variable de
+entorno AES_MOTOR; si no se indica ninguno se usa 'python'.
+"""
+
+import os
+import struct
+from typing import Dict, List, Optional
+from .aes_common import xor_bytes
+from .aes_clave import ClaveAES
+from . import aes_ctr, aes_ecb, aes_cbc, aes_numpy, aes_bitslice, aes_compilado, aes_rondas
+
+try:
+    from Crypto.Cipher import AES
+except ImportError:
+    AES = None
+
+PYCRYPTODOME_DISPONIBLE: bool = AES is not None
+
+VARIABLE_ENTORNO_MOTOR: str = 'AES_MOTOR'
+MOTOR_POR_DEFECTO: str = 'python'
+
+
+class MotorPython:
+    # Motor de referencia: tablas T para pocos bloques, rondas sobre el búfer para lotes medianos y NumPy
+    # para lotes grandes
+
+    nombre = 'python'
+
+    def cifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return aes_ecb.cifrar_bloques_ecb(datos, clave_aes.palabras_cifrado)
+
+    def descifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return aes_ecb.descifrar_bloques_ecb(datos, clave_aes.palabras_descifrado)
+
+    def cifrar_cbc(self, datos: bytes, clave_aes: ClaveAES, vector_inicial: bytes) -> bytes:
+        return aes_cbc.cifrar_bloques_cbc(datos, clave_aes.palabras_cifrado, vector_inicial)
+
+    def descifrar_cbc(self, datos: bytes, clave_aes: ClaveAES, vector_inicial: bytes) -> bytes:
+        return aes_cbc.descifrar_bloques_cbc(datos, clave_aes.palabras_descifrado, vector_inicial)
+
+    def aplicar_flujo_ctr(self, datos: bytes, clave_aes: ClaveAES, nonce: bytes, contador_inicial: int = 0) -> bytes:
+        return aes_ctr.aplicar_flujo_clave(datos, clave_aes.palabras_cifrado, nonce, contador_inicial)
+
+
+class MotorBitslice(MotorPython):
+    # Cifrado de bloques independientes (ECB y flujo CTR) con bitslicing. El descifrado y el cifrado CBC,
+    # que es secuencial, se heredan del motor 'python'.
+
+    nombre = 'bitslice'
+
+    def cifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return aes_bitslice.cifrar_bloques(datos, clave_aes.palabras_cifrado)
+
+    def aplicar_flujo_ctr(self, datos: bytes, clave_aes: ClaveAES, nonce: bytes, contador_inicial: int = 0) -> bytes:
+        bloques_contador = aes_ctr.generar_bloques_contador(nonce, contador_inicial, (len(datos) + 15) // 16)
+        return xor_bytes(datos, aes_bitslice.cifrar_bloques(bloques_contador, clave_aes.palabras_cifrado)[:len(datos)])
+
+
+class MotorCompilado(MotorPython):
+    # Cifrado con las funciones desenrolladas y compiladas para cada clave. Conviene para claves de larga
+    # duración; el descifrado se hereda del motor 'python'.
+
+    nombre = 'compilado'
+
+    def cifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return aes_compilado.funciones_compiladas(clave_aes)[1](datos)
+
+    def cifrar_cbc(self, datos: bytes, clave_aes: ClaveAES, vector_inicial: bytes) -> bytes:
+        cifrar_palabras = aes_compilado.funciones_compiladas(clave_aes)[0]
+        texto_cifrado = []
+        p0, p1, p2, p3 = struct.unpack('>4I', vector_inicial)
+
+        for s0, s1, s2, s3 in struct.iter_unpack('>4I', datos):
+            p0, p1, p2, p3 = cifrar_palabras(s0 ^ p0, s1 ^ p1, s2 ^ p2, s3 ^ p3)
+            texto_cifrado.extend((p0, p1, p2, p3))
+
+        return struct.pack(f'>{len(texto_cifrado)}I', *texto_cifrado)
+
+    def aplicar_flujo_ctr(self, datos: bytes, clave_aes: ClaveAES, nonce: bytes, contador_inicial: int = 0) -> bytes:
+        bloques_contador = aes_ctr.generar_bloques_contador(nonce, contador_inicial, (len(datos) + 15) // 16)
+        return xor_bytes(datos, aes_compilado.funciones_compiladas(clave_aes)[1](bloques_contador)[:len(datos)])
+
+
+class MotorRondas(MotorPython):
+    # Cifrado de bloques independientes ronda a ronda sobre todo el búfer, sin NumPy. El descifrado y el
+    # cifrado CBC se heredan del motor 'python'.
+
+    nombre = 'rondas'
+
+    def cifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return aes_rondas.cifrar_bloques(datos, clave_aes.palabras_cifrado)
+
+    def aplicar_flujo_ctr(self, datos: bytes, clave_aes: ClaveAES, nonce: bytes, contador_inicial: int = 0) -> bytes:
+        bloques_contador = aes_ctr.generar_bloques_contador(nonce, contador_inicial, (len(datos) + 15) // 16)
+        return xor_bytes(datos, aes_rondas.cifrar_bloques(bloques_contador, clave_aes.palabras_cifrado)[:len(datos)])
+
+
+class MotorPycryptodome:
+    # Motor acelerado con Crypto.Cipher.AES. La clave original son las cuatro primeras palabras de ronda.
+
+    nombre = 'pycryptodome'
+
+    @staticmethod
+    def _cifrador_ecb(clave_aes: ClaveAES):
+        return AES.new(struct.pack('>4I', *clave_aes.palabras_cifrado[:4]), AES.MODE_ECB)
+
+    def cifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return self._cifrador_ecb(clave_aes).encrypt(datos)
+
+    def descifrar_bloques(self, datos: bytes, clave_aes: ClaveAES) -> bytes:
+        return self._cifrador_ecb(clave_aes).decrypt(datos)
+
+    def cifrar_cbc(self, datos: bytes, clave_aes: ClaveAES, vector_inicial: bytes) -> bytes:
+        clave = struct.pack('>4I', *clave_aes.palabras_cifrado[:4])
+        return AES.new(clave, AES.MODE_CBC, iv=bytes(vector_inicial)).encrypt(datos)
+
+    def descifrar_cbc(self, datos: bytes, clave_aes: ClaveAES, vector_inicial: bytes) -> bytes:
+        clave = struct.pack('>4I', *clave_aes.palabras_cifrado[:4])
+        return AES.new(clave, AES.MODE_CBC, iv=bytes(vector_inicial)).decrypt(datos)
+
+    def aplicar_flujo_ctr(self, datos: bytes, clave_aes: ClaveAES, nonce: bytes, contador_inicial: int = 0) -> bytes:
+        # El modo CTR nativo solo coincide con el nuestro para nonces de 8 bytes y sin vuelta del contador.
+        # En los demás casos se cifran nuestros propios bloques de contador en ECB.
+
+        num_bloques = (len(datos) + 15) // 16
+        contador_inicial &= aes_ctr.MASCARA_CONTADOR
+
+        if len(nonce) == 8 and contador_inicial + num_bloques <= aes_ctr.MASCARA_CONTADOR + 1:
+            clave = struct.pack('>4I', *clave_aes.palabras_cifrado[:4])
+            return AES.new(clave, AES.MODE_CTR, nonce=bytes(nonce), initial_value=contador_inicial).encrypt(datos)
+
+        if aes_numpy.NUMPY_DISPONIBLE:
+            bloques_contador = aes_numpy.bloques_contador(nonce, contador_inicial, num_bloques).tobytes()
+        else:
+            bloques_contador = aes_ctr.generar_bloques_contador(nonce, contador_inicial, num_bloques)
+
+        return xor_bytes(datos, self._cifrador_ecb(clave_aes).encrypt(bloques_contador)[:len(datos)])
+
+
+_motores: Dict[str, object] = {
+    'python': MotorPython(), 'bitslice': MotorBitslice(), 'compilado': MotorCompilado(), 'rondas': MotorRondas()
+}
+
+if PYCRYPTODOME_DISPONIBLE:
+    _motores['pycryptodome'] = MotorPycryptodome()
+
+
+def registrar_motor(nombre: str, motor) -> None:
+    # Añade o sustituye un motor. Debe implementar las mismas operaciones que MotorPython.
+
+    _motores[nombre] = motor
+
+
+def motores_disponibles() -> List[str]:
+
+    return sorted(_motores)
+
+
+def obtener_motor(nombre: Optional[str] = None):
+    # Resuelve el motor: argumento explícito, después AES_MOTOR y por último el motor por defecto
+
+    if nombre is None:
+        nombre = os.environ.get(VARIABLE_ENTORNO_MOTOR) or MOTOR_POR_DEFECTO
+
+    try:
+        return _motores[nombre]
+    except KeyError:
+        raise ValueError(f"Motor AES no soportado: '{nombre}'. Usa uno de {', '.join(motores_disponibles())}.")
@@ -0,0 +1,236 @@
+"""
+Este módulo implementa un motor AES-128 vectorizado con NumPy. Cifra y descifra lotes de N bloques a la vez,
+representados como un arreglo (N, 16) de uint8 o (N, 4) de uint32, aplicando las diez rondas con
+búsquedas vectorizadas en las tablas T y Td. NumPy es opcional: si no está instalado, NUMPY_DISPONIBLE
+es False y los modos usan el motor de tablas T bloque a bloque.
+"""
+
+from typing import Sequence
+from .aes_common import sbox, rcon
+from .aes_tablas import Te0, Te1, Te2, Te3, Se0, Se1, Se2, Se3, Td0, Td1, Td2, Td3, Sd0, Sd1, Sd2, Sd3
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_DISPONIBLE: bool = np is not None
+
+# Por debajo de este número de bloques el coste fijo de NumPy supera al del motor de tablas T
+UMBRAL_BLOQUES_NUMPY: int = 48
+# Los datos se procesan en lotes para acotar la memoria de los arreglos temporales
+BLOQUES_POR_LOTE: int = 1 << 16
+
+if NUMPY_DISPONIBLE:
+    _te = [np.array(t, dtype=np.uint32) for t in (Te0, Te1, Te2, Te3)]
+    _se = [np.array(t, dtype=np.uint32) for t in (Se0, Se1, Se2, Se3)]
+    _td = [np.array(t, dtype=np.uint32) for t in (Td0, Td1, Td2, Td3)]
+    _sd = [np.array(t, dtype=np.uint32) for t in (Sd0, Sd1, Sd2, Sd3)]
+    _sbox = np.array(sbox, dtype=np.uint32)
+
+
+def _a_palabras(bloques: 'np.ndarray') -> 'np.ndarray':
+    # Convierte un lote (N, 16) de bytes o (N, 4) de palabras en columnas uint32 nativas
+
+    if bloques.ndim != 2 or bloques.shape[1] not in (4, 16):
+        raise ValueError("El lote debe tener forma (N, 16) en uint8 o (N, 4) en uint32")
+    if bloques.shape[1] == 16:
+        return np.ascontiguousarray(bloques, dtype=np.uint8).view('>u4').astype(np.uint32)
+
+    return bloques.astype(np.uint32, copy=False)
+
+
+def cifrar_lote(bloques: 'np.ndarray', palabras_clave: Sequence[int]) -> 'np.ndarray':
+    # Cifra un lote de bloques. Devuelve un arreglo con la misma forma y tipo que la entrada.
+    # palabras_clave puede ser una clave (44,) o una por bloque (N, 44); en ese caso rk[i] es una columna.
+
+    palabras = _a_palabras(bloques)
+    rk = np.asarray(palabras_clave, dtype=np.uint32)
+    if rk.ndim == 2:
+        rk = np.ascontiguousarray(rk.T)
+    te0, te1, te2, te3 = _te
+    s0 = palabras[:, 0] ^ rk[0]
+    s1 = palabras[:, 1] ^ rk[1]
+    s2 = palabras[:, 2] ^ rk[2]
+    s3 = palabras[:, 3] ^ rk[3]
+
+    for i in range(4, 40, 4):
+        t0 = te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ rk[i]
+        t1 = te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ rk[i + 1]
+        t2 = te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ rk[i + 2]
+        s3 = te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ rk[i + 3]
+        s0, s1, s2 = t0, t1, t2
+
+    se0, se1, se2, se3 = _se
+    salida = np.empty((len(palabras), 4), dtype=np.uint32)
+    salida[:, 0] = se0[s0 >> 24] ^ se1[(s1 >> 16) & 0xFF] ^ se2[(s2 >> 8) & 0xFF] ^ se3[s3 & 0xFF] ^ rk[40]
+    salida[:, 1] = se0[s1 >> 24] ^ se1[(s2 >> 16) & 0xFF] ^ se2[(s3 >> 8) & 0xFF] ^ se3[s0 & 0xFF] ^ rk[41]
+    salida[:, 2] = se0[s2 >> 24] ^ se1[(s3 >> 16) & 0xFF] ^ se2[(s0 >> 8) & 0xFF] ^ se3[s1 & 0xFF] ^ rk[42]
+    salida[:, 3] = se0[s3 >> 24] ^ se1[(s0 >> 16) & 0xFF] ^ se2[(s1 >> 8) & 0xFF] ^ se3[s2 & 0xFF] ^ rk[43]
+
+    if bloques.shape[1] == 16:
+        return salida.astype('>u4').view(np.uint8).reshape(-1, 16)
+
+    return salida
+
+
+def descifrar_lote(bloques: 'np.ndarray', palabras_descifrado: Sequence[int]) -> 'np.ndarray':
+    # Descifra un lote con la clave del cifrado inverso equivalente. Misma forma y tipo que la entrada.
+
+    palabras = _a_palabras(bloques)
+    dk = np.asarray(palabras_descifrado, dtype=np.uint32)
+    td0, td1, td2, td3 = _td
+    s0 = palabras[:, 0] ^ dk[0]
+    s1 = palabras[:, 1] ^ dk[1]
+    s2 = palabras[:, 2] ^ dk[2]
+    s3 = palabras[:, 3] ^ dk[3]
+
+    for i in range(4, 40, 4):
+        t0 = td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ dk[i]
+        t1 = td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ dk[i + 1]
+        t2 = td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ dk[i + 2]
+        s3 = td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ dk[i + 3]
+        s0, s1, s2 = t0, t1, t2
+
+    sd0, sd1, sd2, sd3 = _sd
+    salida = np.empty((len(palabras), 4), dtype=np.uint32)
+    salida[:, 0] = sd0[s0 >> 24] ^ sd1[(s3 >> 16) & 0xFF] ^ sd2[(s2 >> 8) & 0xFF] ^ sd3[s1 & 0xFF] ^ dk[40]
+    salida[:, 1] = sd0[s1 >> 24] ^ sd1[(s0 >> 16) & 0xFF] ^ sd2[(s3 >> 8) & 0xFF] ^ sd3[s2 & 0xFF] ^ dk[41]
+    salida[:, 2] = sd0[s2 >> 24] ^ sd1[(s1 >> 16) & 0xFF] ^ sd2[(s0 >> 8) & 0xFF] ^ sd3[s3 & 0xFF] ^ dk[42]
+    salida[:, 3] = sd0[s3 >> 24] ^ sd1[(s2 >> 16) & 0xFF] ^ sd2[(s1 >> 8) & 0xFF] ^ sd3[s0 & 0xFF] ^ dk[43]
+
+    if bloques.shape[1] == 16:
+        return salida.astype('>u4').view(np.uint8).reshape(-1, 16)
+
+    return salida
+
+
+def cifrar_bloques(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Equivalente vectorizado de aes_tablas.cifrar_bloques para datos de longitud múltiplo de 16
+
+    bloques = np.frombuffer(datos, dtype=np.uint8).reshape(-1, 16)
+    salida = np.empty_like(bloques)
+
+    for i in range(0, len(bloques), BLOQUES_POR_LOTE):
+        salida[i:i + BLOQUES_POR_LOTE] = cifrar_lote(bloques[i:i + BLOQUES_POR_LOTE], palabras_clave)
+
+    return salida.tobytes()
+
+
+def descifrar_bloques(datos: bytes, palabras_descifrado: Sequence[int]) -> bytes:
+    # Equivalente vectorizado de aes_tablas.descifrar_bloques
+
+    bloques = np.frombuffer(datos, dtype=np.uint8).reshape(-1, 16)
+    salida = np.empty_like(bloques)
+
+    for i in range(0, len(bloques), BLOQUES_POR_LOTE):
+        salida[i:i + BLOQUES_POR_LOTE] = descifrar_lote(bloques[i:i + BLOQUES_POR_LOTE], palabras_descifrado)
+
+    return salida.tobytes()
+
+
+def descifrar_cbc_bloques(datos: bytes, palabras_descifrado: Sequence[int], vector_inicial: bytes) -> bytes:
+    # Descifrado CBC sin quitar el relleno: P_i = D(C_i) XOR C_{i-1}.
+    # Todas las D(C_i) de un lote se calculan juntas y el encadenamiento es una XOR con el arreglo desplazado.
+
+    bloques = np.frombuffer(datos, dtype=np.uint8).reshape(-1, 16)
+    iv = np.frombuffer(bytes(vector_inicial), dtype=np.uint8).reshape(1, 16)
+    salida = np.empty_like(bloques)
+
+    for i in range(0, len(bloques), BLOQUES_POR_LOTE):
+        fin = min(i + BLOQUES_POR_LOTE, len(bloques))
+        anteriores = bloques[i - 1:fin - 1] if i else np.concatenate((iv, bloques[:fin - 1]))
+        np.bitwise_xor(descifrar_lote(bloques[i:fin], palabras_descifrado), anteriores, out=salida[i:fin])
+
+    return salida.tobytes()
+
+
+def bloques_contador(nonce: bytes, contador_inicial: int, num_bloques: int) -> 'np.ndarray':
+    # Construye de una vez los bloques (nonce || contador de 64 bits) como arreglo (N, 16).
+    # La suma en uint64 da la vuelta módulo 2^64, igual que el contador del modo CTR.
+
+    contadores = np.arange(num_bloques, dtype=np.uint64) + np.uint64(contador_inicial & 0xFFFFFFFFFFFFFFFF)
+    bytes_contador = contadores.astype('>u8').view(np.uint8).reshape(-1, 8)
+    prefijo = bytes(nonce[:16])
+    bloques = np.empty((num_bloques, 16), dtype=np.uint8)
+    bloques[:, :len(prefijo)] = np.frombuffer(prefijo, dtype=np.uint8)
+    bloques[:, len(prefijo):] = bytes_contador[:, :16 - len(prefijo)]
+
+    return bloques
+
+
+def aplicar_flujo_ctr(datos: bytes, palabras_clave: Sequence[int], nonce: bytes, contador_inicial: int = 0) -> bytes:
+    # Cifra (o descifra) en modo CTR: genera el flujo de clave por lotes y lo combina con una sola XOR por lote
+
+    entrada = np.frombuffer(datos, dtype=np.uint8)
+    salida = np.empty_like(entrada)
+    bytes_por_lote = BLOQUES_POR_LOTE * 16
+
+    for inicio in range(0, len(entrada), bytes_por_lote):
+        fragmento = entrada[inicio:inicio + bytes_por_lote]
+        num_bloques = (len(fragmento) + 15) // 16
+        contadores = bloques_contador(nonce, contador_inicial + inicio // 16, num_bloques)
+        flujo_clave = cifrar_lote(contadores, palabras_clave).reshape(-1)
+        np.bitwise_xor(fragmento, flujo_clave[:len(fragmento)], out=salida[inicio:inicio + len(fragmento)])
+
+    return salida.tobytes()
+
+
+def expandir_claves(claves: 'np.ndarray') -> 'np.ndarray':
+    # Expande M claves a la vez: (M, 16) en uint8 -> (M, 44) palabras, igual que expandir_clave_palabras
+
+    w = np.empty((len(claves), 44), dtype=np.uint32)
+    w[:, :4] = np.ascontiguousarray(claves, dtype=np.uint8).view('>u4')
+
+    for i in range(4, 44):
+        t = w[:, i - 1]
+        if i % 4 == 0:
+            # RotWord, SubWord y la constante de ronda
+            t = ((_sbox[(t >> 16) & 0xFF] << 24) | (_sbox[(t >> 8) & 0xFF] << 16) |
+                 (_sbox[t & 0xFF] << 8) | _sbox[t >> 24]) ^ np.uint32(rcon[i // 4] << 24)
+        w[:, i] = w[:, i - 4] ^ t
+
+    return w
+
+
+def bloques_contador_multiples(nonces: Sequence[bytes], num_bloques: Sequence[int]) -> 'np.ndarray':
+    # Bloques de contador de varios mensajes seguidos: el mensaje m aporta num_bloques[m] bloques con su
+    # nonce y un contador que empieza en 0. Los nonces de la misma longitud se rellenan de una vez.
+
+    total = int(sum(num_bloques))
+    mensaje = np.repeat(np.arange(len(nonces)), num_bloques)
+    primeros = np.cumsum(num_bloques) - np.asarray(num_bloques)
+    contadores = (np.arange(total) - np.repeat(primeros, num_bloques)).astype(np.uint64)
+    bytes_contador = contadores.astype('>u8').view(np.uint8).reshape(-1, 8)
+
+    prefijos = np.zeros((len(nonces), 16), dtype=np.uint8)
+    longitudes = np.empty(len(nonces), dtype=np.int64)
+    for m, nonce in enumerate(nonces):
+        prefijo = bytes(nonce[:16])
+        prefijos[m, :len(prefijo)] = np.frombuffer(prefijo, dtype=np.uint8)
+        longitudes[m] = len(prefijo)
+
+    bloques = np.empty((total, 16), dtype=np.uint8)
+    longitud_por_bloque = longitudes[mensaje]
+    for longitud in np.unique(longitudes):
+        filas = longitud_por_bloque == longitud
+        bloques[filas, :longitud] = prefijos[mensaje[filas], :longitud]
+        bloques[filas, longitud:] = bytes_contador[filas, :16 - longitud]
+
+    return bloques
+
+
+def flujo_clave_multiclave(nonces: Sequence[bytes], num_bloques: Sequence[int], indices_clave: Sequence[int],
+                           claves: 'np.ndarray') -> 'np.ndarray':
+    # Flujo de clave de varios mensajes, cada uno con su clave: claves es (M, 44) y indices_clave[m] es la
+    # fila del mensaje m. Cada bloque toma sus claves de ronda de esa fila y todos se cifran juntos.
+
+    contadores = bloques_contador_multiples(nonces, num_bloques)
+    clave_por_bloque = np.repeat(np.asarray(indices_clave), num_bloques)
+    flujo_clave = np.empty_like(contadores)
+
+    for i in range(0, len(contadores), BLOQUES_POR_LOTE):
+        fin = i + BLOQUES_POR_LOTE
+        flujo_clave[i:fin] = cifrar_lote(contadores[i:fin], claves[clave_por_bloque[i:fin]])
+
+    return flujo_clave.reshape(-1)
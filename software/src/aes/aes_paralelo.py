@@ -0,0 +1,177 @@
+"""
+Este módulo reparte entre varios procesos las operaciones AES-128 que no tienen dependencias entre bloques:
+el cifrado en modo CTR y el descifrado en modo CBC. Los bloques se dividen en rangos contiguos y cada
+proceso trabaja sobre su porción: en CTR calcula su propio contador inicial y en CBC toma como vector
+inicial el último bloque cifrado del rango anterior. Los datos se intercambian mediante
+multiprocessing.shared_memory para no serializar los búferes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Union, List, Optional, Sequence, Tuple, Callable
+from .aes_common import quitar_padding
+from .aes_clave import ClaveAES, obtener_clave
+from .aes_ctr import aplicar_flujo_clave
+from .aes_cbc import descifrar_bloques_cbc
+
+# Cada proceso avanza por su rango en fragmentos de este tamaño para acotar su memoria
+BYTES_POR_FRAGMENTO: int = 1 << 20
+# Por debajo de este tamaño no compensa arrancar procesos
+MINIMO_BYTES_PARALELO: int = 1 << 20
+
+
+def dividir_bloques(num_bloques: int, partes: int) -> List[Tuple[int, int]]:
+    # Divide [0, num_bloques) en rangos contiguos de tamaño lo más parecido posible
+
+    base, resto = divmod(num_bloques, partes)
+    rangos = []
+    inicio = 0
+
+    for i in range(partes):
+        fin = inicio + base + (1 if i < resto else 0)
+        if fin > inicio:
+            rangos.append((inicio, fin))
+        inicio = fin
+
+    return rangos
+
+
+def _cifrar_ctr_rango(entrada: shared_memory.SharedMemory, salida: shared_memory.SharedMemory,
+                      inicio: int, fin: int, palabras_clave: Sequence[int], nonce: bytes) -> None:
+    # El contador del primer bloque de cada fragmento se deduce de su posición
+
+    fragmento = entrada.buf[inicio:fin]
+    salida.buf[inicio:fin] = aplicar_flujo_clave(fragmento, palabras_clave, nonce, inicio // 16)
+    fragmento.release()
+
+
+def _descifrar_cbc_rango(entrada: shared_memory.SharedMemory, salida: shared_memory.SharedMemory,
+                         inicio: int, fin: int, palabras_descifrado: Sequence[int], vector_inicial: bytes) -> None:
+    # El bloque cifrado anterior al fragmento hace de vector inicial
+
+    anterior = bytes(entrada.buf[inicio - 16:inicio]) if inicio else vector_inicial
+    fragmento = entrada.buf[inicio:fin]
+    salida.buf[inicio:fin] = descifrar_bloques_cbc(fragmento, palabras_descifrado, anterior)
+    fragmento.release()
+
+
+def _procesar_rango(funcion: Callable, nombre_entrada: str, nombre_salida: str, longitud: int,
+                    bloque_inicial: int, bloque_final: int, *argumentos) -> None:
+    # Se ejecuta en el proceso trabajador: procesa los bloques [bloque_inicial, bloque_final) por fragmentos
+
+    entrada = shared_memory.SharedMemory(name=nombre_entrada)
+    salida = shared_memory.SharedMemory(name=nombre_salida)
+
+    try:
+        fin = min(bloque_final * 16, longitud)
+        for inicio in range(bloque_inicial * 16, fin, BYTES_POR_FRAGMENTO):
+            funcion(entrada, salida, inicio, min(inicio + BYTES_POR_FRAGMENTO, fin), *argumentos)
+    finally:
+        entrada.close()
+        salida.close()
+
+
+def _ejecutar_en_paralelo(datos: bytes, trabajadores: int, funcion: Callable, *argumentos) -> bytes:
+    # Copia los datos a memoria compartida, reparte los bloques entre procesos y recoge la salida
+
+    longitud = len(datos)
+    entrada = shared_memory.SharedMemory(create=True, size=longitud)
+    salida = shared_memory.SharedMemory(create=True, size=longitud)
+
+    try:
+        entrada.buf[:longitud] = datos
+        rangos = dividir_bloques((longitud + 15) // 16, trabajadores)
+
+        with ProcessPoolExecutor(max_workers=len(rangos)) as ejecutor:
+            tareas = [
+                ejecutor.submit(_procesar_rango, funcion, entrada.name, salida.name, longitud, inicio, fin, *argumentos)
+                for inicio, fin in rangos
+            ]
+            for tarea in tareas:
+                tarea.result()
+
+        return bytes(salida.buf[:longitud])
+    finally:
+        entrada.close()
+        entrada.unlink()
+        salida.close()
+        salida.unlink()
+
+
+def _numero_trabajadores(trabajadores: Optional[int]) -> int:
+
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    if trabajadores < 1:
+        raise ValueError("El número de trabajadores debe ser al menos 1")
+
+    return trabajadores
+
+
+def cifrar_ctr_paralelo(texto_plano: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+                        nonce: bytes, trabajadores: Optional[int] = None) -> bytes:
+    # Produce exactamente la misma salida que cifrar_ctr, repartiendo los bloques entre procesos
+
+    clave_aes = obtener_clave(clave)
+
+    if isinstance(texto_plano, str):
+        texto_plano = texto_plano.encode()
+    elif isinstance(texto_plano, list):
+        texto_plano = bytes(texto_plano)
+
+    if not isinstance(texto_plano, bytes):
+        raise TypeError("El texto plano debe ser bytes, una lista de enteros o una cadena")
+
+    if len(nonce) < 8:
+        raise ValueError("El nonce debe tener al menos 8 bytes de longitud")
+
+    trabajadores = _numero_trabajadores(trabajadores)
+    palabras_clave = list(clave_aes.palabras_cifrado)
+
+    if trabajadores == 1 or len(texto_plano) < MINIMO_BYTES_PARALELO:
+        return aplicar_flujo_clave(texto_plano, palabras_clave, nonce)
+
+    return _ejecutar_en_paralelo(texto_plano, trabajadores, _cifrar_ctr_rango, palabras_clave, bytes(nonce))
+
+
+def descifrar_ctr_paralelo(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+                           nonce: bytes, trabajadores: Optional[int] = None) -> bytes:
+    # Se hace de la misma forma que el cifrado
+    return cifrar_ctr_paralelo(texto_cifrado, clave, nonce, trabajadores)
+
+
+def descifrar_cbc_paralelo(texto_cifrado: Union[str, List[int], bytes], clave: Union[str, List[int], bytes, ClaveAES],
+                           vector_inicial: bytes, trabajadores: Optional[int] = None) -> bytes:
+    # Produce exactamente la misma salida que descifrar_cbc, repartiendo los bloques entre procesos
+
+    clave_aes = obtener_clave(clave)
+
+    if isinstance(texto_cifrado, str):
+        try:
+            texto_cifrado = bytes.fromhex(texto_cifrado)
+        except ValueError:
+            raise ValueError("Texto cifrado inválido: debe ser una cadena hexadecimal si es string")
+    elif isinstance(texto_cifrado, list):
+        texto_cifrado = bytes(texto_cifrado)
+
+    if not isinstance(texto_cifrado, bytes):
+        raise TypeError("El texto cifrado debe ser bytes, una lista de enteros o una cadena hexadecimal")
+
+    if len(texto_cifrado) % 16 != 0:
+        raise ValueError("La longitud del texto cifrado debe ser múltiplo de 16 bytes")
+
+    if len(vector_inicial) != 16:
+        raise ValueError("El vector inicial debe tener 16 bytes de longitud")
+
+    trabajadores = _numero_trabajadores(trabajadores)
+    palabras_descifrado = list(clave_aes.palabras_descifrado)
+
+    if trabajadores == 1 or len(texto_cifrado) < MINIMO_BYTES_PARALELO:
+        texto_plano_rellenado = descifrar_bloques_cbc(texto_cifrado, palabras_descifrado, vector_inicial)
+    else:
+        texto_plano_rellenado = _ejecutar_en_paralelo(
+            texto_cifrado, trabajadores, _descifrar_cbc_rango, palabras_descifrado, bytes(vector_inicial)
+        )
+
+    return quitar_padding(texto_plano_rellenado)
@@ -0,0 +1,102 @@
+"""
+Este módulo implementa un motor AES-128 que avanza ronda a ronda sobre todo el búfer a la vez, usando solo
+operaciones integradas que se ejecutan en C y sin depender de NumPy:
+
+- SubBytes es una única llamada a bytes.translate con la S-box como tabla.
+- AddRoundKey es una XOR entre enteros: el búfer completo contra la clave de ronda repetida N veces.
+- ShiftRows y las rotaciones de filas de MixColumns son desplazamientos del entero con máscaras que
+  seleccionan en cada bloque los bytes que se mueven la misma distancia.
+- La multiplicación por 2 de MixColumns es otro translate con la tabla mul2.
+
+Sustituye al cifrado bloque a bloque con tablas T desde unos pocos bloques y, en instalaciones sin NumPy,
+también al motor vectorizado.
+"""
+
+import struct
+from functools import lru_cache
+from typing import Sequence, Tuple
+from .aes_common import sbox, mul2
+
+# Los datos se procesan por lotes para acotar la memoria de los búferes intermedios
+BLOQUES_POR_LOTE_RONDAS: int = 1 << 12
+# Por debajo de este número de bloques el cifrado bloque a bloque con tablas T es más rápido
+UMBRAL_BLOQUES_RONDAS: int = 8
+# Con NumPy instalado, a partir de este número de bloques el motor vectorizado es más rápido
+MAXIMO_BLOQUES_RONDAS: int = 384
+
+_TABLA_SBOX = bytes(sbox)
+_TABLA_MUL2 = bytes(mul2)
+
+# Posición de origen de cada byte del bloque (k = fila + 4 · columna)
+_DESPLAZAR_FILAS = [k % 4 + 4 * ((k // 4 + k % 4) % 4) for k in range(16)]
+_ROTAR_1 = [(k + 1) % 4 + 4 * (k // 4) for k in range(16)]
+_ROTAR_2 = [(k + 2) % 4 + 4 * (k // 4) for k in range(16)]
+
+
+@lru_cache(maxsize=8)
+def _grupos_permutacion(origen: Tuple[int, ...], num_bloques: int) -> Tuple[Tuple[int, int], ...]:
+    # Agrupa los bytes de destino según la distancia a su origen. Con el búfer leído como entero big-endian,
+    # traer el byte p + d a la posición p es desplazar 8·d bits a la izquierda y quedarse con la máscara.
+
+    grupos = {}
+    for k, fuente in enumerate(origen):
+        grupos.setdefault(fuente - k, []).append(k)
+
+    resultado = []
+    for distancia, posiciones in grupos.items():
+        patron = bytes(0xFF if k in posiciones else 0 for k in range(16))
+        resultado.append((8 * distancia, int.from_bytes(patron * num_bloques, 'big')))
+
+    return tuple(resultado)
+
+
+def _permutar(x: int, grupos: Tuple[Tuple[int, int], ...]) -> int:
+    # Aplica la misma permutación de bytes a todos los bloques con un desplazamiento y una máscara por grupo
+
+    salida = 0
+    for desplazamiento, mascara in grupos:
+        if desplazamiento >= 0:
+            salida |= (x << desplazamiento) & mascara
+        else:
+            salida |= (x >> -desplazamiento) & mascara
+
+    return salida
+
+
+def cifrar_lote(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Cifra len(datos) // 16 bloques a la vez, aplicando cada ronda a todo el búfer
+
+    longitud = len(datos)
+    num_bloques = longitud // 16
+    desde_bytes = int.from_bytes
+    desplazar_filas = _grupos_permutacion(tuple(_DESPLAZAR_FILAS), num_bloques)
+    rotar_1 = _grupos_permutacion(tuple(_ROTAR_1), num_bloques)
+    rotar_2 = _grupos_permutacion(tuple(_ROTAR_2), num_bloques)
+    claves = [
+        desde_bytes(struct.pack('>4I', *palabras_clave[4 * ronda:4 * ronda + 4]) * num_bloques, 'big')
+        for ronda in range(11)
+    ]
+    estado = (desde_bytes(datos, 'big') ^ claves[0]).to_bytes(longitud, 'big')
+
+    for ronda in range(1, 10):
+        # MixColumns: out_r = 2·t_r ^ a_(r+1) ^ t_(r+2), con a = ShiftRows(SubBytes(estado)) y t_r = a_r ^ a_(r+1)
+        a = _permutar(desde_bytes(estado.translate(_TABLA_SBOX), 'big'), desplazar_filas)
+        a1 = _permutar(a, rotar_1)
+        t = a ^ a1
+        doble = desde_bytes(t.to_bytes(longitud, 'big').translate(_TABLA_MUL2), 'big')
+        estado = (doble ^ a1 ^ _permutar(t, rotar_2) ^ claves[ronda]).to_bytes(longitud, 'big')
+
+    final = _permutar(desde_bytes(estado.translate(_TABLA_SBOX), 'big'), desplazar_filas) ^ claves[10]
+
+    return final.to_bytes(longitud, 'big')
+
+
+def cifrar_bloques(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Equivalente ronda a ronda de aes_tablas.cifrar_bloques para datos de longitud múltiplo de 16
+
+    bytes_por_lote = BLOQUES_POR_LOTE_RONDAS * 16
+
+    return b''.join(
+        cifrar_lote(datos[inicio:inicio + bytes_por_lote], palabras_clave)
+        for inicio in range(0, len(datos), bytes_por_lote)
+    )
@@ -0,0 +1,193 @@
+"""
+Este módulo define una sesión AES-128 en modo CTR para canales interactivos. Un hilo en segundo plano
+precalcula el flujo de clave de un par (clave, nonce) y lo deja en un búfer circular acotado, de modo que
+cifrar un mensaje solo requiere tomar los bytes ya calculados y hacer la XOR. La sesión es un único flujo
+continuo: cada mensaje consume los bytes siguientes del flujo y ningún byte se entrega dos veces.
+"""
+
+import threading
+import weakref
+from typing import Union, List, Dict
+from .aes_common import xor_bytes
+from .aes_clave import ClaveAES, obtener_clave
+from .aes_ctr import aplicar_flujo_clave, MASCARA_CONTADOR
+
+CAPACIDAD_SESION: int = 64 * 1024
+BYTES_POR_RELLENO: int = 4096
+
+
+class _EstadoSesion:
+    # Estado compartido con el hilo productor. Está separado de SesionCTR para que el hilo no retenga la
+    # sesión: si esta se abandona sin cerrar, el recolector la libera y weakref.finalize detiene el hilo.
+
+    __slots__ = ('palabras_clave', 'nonce', 'capacidad', 'bytes_por_relleno', 'anillo', 'producido',
+                 'consumido', 'esperas', 'cerrada', 'agotada', 'error', 'condicion', 'consumo')
+
+    def __init__(self, palabras_clave, nonce: bytes, capacidad: int, bytes_por_relleno: int):
+
+        self.palabras_clave = palabras_clave
+        self.nonce = nonce
+        self.capacidad = capacidad
+        self.bytes_por_relleno = bytes_por_relleno
+        self.anillo = bytearray(capacidad)
+        # Posiciones absolutas en el flujo de clave: [consumido, producido) está en el anillo
+        self.producido = 0
+        self.consumido = 0
+        self.esperas = 0
+        self.cerrada = False
+        # El contador se ha agotado: el productor termina, pero lo que queda en el anillo aún se entrega
+        self.agotada = False
+        # Excepción del productor, que se relanza a los consumidores
+        self.error = None
+        self.condicion = threading.Condition()
+        # Un solo consumidor a la vez, para que cada mensaje reciba un tramo contiguo del flujo
+        self.consumo = threading.Lock()
+
+
+def _rellenar(estado: _EstadoSesion) -> None:
+    # Hilo productor: calcula el flujo de clave fuera del cerrojo y lo copia al anillo cuando hay hueco
+
+    try:
+        while True:
+            with estado.condicion:
+                while not estado.cerrada and estado.capacidad - (estado.producido - estado.consumido) < estado.bytes_por_relleno:
+                    estado.condicion.wait()
+                if estado.cerrada:
+                    return
+                posicion = estado.producido
+
+            if (posicion + estado.bytes_por_relleno) // 16 > MASCARA_CONTADOR + 1:
+                # El contador de 64 bits se ha agotado: la sesión no puede seguir sin repetir flujo
+                with estado.condicion:
+                    estado.agotada = True
+                    estado.condicion.notify_all()
+                return
+
+            flujo_clave = aplicar_flujo_clave(bytes(estado.bytes_por_relleno), estado.palabras_clave,
+                                              estado.nonce, posicion // 16)
+
+            with estado.condicion:
+                # La capacidad es múltiplo del relleno, así que cada relleno cabe sin partirse
+                indice = posicion % estado.capacidad
+                estado.anillo[indice:indice + estado.bytes_por_relleno] = flujo_clave
+                estado.producido = posicion + estado.bytes_por_relleno
+                estado.condicion.notify_all()
+    except BaseException as error:
+        # Sin productor los consumidores esperarían para siempre: se marca la sesión como fallida
+        with estado.condicion:
+            estado.error = error
+            estado.cerrada = True
+            estado.condicion.notify_all()
+
+
+def _detener(estado: _EstadoSesion, hilo: threading.Thread) -> None:
+    # Lo llama cerrar() o, si la sesión se abandona sin cerrar, weakref.finalize al recolectarla
+
+    with estado.condicion:
+        estado.cerrada = True
+        estado.condicion.notify_all()
+    if hilo is not threading.current_thread():
+        hilo.join()
+    # El flujo de clave pendiente no se usará más
+    estado.anillo[:] = bytes(estado.capacidad)
+
+
+class SesionCTR:
+
+    def __init__(self, clave: Union[str, List[int], bytes, ClaveAES], nonce: bytes,
+                 capacidad: int = CAPACIDAD_SESION, bytes_por_relleno: int = BYTES_POR_RELLENO):
+
+        # Con un nonce de más de 8 bytes el contador se trunca y el flujo de clave se repetiría
+        if len(nonce) != 8:
+            raise ValueError("La sesión CTR necesita un nonce de 8 bytes")
+        if bytes_por_relleno <= 0 or bytes_por_relleno % 16 != 0:
+            raise ValueError("El tamaño de relleno debe ser un múltiplo positivo de 16 bytes")
+        if capacidad < bytes_por_relleno or capacidad % bytes_por_relleno != 0:
+            raise ValueError("La capacidad debe ser un múltiplo del tamaño de relleno")
+
+        self._estado = _EstadoSesion(obtener_clave(clave).palabras_cifrado, bytes(nonce), capacidad, bytes_por_relleno)
+        hilo = threading.Thread(target=_rellenar, args=(self._estado,), name="SesionCTR", daemon=True)
+        hilo.start()
+        self._finalizador = weakref.finalize(self, _detener, self._estado, hilo)
+
+    def _consumir(self, longitud: int) -> bytes:
+        # Toma los siguientes bytes del flujo de clave, esperando al productor si el anillo se vacía. El
+        # cerrojo de consumo se mantiene durante toda la llamada: aunque la condición se suelte en cada
+        # espera, ningún otro hilo puede llevarse bytes de en medio del tramo de este mensaje.
+
+        estado = self._estado
+        partes = []
+
+        with estado.consumo:
+            while longitud:
+                with estado.condicion:
+                    if estado.producido == estado.consumido:
+                        estado.esperas += 1
+                        while estado.producido == estado.consumido and not estado.cerrada and not estado.agotada:
+                            estado.condicion.wait()
+                    if estado.error is not None:
+                        raise estado.error
+                    if estado.cerrada:
+                        raise ValueError("La sesión CTR está cerrada")
+                    if estado.producido == estado.consumido:
+                        raise ValueError("El contador de la sesión CTR se ha agotado")
+
+                    indice = estado.consumido % estado.capacidad
+                    cantidad = min(longitud, estado.producido - estado.consumido, estado.capacidad - indice)
+                    partes.append(bytes(estado.anillo[indice:indice + cantidad]))
+                    estado.consumido += cantidad
+                    estado.condicion.notify_all()
+
+                longitud -= cantidad
+
+        return b''.join(partes)
+
+    def cifrar(self, texto_plano: Union[str, List[int], bytes]) -> bytes:
+        # Cada mensaje recibe un tramo contiguo del flujo, también con varios hilos; el resultado coincide con
+        # cifrar el mensaje a partir del desplazamiento `posicion` que tenía la sesión al empezar la llamada
+
+        if isinstance(texto_plano, str):
+            texto_plano = texto_plano.encode()
+        elif isinstance(texto_plano, list):
+            texto_plano = bytes(texto_plano)
+
+        if not isinstance(texto_plano, (bytes, bytearray)):
+            raise TypeError("El texto plano debe ser bytes, una lista de enteros o una cadena")
+
+        return xor_bytes(texto_plano, self._consumir(len(texto_plano)))
+
+    def descifrar(self, texto_cifrado: Union[List[int], bytes]) -> bytes:
+        # Se hace de la misma forma que el cifrado; el receptor debe procesar los mensajes en el mismo orden
+        return self.cifrar(texto_cifrado)
+
+    @property
+    def posicion(self) -> int:
+        # Desplazamiento en el flujo de clave en el que empezará el siguiente mensaje
+
+        with self._estado.condicion:
+            return self._estado.consumido
+
+    def estadisticas(self) -> Dict[str, int]:
+
+        estado = self._estado
+        with estado.condicion:
+            return {
+                'consumido': estado.consumido,
+                'producido': estado.producido,
+                'ocupacion': estado.producido - estado.consumido,
+                'capacidad': estado.capacidad,
+                'esperas': estado.esperas,
+            }
+
+    def cerrar(self) -> None:
+
+        self._finalizador()
+
+    def __enter__(self) -> 'SesionCTR':
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    def __repr__(self) -> str:
+        return f"<SesionCTR en 0x{id(self):x}>"
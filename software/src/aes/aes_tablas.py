@@ -0,0 +1,154 @@
+"""
+Este módulo implementa el cifrado y descifrado de bloques AES-128 con tablas T sobre palabras de 32 bits.
+Las tablas Te0..Te3 combinan SubBytes, ShiftRows y MixColumns, de modo que cada ronda se reduce
+a cuatro búsquedas en tabla y cuatro XOR por columna del estado. El descifrado usa el cifrado
+inverso equivalente de FIPS-197 (sección 5.3.5) con las tablas Td0..Td3.
+"""
+
+import struct
+from typing import List, Sequence, Tuple
+from .aes_common import sbox, inv_sbox, mul2, mul3, mul9, mul11, mul13, mul14, expandir_clave
+
+Palabras = Tuple[int, int, int, int]
+
+
+def _rotar_palabra(palabra: int, bits: int) -> int:
+    # Rota una palabra de 32 bits hacia la derecha
+
+    return ((palabra >> bits) | (palabra << (32 - bits))) & 0xFFFFFFFF
+
+
+# Cada entrada de Te0 es la columna (2·S[x], S[x], S[x], 3·S[x]); Te1..Te3 son sus rotaciones
+Te0: List[int] = [(mul2[s] << 24) | (s << 16) | (s << 8) | mul3[s] for s in sbox]
+Te1: List[int] = [_rotar_palabra(t, 8) for t in Te0]
+Te2: List[int] = [_rotar_palabra(t, 16) for t in Te0]
+Te3: List[int] = [_rotar_palabra(t, 24) for t in Te0]
+
+# Para la última ronda (sin MixColumns) basta con la S-box desplazada a cada fila
+Se0: List[int] = [s << 24 for s in sbox]
+Se1: List[int] = [s << 16 for s in sbox]
+Se2: List[int] = [s << 8 for s in sbox]
+Se3: List[int] = list(sbox)
+
+# Cada entrada de Td0 es la columna (14·S⁻¹[x], 9·S⁻¹[x], 13·S⁻¹[x], 11·S⁻¹[x])
+Td0: List[int] = [(mul14[s] << 24) | (mul9[s] << 16) | (mul13[s] << 8) | mul11[s] for s in inv_sbox]
+Td1: List[int] = [_rotar_palabra(t, 8) for t in Td0]
+Td2: List[int] = [_rotar_palabra(t, 16) for t in Td0]
+Td3: List[int] = [_rotar_palabra(t, 24) for t in Td0]
+
+Sd0: List[int] = [s << 24 for s in inv_sbox]
+Sd1: List[int] = [s << 16 for s in inv_sbox]
+Sd2: List[int] = [s << 8 for s in inv_sbox]
+Sd3: List[int] = list(inv_sbox)
+
+
+def expandir_clave_palabras(clave: Sequence[int]) -> List[int]:
+    # Expande la clave y agrupa las claves de ronda en 44 palabras big-endian
+
+    clave_expandida = bytes(expandir_clave(list(clave)))
+
+    return list(struct.unpack('>44I', clave_expandida))
+
+
+def expandir_clave_descifrado(palabras_clave: Sequence[int]) -> List[int]:
+    # Invierte el orden de las claves de ronda y aplica InvMixColumns a las rondas intermedias.
+    # Td[S[b]] equivale a multiplicar b por la columna de InvMixColumns.
+
+    palabras_descifrado = list(palabras_clave[40:44])
+
+    for ronda in range(9, 0, -1):
+        for palabra in palabras_clave[ronda*4:(ronda+1)*4]:
+            palabras_descifrado.append(
+                Td0[sbox[palabra >> 24]] ^ Td1[sbox[(palabra >> 16) & 0xFF]] ^
+                Td2[sbox[(palabra >> 8) & 0xFF]] ^ Td3[sbox[palabra & 0xFF]]
+            )
+
+    palabras_descifrado.extend(palabras_clave[0:4])
+
+    return palabras_descifrado
+
+
+def cifrar_palabras(s0: int, s1: int, s2: int, s3: int, palabras_clave: Sequence[int]) -> Palabras:
+    # Cifra un bloque representado como cuatro columnas de 32 bits
+
+    rk = palabras_clave
+    te0, te1, te2, te3 = Te0, Te1, Te2, Te3
+    s0 ^= rk[0]
+    s1 ^= rk[1]
+    s2 ^= rk[2]
+    s3 ^= rk[3]
+
+    for i in range(4, 40, 4):
+        t0 = te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ rk[i]
+        t1 = te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ rk[i + 1]
+        t2 = te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ rk[i + 2]
+        s3 = te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ rk[i + 3]
+        s0, s1, s2 = t0, t1, t2
+
+    return (
+        Se0[s0 >> 24] ^ Se1[(s1 >> 16) & 0xFF] ^ Se2[(s2 >> 8) & 0xFF] ^ Se3[s3 & 0xFF] ^ rk[40],
+        Se0[s1 >> 24] ^ Se1[(s2 >> 16) & 0xFF] ^ Se2[(s3 >> 8) & 0xFF] ^ Se3[s0 & 0xFF] ^ rk[41],
+        Se0[s2 >> 24] ^ Se1[(s3 >> 16) & 0xFF] ^ Se2[(s0 >> 8) & 0xFF] ^ Se3[s1 & 0xFF] ^ rk[42],
+        Se0[s3 >> 24] ^ Se1[(s0 >> 16) & 0xFF] ^ Se2[(s1 >> 8) & 0xFF] ^ Se3[s2 & 0xFF] ^ rk[43],
+    )
+
+
+def cifrar_bloque(bloque: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Cifra un único bloque de 16 bytes
+
+    return struct.pack('>4I', *cifrar_palabras(*struct.unpack('>4I', bloque), palabras_clave))
+
+
+def cifrar_bloques(datos: bytes, palabras_clave: Sequence[int]) -> bytes:
+    # Cifra bloque a bloque (sin encadenamiento ni relleno) datos de longitud múltiplo de 16
+
+    salida: List[int] = []
+    extender = salida.extend
+
+    for s0, s1, s2, s3 in struct.iter_unpack('>4I', datos):
+        extender(cifrar_palabras(s0, s1, s2, s3, palabras_clave))
+
+    return struct.pack(f'>{len(salida)}I', *salida)
+
+
+def descifrar_palabras(s0: int, s1: int, s2: int, s3: int, palabras_descifrado: Sequence[int]) -> Palabras:
+    # Descifra un bloque con la clave de descifrado producida por expandir_clave_descifrado
+
+    dk = palabras_descifrado
+    td0, td1, td2, td3 = Td0, Td1, Td2, Td3
+    s0 ^= dk[0]
+    s1 ^= dk[1]
+    s2 ^= dk[2]
+    s3 ^= dk[3]
+
+    for i in range(4, 40, 4):
+        t0 = td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ dk[i]
+        t1 = td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ dk[i + 1]
+        t2 = td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ dk[i + 2]
+        s3 = td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ dk[i + 3]
+        s0, s1, s2 = t0, t1, t2
+
+    return (
+        Sd0[s0 >> 24] ^ Sd1[(s3 >> 16) & 0xFF] ^ Sd2[(s2 >> 8) & 0xFF] ^ Sd3[s1 & 0xFF] ^ dk[40],
+        Sd0[s1 >> 24] ^ Sd1[(s0 >> 16) & 0xFF] ^ Sd2[(s3 >> 8) & 0xFF] ^ Sd3[s2 & 0xFF] ^ dk[41],
+        Sd0[s2 >> 24] ^ Sd1[(s1 >> 16) & 0xFF] ^ Sd2[(s0 >> 8) & 0xFF] ^ Sd3[s3 & 0xFF] ^ dk[42],
+        Sd0[s3 >> 24] ^ Sd1[(s2 >> 16) & 0xFF] ^ Sd2[(s1 >> 8) & 0xFF] ^ Sd3[s0 & 0xFF] ^ dk[43],
+    )
+
+
+def descifrar_bloque(bloque: bytes, palabras_descifrado: Sequence[int]) -> bytes:
+    # Descifra un único bloque de 16 bytes
+
+    return struct.pack('>4I', *descifrar_palabras(*struct.unpack('>4I', bloque), palabras_descifrado))
+
+
+def descifrar_bloques(datos: bytes, palabras_descifrado: Sequence[int]) -> bytes:
+    # Descifra bloque a bloque (sin encadenamiento ni relleno) datos de longitud múltiplo de 16
+
+    salida: List[int] = []
+    extender = salida.extend
+
+    for s0, s1, s2, s3 in struct.iter_unpack('>4I', datos):
+        extender(descifrar_palabras(s0, s1, s2, s3, palabras_descifrado))
+
+    return struct.pack(f'>{len(salida)}I', *salida)
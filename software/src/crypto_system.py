@@ -2,17 +2,23 @@
 
 
 import secrets
-from typing import Tuple, Union
+from typing import Tuple, Union, Optional
 from .aes import cifrar_ctr, descifrar_ctr
+from .aes.aes_gcm import cifrar_gcm, descifrar_gcm
+from .aes.aes_motores import obtener_motor
 from .dh import generar_par_claves_25519, calcular_secreto_compartido_25519, generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1
 from .kdf import derivar_clave
 
 
 class SistemaCriptografico:
     
-    def __init__(self, curva: str = '25519'):
+    def __init__(self, curva: str = '25519', motor: Optional[str] = None):
 
         self.curva = curva
+        # Motor AES para todos los mensajes de esta instancia; None deja la elección a AES_MOTOR
+        if motor is not None:
+            obtener_motor(motor)
+        self.motor = motor
         if curva == '25519':
             self.generar_par_claves = generar_par_claves_25519
             self.calcular_secreto_compartido = calcular_secreto_compartido_25519
@@ -42,29 +48,47 @@ class SistemaCriptografico:
             if not (isinstance(clave, int) or (isinstance(clave, tuple) and len(clave) == 2 and all(isinstance(x, int) for x in clave))):
                 raise TypeError("Las claves para secp256r1 deben ser enteros o tuplas de dos enteros")
 
+    def _derivar_clave_aes(self, clave_privada: Union[bytes, int], clave_publica: Union[bytes, Tuple[int, int]]) -> bytes:
+        self._validar_clave(clave_privada)
+        self._validar_clave(clave_publica)
+        secreto_compartido = self.calcular_secreto_compartido(clave_privada, clave_publica)
+        clave_aes = derivar_clave(self._formatear_secreto_compartido(secreto_compartido))
+
+        return bytes.fromhex(clave_aes[2:])
+
     def cifrar_mensaje(self, clave_privada_emisor: Union[bytes, int], 
                        clave_publica_receptor: Union[bytes, Tuple[int, int]], 
                        mensaje: str) -> Tuple[bytes, bytes]:
-        self._validar_clave(clave_privada_emisor)
-        self._validar_clave(clave_publica_receptor)
-        secreto_compartido = self.calcular_secreto_compartido(clave_privada_emisor, clave_publica_receptor)
-        secreto_formateado = self._formatear_secreto_compartido(secreto_compartido)
-        clave_aes = derivar_clave(secreto_formateado)
-        clave_aes_bytes = bytes.fromhex(clave_aes[2:])
+        clave_aes_bytes = self._derivar_clave_aes(clave_privada_emisor, clave_publica_receptor)
         nonce = secrets.token_bytes(8)
-        texto_cifrado = cifrar_ctr(mensaje.encode(), clave_aes_bytes, nonce)
+        texto_cifrado = cifrar_ctr(mensaje.encode(), clave_aes_bytes, nonce, self.motor)
 
         return nonce, texto_cifrado
 
     def descifrar_mensaje(self, clave_privada_receptor: Union[bytes, int], 
                           clave_publica_emisor: Union[bytes, Tuple[int, int]], 
                           nonce: bytes, texto_cifrado: bytes) -> str:
-        self._validar_clave(clave_privada_receptor)
-        self._validar_clave(clave_publica_emisor)
-        secreto_compartido = self.calcular_secreto_compartido(clave_privada_receptor, clave_publica_emisor)
-        secreto_formateado = self._formatear_secreto_compartido(secreto_compartido)
-        clave_aes = derivar_clave(secreto_formateado)
-        clave_aes_bytes = bytes.fromhex(clave_aes[2:])
-        texto_plano = descifrar_ctr(texto_cifrado, clave_aes_bytes, nonce)
-
-        return texto_plano.decode()
\ No newline at end of file
+        clave_aes_bytes = self._derivar_clave_aes(clave_privada_receptor, clave_publica_emisor)
+        texto_plano = descifrar_ctr(texto_cifrado, clave_aes_bytes, nonce, self.motor)
+
+        return texto_plano.decode()
+
+    def cifrar_mensaje_gcm(self, clave_privada_emisor: Union[bytes, int],
+                           clave_publica_receptor: Union[bytes, Tuple[int, int]],
+                           mensaje: str, datos_asociados: bytes = b'') -> Tuple[bytes, bytes, bytes]:
+        # Como cifrar_mensaje, pero con AES-GCM: el mensaje se cifra y autentica en una sola pasada
+        clave_aes_bytes = self._derivar_clave_aes(clave_privada_emisor, clave_publica_receptor)
+        nonce = secrets.token_bytes(12)
+        texto_cifrado, etiqueta = cifrar_gcm(mensaje.encode(), clave_aes_bytes, nonce, datos_asociados, self.motor)
+
+        return nonce, texto_cifrado, etiqueta
+
+    def descifrar_mensaje_gcm(self, clave_privada_receptor: Union[bytes, int],
+                              clave_publica_emisor: Union[bytes, Tuple[int, int]],
+                              nonce: bytes, texto_cifrado: bytes, etiqueta: bytes,
+                              datos_asociados: bytes = b'') -> str:
+        # Lanza ValueError si el mensaje o los datos asociados fueron modificados
+        clave_aes_bytes = self._derivar_clave_aes(clave_privada_receptor, clave_publica_emisor)
+        texto_plano = descifrar_gcm(texto_cifrado, clave_aes_bytes, nonce, etiqueta, datos_asociados, self.motor)
+
+        return texto_plano.decode()
@@ -1,2 +1,5 @@
 from .secp256r1 import generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1
-from .curve25519 import generar_par_claves_25519,  calcular_secreto_compartido_25519
\ No newline at end of file
+from .curve25519 import generar_par_claves_25519,  calcular_secreto_compartido_25519
+from .curve25519 import generar_pares_claves_25519, calcular_secretos_compartidos_25519
+from .servicio_ecdh import ServicioECDH
+from .cache_secp256r1 import CacheClavesPublicas
\ No newline at end of file
@@ -0,0 +1,143 @@
+'''
+Caché LRU de claves públicas secp256r1 para ECDH repetido con los mismos pares
+
+Con un conjunto estable de pares con claves estáticas, cada cálculo de secreto compartido volvía a validar
+la clave pública y a construir la tabla de múltiplos impares del punto. CacheClavesPublicas guarda, por
+cada clave pública ya validada, su tabla de ventana en forma afín; un acierto pasa directamente a la
+multiplicación escalar. Las claves que no superan la validación nunca entran en la caché.
+
+La caché está acotada a la vez por número de entradas y por memoria estimada (sys.getsizeof de la tabla,
+sus puntos y sus enteros) y desaloja la entrada usada hace más tiempo. Un cerrojo protege el diccionario
+y los contadores; la validación y la construcción de la tabla se hacen fuera de él, de modo que dos hilos
+que fallan a la vez con claves distintas no se bloquean entre sí.
+'''
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+from .secp256r1 import (Punto, a, p, tabla_multiplos_impares, multiplicar_con_tabla, _validar_tipos_y_rango,
+                        _validar_clave_publica)
+
+MAXIMO_ENTRADAS: int = 1024
+MAXIMO_BYTES: int = 8 * 1024 * 1024
+# Con la tabla amortizada entre llamadas sale a cuenta una ventana algo más ancha que la de por defecto
+VENTANA_CACHE: int = 6
+
+TablaPunto = Tuple[Punto, ...]
+
+
+class EstadisticasCache(NamedTuple):
+    aciertos: int
+    fallos: int
+    desalojos: int
+    entradas: int
+    memoria: int
+    maximo_entradas: int
+    maximo_bytes: int
+
+
+def tamaño_tabla(clave_publica: Punto, tabla: TablaPunto) -> int:
+    # Memoria aproximada de una entrada: la clave, la tabla, sus puntos y sus coordenadas
+
+    objetos = [clave_publica, *clave_publica, tabla]
+    for punto in tabla:
+        objetos.append(punto)
+        objetos.extend(punto)
+
+    return sum(sys.getsizeof(objeto) for objeto in objetos)
+
+
+class CacheClavesPublicas:
+
+    def __init__(self, maximo_entradas: int = MAXIMO_ENTRADAS, maximo_bytes: int = MAXIMO_BYTES,
+                 ventana: int = VENTANA_CACHE):
+
+        if maximo_entradas < 1:
+            raise ValueError("La caché debe admitir al menos una entrada")
+        if maximo_bytes < 1:
+            raise ValueError("El límite de memoria de la caché debe ser positivo")
+        if ventana < 1:
+            raise ValueError("El ancho de ventana debe ser al menos 1")
+
+        self.maximo_entradas = maximo_entradas
+        self.maximo_bytes = maximo_bytes
+        self.ventana = ventana
+        # clave pública -> (tabla, bytes estimados), de la usada hace más tiempo a la más reciente
+        self._entradas: 'OrderedDict[Punto, Tuple[TablaPunto, int]]' = OrderedDict()
+        self._bytes = 0
+        self._aciertos = 0
+        self._fallos = 0
+        self._desalojos = 0
+        self._cerrojo = threading.Lock()
+
+    def obtener_tabla(self, clave_publica: Punto) -> TablaPunto:
+        # Tabla de múltiplos impares de una clave pública válida; lanza TypeError o ValueError si no lo es
+
+        if not isinstance(clave_publica, tuple) or len(clave_publica) != 2:
+            raise TypeError("La clave pública debe ser una tupla de dos elementos")
+
+        with self._cerrojo:
+            entrada = self._entradas.get(clave_publica)
+            if entrada is not None:
+                self._entradas.move_to_end(clave_publica)
+                self._aciertos += 1
+                return entrada[0]
+            self._fallos += 1
+
+        _validar_clave_publica(clave_publica)
+        tabla = tuple(tabla_multiplos_impares(clave_publica, self.ventana, a, p))
+        tamaño = tamaño_tabla(clave_publica, tabla)
+
+        with self._cerrojo:
+            # Otro hilo puede haberla insertado mientras tanto
+            entrada = self._entradas.get(clave_publica)
+            if entrada is not None:
+                self._entradas.move_to_end(clave_publica)
+                return entrada[0]
+            # Una tabla que no cabe ni sola se usa sin guardarla
+            if tamaño <= self.maximo_bytes:
+                self._entradas[clave_publica] = (tabla, tamaño)
+                self._bytes += tamaño
+                self._desalojar()
+
+        return tabla
+
+    def _desalojar(self) -> None:
+        # Se llama con el cerrojo tomado
+
+        while len(self._entradas) > self.maximo_entradas or self._bytes > self.maximo_bytes:
+            _, (_, tamaño) = self._entradas.popitem(last=False)
+            self._bytes -= tamaño
+            self._desalojos += 1
+
+    def calcular_secreto_compartido(self, clave_privada, clave_publica) -> int:
+        # Mismo resultado y mismos errores que calcular_secreto_compartido_secp256r1
+
+        _validar_tipos_y_rango(clave_privada, clave_publica)
+        tabla = self.obtener_tabla(clave_publica)
+
+        return multiplicar_con_tabla(tabla, clave_privada, a, p)[0]
+
+    def estadisticas(self) -> EstadisticasCache:
+
+        with self._cerrojo:
+            return EstadisticasCache(self._aciertos, self._fallos, self._desalojos, len(self._entradas),
+                                     self._bytes, self.maximo_entradas, self.maximo_bytes)
+
+    def limpiar(self) -> None:
+
+        with self._cerrojo:
+            self._entradas.clear()
+            self._bytes = 0
+            self._aciertos = 0
+            self._fallos = 0
+            self._desalojos = 0
+
+    def __len__(self) -> int:
+        with self._cerrojo:
+            return len(self._entradas)
+
+    def __contains__(self, clave_publica) -> bool:
+        with self._cerrojo:
+            return clave_publica in self._entradas
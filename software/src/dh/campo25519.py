@@ -0,0 +1,169 @@
+'''
+Aritmética del cuerpo primo GF(2^255 - 19) para Curve25519
+
+Los elementos se manejan con reducción perezosa: no se normalizan a [0, P) después de cada operación,
+solo se pliegan lo justo para que no crezcan. Como 2^255 ≡ 19 (mod P), un entero x se reduce con
+(x & MASCARA_255) + 19·(x >> 255) sin ninguna división. Sumas y restas no se reducen; tras un producto
+de dos valores acotados por 2^257 bastan dos pliegues para volver por debajo de 2^256 (uno solo si el
+resultado se va a multiplicar una vez más antes de plegar). La forma canónica se obtiene al final con % P.
+
+También contiene la escalera de Montgomery de X25519 escrita sobre estas reglas y la inversión por
+la cadena de adiciones estándar de z^(P - 2).
+'''
+
+from typing import List, Sequence, Tuple
+
+P: int = 2**255 - 19
+MASCARA_255: int = (1 << 255) - 1
+A24: int = 121665  # (A - 2) / 4 para A = 486662
+
+
+def reducir(x: int) -> int:
+
+    # Dos pliegues: deja |x| < 2^256 para cualquier producto de valores menores que 2^257
+    x = (x & MASCARA_255) + 19 * (x >> 255)
+
+    return (x & MASCARA_255) + 19 * (x >> 255)
+
+
+def normalizar(x: int) -> int:
+
+    # Representante canónico en [0, P)
+    return x % P
+
+
+def multiplicar(a: int, b: int) -> int:
+
+    return reducir(a * b)
+
+
+def cuadrado(a: int) -> int:
+
+    return reducir(a * a)
+
+
+def cuadrados(a: int, n: int) -> int:
+
+    # a^(2^n) con n cuadrados consecutivos
+    for _ in range(n):
+        a *= a
+        a = (a & MASCARA_255) + 19 * (a >> 255)
+        a = (a & MASCARA_255) + 19 * (a >> 255)
+
+    return a
+
+
+def invertir(z: int) -> int:
+
+    # z^(P - 2) con la cadena de adiciones habitual: 254 cuadrados y 11 productos, sin ramas
+    # que dependan de z (el exponente es fijo)
+    z2 = cuadrado(z)
+    z9 = multiplicar(cuadrados(z2, 2), z)
+    z11 = multiplicar(z9, z2)
+    z2_5_0 = multiplicar(cuadrado(z11), z9)
+    z2_10_0 = multiplicar(cuadrados(z2_5_0, 5), z2_5_0)
+    z2_20_0 = multiplicar(cuadrados(z2_10_0, 10), z2_10_0)
+    z2_40_0 = multiplicar(cuadrados(z2_20_0, 20), z2_20_0)
+    z2_50_0 = multiplicar(cuadrados(z2_40_0, 10), z2_10_0)
+    z2_100_0 = multiplicar(cuadrados(z2_50_0, 50), z2_50_0)
+    z2_200_0 = multiplicar(cuadrados(z2_100_0, 100), z2_100_0)
+    z2_250_0 = multiplicar(cuadrados(z2_200_0, 50), z2_50_0)
+
+    return multiplicar(cuadrados(z2_250_0, 5), z11)
+
+
+def invertir_lote(valores: Sequence[int]) -> List[int]:
+
+    # Inversión simultánea de Montgomery: una sola inversión y unos 3N productos para N valores.
+    # Los ceros se sustituyen por 1 al invertir y su inverso se devuelve como 0, igual que z^(P - 2).
+    valores = [normalizar(v) for v in valores]
+    sustitutos = [v | (v == 0) for v in valores]
+    prefijos = []
+    acumulado = 1
+
+    for v in sustitutos:
+        prefijos.append(acumulado)
+        acumulado = multiplicar(acumulado, v)
+
+    inverso = invertir(acumulado)
+    inversos = [0] * len(valores)
+
+    for i in reversed(range(len(valores))):
+        inversos[i] = multiplicar(inverso, prefijos[i]) * (valores[i] != 0)
+        inverso = multiplicar(inverso, sustitutos[i])
+
+    return inversos
+
+
+def intercambio_condicional(intercambiar: int, x2: int, z2: int, x3: int, z3: int) -> Tuple[int, int, int, int]:
+
+    # Intercambia los pares (x2, z2) y (x3, z3) a la vez si intercambiar es 1, con una sola máscara
+    mascara = -intercambiar
+    dx = (x2 ^ x3) & mascara
+    dz = (z2 ^ z3) & mascara
+
+    return x2 ^ dx, z2 ^ dz, x3 ^ dx, z3 ^ dz
+
+
+def escalera_proyectiva(k: int, u: int) -> Tuple[int, int]:
+
+    # Escalera de Montgomery sin la inversión final: devuelve (X, Z) con k·u = X / Z.
+    # Solo se intercambia cuando cambia el bit del escalar, así que basta un intercambio por paso.
+    M = MASCARA_255
+    x1, x2, z2, x3, z3 = u, 1, 0, u, 1
+    anterior = 0
+
+    for i in reversed(range(256)):
+        kt = (k >> i) & 1
+        mascara = -(anterior ^ kt)
+        dx = (x2 ^ x3) & mascara
+        dz = (z2 ^ z3) & mascara
+        x2 ^= dx
+        x3 ^= dx
+        z2 ^= dz
+        z3 ^= dz
+        anterior = kt
+
+        # Las entradas están por debajo de 2^256 y los valores marcados con un solo pliegue se multiplican
+        # otra vez antes de volver a plegar; las salidas se pliegan dos veces para conservar la cota
+        A = x2 + z2
+        B = x2 - z2
+        C = x3 + z3
+        D = x3 - z3
+        AA = A * A
+        AA = (AA & M) + 19 * (AA >> 255)
+        BB = B * B
+        BB = (BB & M) + 19 * (BB >> 255)
+        DA = D * A
+        DA = (DA & M) + 19 * (DA >> 255)
+        CB = C * B
+        CB = (CB & M) + 19 * (CB >> 255)
+        E = AA - BB
+        x3 = DA + CB
+        x3 *= x3
+        x3 = (x3 & M) + 19 * (x3 >> 255)
+        x3 = (x3 & M) + 19 * (x3 >> 255)
+        z3 = DA - CB
+        z3 *= z3
+        z3 = (z3 & M) + 19 * (z3 >> 255)
+        z3 *= x1
+        z3 = (z3 & M) + 19 * (z3 >> 255)
+        z3 = (z3 & M) + 19 * (z3 >> 255)
+        x2 = AA * BB
+        x2 = (x2 & M) + 19 * (x2 >> 255)
+        x2 = (x2 & M) + 19 * (x2 >> 255)
+        z2 = E * (AA + A24 * E)
+        z2 = (z2 & M) + 19 * (z2 >> 255)
+        z2 = (z2 & M) + 19 * (z2 >> 255)
+
+    x2, z2, x3, z3 = intercambio_condicional(anterior, x2, z2, x3, z3)
+
+    return x2, z2
+
+
+def escalera_montgomery(k: int, u: int) -> int:
+
+    # Coordenada u de k·u, en forma canónica
+    x2, z2 = escalera_proyectiva(k, u)
+
+    return normalizar(x2 * invertir(z2))
@@ -0,0 +1,103 @@
+'''
+Aritmética del cuerpo primo de P-256 (secp256r1)
+
+El primo tiene la forma especial p = 2^256 - 2^224 + 2^192 + 2^96 - 1, que admite la reducción rápida de
+NIST (FIPS 186, D.2.3) y una inversión por cadena de adiciones fija. En CPython ninguna de las dos compensa:
+x % p es una sola división en C, varias veces más rápida que la veintena de operaciones sobre enteros
+grandes de la reducción de Solinas, y el algoritmo de Euclides de pow(x, -1, p) es varias veces más
+rápido que la cadena (ver tests/test_campo_p256.py). Por eso las fórmulas de secp256r1 reducen con % p y
+solo usan invertir_cegado; reducir_solinas e invertir_cadena se conservan como implementaciones de
+referencia, comprobadas y medidas por las pruebas, pero no las usa ninguna rutina de puntos.
+'''
+
+import secrets
+
+P: int = 0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff
+
+_MASCARA_32: int = (1 << 32) - 1
+_MASCARA_96: int = (1 << 96) - 1
+_MASCARA_256: int = (1 << 256) - 1
+
+
+def reducir_solinas(x: int) -> int:
+
+    # Reducción de NIST para 0 <= x < 2^512; el nombre de cada término indica las palabras de c que
+    # ocupan sus posiciones 7..0
+    c8 = (x >> 256) & _MASCARA_32
+    c9 = (x >> 288) & _MASCARA_32
+    c10 = (x >> 320) & _MASCARA_32
+    c11 = (x >> 352) & _MASCARA_32
+    c12 = (x >> 384) & _MASCARA_32
+    c13 = (x >> 416) & _MASCARA_32
+    c8_10 = (x >> 256) & _MASCARA_96
+    c9_11 = (x >> 288) & _MASCARA_96
+    c11_13 = (x >> 352) & _MASCARA_96
+    c12_15 = x >> 384
+    c13_15 = x >> 416
+    c14_15 = x >> 448
+
+    s1 = x & _MASCARA_256                                                   # c7 c6 c5 c4 c3 c2 c1 c0
+    s2 = (x >> 352) << 96                                                   # c15 c14 c13 c12 c11 0 0 0
+    s3 = c12_15 << 96                                                       # 0 c15 c14 c13 c12 0 0 0
+    s4 = (c14_15 << 192) | c8_10                                            # c15 c14 0 0 0 c10 c9 c8
+    s5 = (c8 << 224) | (c13 << 192) | (c13_15 << 96) | c9_11                # c8 c13 c15 c14 c13 c11 c10 c9
+    s6 = (c10 << 224) | (c8 << 192) | c11_13                                # c10 c8 0 0 0 c13 c12 c11
+    s7 = (c11 << 224) | (c9 << 192) | c12_15                                # c11 c9 0 0 c15 c14 c13 c12
+    s8 = (c12 << 224) | (c8_10 << 96) | c13_15                              # c12 0 c10 c9 c8 c15 c14 c13
+    s9 = (c13 << 224) | (c9_11 << 96) | c14_15                              # c13 0 c11 c10 c9 0 c15 c14
+
+    r = s1 + ((s2 + s3) << 1) + s4 + s5 - s6 - s7 - s8 - s9
+
+    # r queda en (-4p, 5p): unas pocas sumas o restas de p lo llevan a [0, p)
+    while r < 0:
+        r += P
+    while r >= P:
+        r -= P
+
+    return r
+
+
+def multiplicar(a: int, b: int) -> int:
+
+    return a * b % P
+
+
+def cuadrado(a: int) -> int:
+
+    return a * a % P
+
+
+def cuadrados(a: int, n: int) -> int:
+
+    # a^(2^n)
+    for _ in range(n):
+        a = a * a % P
+
+    return a
+
+
+def invertir_cadena(a: int) -> int:
+
+    # a^(p - 2) con una cadena de adiciones fija; x_k = a^(2^k - 1)
+    x2 = multiplicar(cuadrado(a), a)
+    x3 = multiplicar(cuadrado(x2), a)
+    x6 = multiplicar(cuadrados(x3, 3), x3)
+    x12 = multiplicar(cuadrados(x6, 6), x6)
+    x15 = multiplicar(cuadrados(x12, 3), x3)
+    x30 = multiplicar(cuadrados(x15, 15), x15)
+    x32 = multiplicar(cuadrados(x30, 2), x2)
+    t = multiplicar(cuadrados(x32, 32), a)
+    t = multiplicar(cuadrados(t, 128), x32)
+    t = multiplicar(cuadrados(t, 32), x32)
+    t = multiplicar(cuadrados(t, 30), x30)
+
+    return multiplicar(cuadrados(t, 2), a)
+
+
+def invertir_cegado(a: int) -> int:
+
+    # Inverso de a != 0 con el algoritmo de Euclides sobre a·r, con r aleatorio, para que su duración no
+    # dependa de a
+    r = secrets.randbelow(P - 1) + 1
+
+    return r * pow(a * r % P, -1, P) % P
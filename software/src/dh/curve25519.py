@@ -4,16 +4,35 @@ Implementación del Intercambio de Claves Diffie-Hellman con Curva Elíptica (EC
 
 Este módulo proporciona una implementación en Python puro de la curva elíptica Curve25519,
 utilizada para el intercambio de claves Diffie-Hellman. Incluye funciones para la generación
-de claves, el cálculo del secreto compartido y la función central X25519.
+de claves, el cálculo del secreto compartido y la función central X25519. La aritmética del cuerpo
+y la escalera de Montgomery están en campo25519.
+
+La multiplicación del punto base fijo (generación de claves) no usa la escalera: se hace en la curva
+de Edwards birracionalmente equivalente (edwards25519) con una tabla precalculada de múltiplos del
+punto base, y el resultado se convierte de vuelta a la coordenada u de Montgomery.
 
 '''
 
 
 
 import secrets
-from typing import Tuple, ByteString
+from functools import lru_cache
+from typing import Tuple, ByteString, List, Sequence
+from .campo25519 import P, escalera_montgomery, escalera_proyectiva, invertir_lote, normalizar
+
+# Curva de Edwards equivalente: -x^2 + y^2 = 1 + d·x^2·y^2, con u = (1 + y) / (1 - y)
+D_EDWARDS: int = -121665 * pow(121666, -1, P) % P
+BASE_Y_EDWARDS: int = 4 * pow(5, -1, P) % P  # Imagen del punto base u = 9
 
-P: int = 2**255 - 19 # Orden del campo primo para Curve25519
+# Multiplicación de base fija en base 16 con cifras con signo en [-8, 8]: 64 cifras cubren los escalares
+# ajustados (< 2^255) y cada fila de la tabla solo guarda los múltiplos 0..8
+BITS_VENTANA_BASE: int = 4
+VENTANAS_BASE: int = 64
+
+# Punto de Edwards en coordenadas extendidas (X, Y, Z, T) con x = X/Z, y = Y/Z, x·y = T/Z
+PuntoEdwards = Tuple[int, int, int, int]
+# Punto afín precalculado para la suma mixta: (y + x, y - x, 2·d·x·y)
+PuntoPrecalculado = Tuple[int, int, int]
 
 
 def ajustar(n: int) -> int:
@@ -26,45 +45,133 @@ def ajustar(n: int) -> int:
     return n
 
 
-def escalera_montgomery(k: int, u: int) -> int:
-    
-    # Realiza el algoritmo de la escalera de Montgomery para la multiplicación escalar
-    x1, x2, z2, x3, z3 = u, 1, 0, u, 1
-
-    for i in reversed(range(256)):
-        kt = (k >> i) & 1
-        x2, x3 = intercambio_condicional(kt, x2, x3)
-        z2, z3 = intercambio_condicional(kt, z2, z3)
-        A = (x2 + z2) % P
-        AA = (A * A) % P
-        B = (x2 - z2) % P
-        BB = (B * B) % P
-        E = (AA - BB) % P
-        C = (x3 + z3) % P
-        D = (x3 - z3) % P
-        DA = (D * A) % P
-        CB = (C * B) % P
-        x3 = (DA + CB) % P
-        x3 = (x3 * x3) % P
-        z3 = (DA - CB) % P
-        z3 = (z3 * z3) % P
-        z3 = (z3 * x1) % P
-        x2 = (AA * BB) % P
-        z2 = (E * (AA + 121665 * E % P)) % P
-        x2, x3 = intercambio_condicional(kt, x2, x3)
-        z2, z3 = intercambio_condicional(kt, z2, z3)
-
-    return (x2 * pow(z2, P - 2, P)) % P
-
-
-def intercambio_condicional(intercambiar: int, x2: int, x3: int) -> Tuple[int, int]:
-    
-    # Protege contra ataques de temporización
-    dummy = intercambiar * (x2 ^ x3)
-    x2 ^= dummy
-    x3 ^= dummy
+def _recuperar_x_edwards(y: int) -> int:
+
+    # Raíz cuadrada de x^2 = (y^2 - 1) / (d·y^2 + 1); como P ≡ 5 (mod 8) basta una exponenciación y,
+    # si hace falta, multiplicar por sqrt(-1). Se elige la raíz par, como en la codificación estándar.
+    x2 = (y * y - 1) * pow(D_EDWARDS * y * y + 1, -1, P) % P
+    x = pow(x2, (P + 3) // 8, P)
+    if (x * x - x2) % P:
+        x = x * pow(2, (P - 1) // 4, P) % P
+    if x & 1:
+        x = P - x
+
+    return x
+
+
+def _sumar_precalculado(punto: PuntoEdwards, q: PuntoPrecalculado) -> PuntoEdwards:
+
+    # Suma unificada en coordenadas extendidas con un punto afín precalculado (a = -1, Z2 = 1).
+    # Es completa en edwards25519, así que el neutro (1, 1, 0) se suma como cualquier otro punto.
+    X1, Y1, Z1, T1 = punto
+    ypx, ymx, t2d = q
+    A = (Y1 - X1) * ymx % P
+    B = (Y1 + X1) * ypx % P
+    C = T1 * t2d % P
+    D = 2 * Z1
+    E = B - A
+    F = D - C
+    G = D + C
+    H = B + A
+
+    return E * F % P, G * H % P, F * G % P, E * H % P
+
+
+def _precalcular(punto: PuntoEdwards) -> PuntoPrecalculado:
+
+    X, Y, Z, _ = punto
+    z_inv = pow(Z, -1, P)
+    x = X * z_inv % P
+    y = Y * z_inv % P
+
+    return (y + x) % P, (y - x) % P, 2 * D_EDWARDS * x * y % P
+
+
+@lru_cache(maxsize=None)
+def tabla_base_edwards() -> Tuple[Tuple[PuntoPrecalculado, ...], ...]:
+
+    # Tabla T[i][j] = j·16^i·B para i < 64 y 0 <= j <= 8, con T[i][0] el neutro. Se construye la primera vez
+    # que se genera una clave y después la multiplicación por B solo necesita 64 sumas, sin duplicaciones.
+    neutro = (1, 1, 0)
+    y = BASE_Y_EDWARDS
+    x = _recuperar_x_edwards(y)
+    base = (x, y, 1, x * y % P)
+    mitad = 1 << (BITS_VENTANA_BASE - 1)
+    tabla = []
+
+    for _ in range(VENTANAS_BASE):
+        base_precalculada = _precalcular(base)
+        fila: List[PuntoPrecalculado] = [neutro, base_precalculada]
+        multiplo = base
+        for _ in range(2, mitad + 1):
+            multiplo = _sumar_precalculado(multiplo, base_precalculada)
+            fila.append(_precalcular(multiplo))
+        tabla.append(tuple(fila))
+        base = _sumar_precalculado(multiplo, _precalcular(multiplo))  # 16·base = 2·(8·base)
+
+    return tuple(tabla)
+
+
+def recodificar_escalar(k: int) -> List[int]:
+
+    # Cifras con signo d_i en [-8, 8] tales que k = sum(d_i·16^i), de menor a mayor peso, para 0 <= k < 2^255
+    mascara_digito = (1 << BITS_VENTANA_BASE) - 1
+    mitad = 1 << (BITS_VENTANA_BASE - 1)
+    digitos = []
+    acarreo = 0
+
+    for i in range(VENTANAS_BASE - 1):
+        digito = ((k >> (BITS_VENTANA_BASE * i)) & mascara_digito) + acarreo
+        acarreo = (digito + mitad) >> BITS_VENTANA_BASE
+        digitos.append(digito - (acarreo << BITS_VENTANA_BASE))
+
+    # La última cifra absorbe el acarreo: con k < 2^255 queda como mucho en 7 + 1 = 8
+    digitos.append((k >> (BITS_VENTANA_BASE * (VENTANAS_BASE - 1))) + acarreo)
+
+    return digitos
+
+
+def _seleccionar(fila: Tuple[PuntoPrecalculado, ...], digito: int) -> PuntoPrecalculado:
+
+    # Recorre la fila completa y se queda con la entrada de |digito| mediante máscaras, sin indexar la
+    # tabla con el secreto. Negar un punto precalculado es intercambiar y + x con y - x y cambiar el signo de 2·d·x·y.
+    negativo = -(digito < 0)
+    absoluto = (digito ^ negativo) - negativo
+    ypx = ymx = t2d = 0
+    for j, (a, b, c) in enumerate(fila):
+        mascara = -(j == absoluto)
+        ypx |= a & mascara
+        ymx |= b & mascara
+        t2d |= c & mascara
+
+    cambio = (ypx ^ ymx) & negativo
+
+    return ypx ^ cambio, ymx ^ cambio, (t2d ^ negativo) - negativo
 
-    return x2, x3
+
+def multiplicar_base_proyectiva(k: int) -> Tuple[int, int]:
+
+    # Calcula k·B (B el punto base u = 9) sumando una entrada de la tabla por cada cifra de k y
+    # devuelve la coordenada u de Montgomery como fracción (Z + Y, Z - Y)
+    tabla = tabla_base_edwards()
+    punto = (0, 1, 1, 0)
+
+    for fila, digito in zip(tabla, recodificar_escalar(k)):
+        punto = _sumar_precalculado(punto, _seleccionar(fila, digito))
+
+    _, Y, Z, _ = punto
+
+    return Z + Y, Z - Y
+
+
+def multiplicar_base(k: int) -> int:
+
+    # Coordenada u de k·B. La inversión se hace con el algoritmo de Euclides sobre (Z - Y)·r, con r
+    # aleatorio, para que su duración no revele el punto; es mucho más barata que la exponenciación a P - 2
+    numerador, denominador = multiplicar_base_proyectiva(k)
+    r = secrets.randbelow(P - 1) + 1
+
+    return numerador * r * pow(denominador * r % P, -1, P) % P
 
 
 def x25519(k: ByteString, u: ByteString) -> bytes:
@@ -77,23 +184,65 @@ def x25519(k: ByteString, u: ByteString) -> bytes:
     return escalera_montgomery(k_int, u_int).to_bytes(32, 'little')
 
 
+def x25519_base(k: ByteString) -> bytes:
+
+    # Equivale a x25519(k, 9) usando la tabla de base fija
+    k_int = ajustar(int.from_bytes(k, 'little'))
+
+    return multiplicar_base(k_int).to_bytes(32, 'little')
+
+
 def generar_par_claves_25519() -> Tuple[bytes, bytes]:
 
     clave_privada = secrets.token_bytes(32)
-    clave_publica = x25519(clave_privada, (9).to_bytes(32, 'little'))
+    clave_publica = x25519_base(clave_privada)
 
     return clave_privada, clave_publica
 
 
-def calcular_secreto_compartido_25519(clave_privada: ByteString, clave_publica: ByteString) -> bytes:
+def _validar_claves(clave_privada: ByteString, clave_publica: ByteString) -> None:
 
-    # Calcula el secreto compartido usando una clave privada y la clave pública del par
     if len(clave_privada) != 32 or len(clave_publica) != 32:
         raise ValueError("Tanto la clave privada como la pública deben tener 32 bytes de longitud")
     if clave_publica == b'\x00' * 32:
         raise ValueError("La clave pública con todos los bits en cero es inválida")
+
+
+def calcular_secreto_compartido_25519(clave_privada: ByteString, clave_publica: ByteString) -> bytes:
+
+    # Calcula el secreto compartido usando una clave privada y la clave pública del par
+    _validar_claves(clave_privada, clave_publica)
     
     # Aplicamos el ajuste a la clave privada antes de usarla
     clave_privada_ajustada = ajustar(int.from_bytes(clave_privada, 'little')).to_bytes(32, 'little')
     
-    return x25519(clave_privada_ajustada, clave_publica)
\ No newline at end of file
+    return x25519(clave_privada_ajustada, clave_publica)
+
+
+def calcular_secretos_compartidos_25519(pares: Sequence[Tuple[ByteString, ByteString]]) -> List[bytes]:
+
+    # Secretos compartidos de varios pares (clave privada, clave pública) a la vez. Cada escalera se
+    # detiene en (X : Z) y todas las Z se invierten juntas con una sola inversión. El resultado es el
+    # mismo que llamar a calcular_secreto_compartido_25519 con cada par.
+    proyectivos = []
+    for clave_privada, clave_publica in pares:
+        _validar_claves(clave_privada, clave_publica)
+        proyectivos.append(escalera_proyectiva(ajustar(int.from_bytes(clave_privada, 'little')),
+                                               int.from_bytes(clave_publica, 'little')))
+
+    inversos = invertir_lote([z for _, z in proyectivos])
+
+    return [normalizar(x * z_inv).to_bytes(32, 'little') for (x, _), z_inv in zip(proyectivos, inversos)]
+
+
+def generar_pares_claves_25519(cantidad: int) -> List[Tuple[bytes, bytes]]:
+
+    # Genera varios pares de claves con la tabla de base fija y una sola inversión para todos
+    claves_privadas = [secrets.token_bytes(32) for _ in range(cantidad)]
+    proyectivos = [multiplicar_base_proyectiva(ajustar(int.from_bytes(clave, 'little'))) for clave in claves_privadas]
+    inversos = invertir_lote([denominador for _, denominador in proyectivos])
+
+    return [
+        (clave_privada, normalizar(numerador * inverso).to_bytes(32, 'little'))
+        for clave_privada, (numerador, _), inverso in zip(claves_privadas, proyectivos, inversos)
+    ]
@@ -6,10 +6,18 @@ Este módulo proporciona una implementación en Python puro de la curva elíptic
 utilizada para el intercambio de claves Diffie-Hellman con Curva Elíptica (ECDH) y firmas
 digitales. Incluye funciones para la suma de puntos, multiplicación escalar, generación
 de pares de claves y cálculo de secreto compartido.
+
+La multiplicación escalar trabaja en coordenadas jacobianas (x = X/Z^2, y = Y/Z^3): las sumas y
+duplicaciones no necesitan inversiones y solo se invierte una vez al final para volver a la forma afín.
+El escalar se recodifica en cifras impares con signo de ventana fija (Joye-Tunstall), así que todos los
+escalares ejecutan la misma secuencia de duplicaciones y sumas. Para el generador G, que es fijo, se usa
+además una tabla precalculada de múltiplos en base 16 y la multiplicación solo necesita sumas.
 '''
 
 import secrets
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import Tuple, Optional, List, Sequence
+from . import campo_p256
 
 # Parámetros de la curva
 p: int = 0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff
@@ -24,6 +32,15 @@ h: int = 0x1
 Punto = Tuple[int, int]
 INFINITO: Punto = (0, 0)
 
+# Punto en coordenadas jacobianas (X, Y, Z); Z = 0 representa el punto en el infinito
+PuntoJacobiano = Tuple[int, int, int]
+INFINITO_JACOBIANO: PuntoJacobiano = (1, 1, 0)
+
+# Ancho de ventana por defecto de la multiplicación escalar: tabla de 2^(w-1) múltiplos impares
+VENTANA_POR_DEFECTO: int = 5
+# Base fija: una fila de múltiplos impares de 16^i·G por cada cifra de 4 bits del escalar
+VENTANA_BASE_FIJA: int = 4
+
 def sumar_puntos(P: Punto, Q: Punto, a: int, p: int) -> Punto:
     
     # Suma dos puntos en la curva elíptica
@@ -50,19 +67,302 @@ def sumar_puntos(P: Punto, Q: Punto, a: int, p: int) -> Punto:
     return (x_r, y_r)
 
 
-def multiplicar_punto_por_escalar(punto: Punto, escalar: int, a: int, p: int) -> Punto:
-    
-    # Usando el algoritmo de doble y suma."""
-    resultado = INFINITO
-    actual = punto
-    
-    while escalar:
-        if escalar & 1:
-            resultado = sumar_puntos(resultado, actual, a, p)
-        actual = sumar_puntos(actual, actual, a, p)
-        escalar >>= 1
+def _invertir(z: int, p: int) -> int:
+
+    # Las fórmulas reducen con % p, que en CPython es más rápido que la reducción de Solinas (ver
+    # campo_p256); la inversión cegada del módulo del cuerpo se usa cuando p es el primo de P-256
+    if p == campo_p256.P:
+        return campo_p256.invertir_cegado(z)
+
+    return pow(z, -1, p)
+
+
+def a_jacobiano(punto: Punto) -> PuntoJacobiano:
+
+    if punto == INFINITO:
+        return INFINITO_JACOBIANO
+
+    return punto[0], punto[1], 1
+
+
+def a_afin(punto: PuntoJacobiano, p: int) -> Punto:
+
+    # Única inversión de la multiplicación escalar
+    X, Y, Z = punto
+    if Z % p == 0:
+        return INFINITO
+    z_inv = _invertir(Z, p)
+    z_inv2 = z_inv * z_inv % p
+
+    return X * z_inv2 % p, Y * z_inv2 * z_inv % p
+
+
+def duplicar_jacobiano(punto: PuntoJacobiano, a: int, p: int) -> PuntoJacobiano:
+
+    # dbl-2001-b: con a = -3 se usa 3·X^2 + a·Z^4 = 3·(X - Z^2)·(X + Z^2)
+    X1, Y1, Z1 = punto
+    if Z1 == 0 or Y1 == 0:
+        return INFINITO_JACOBIANO
+
+    delta = Z1 * Z1 % p
+    gamma = Y1 * Y1 % p
+    beta = X1 * gamma % p
+    if a == p - 3:
+        alfa = 3 * (X1 - delta) * (X1 + delta) % p
+    else:
+        alfa = (3 * X1 * X1 + a * delta * delta) % p
+    X3 = (alfa * alfa - 8 * beta) % p
+    Z3 = ((Y1 + Z1) ** 2 - gamma - delta) % p
+    Y3 = (alfa * (4 * beta - X3) - 8 * gamma * gamma) % p
+
+    return X3, Y3, Z3
+
+
+def sumar_jacobiano(P: PuntoJacobiano, Q: PuntoJacobiano, a: int, p: int) -> PuntoJacobiano:
+
+    # add-2007-bl entre dos puntos jacobianos
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    r = 2 * (S2 - S1) % p
+    if H == 0:
+        return duplicar_jacobiano(P, a, p) if r == 0 else INFINITO_JACOBIANO
+
+    I = 4 * H * H % p
+    J = H * I % p
+    V = U1 * I % p
+    X3 = (r * r - J - 2 * V) % p
+    Y3 = (r * (V - X3) - 2 * S1 * J) % p
+    Z3 = ((Z1 + Z2) ** 2 - Z1Z1 - Z2Z2) * H % p
+
+    return X3, Y3, Z3
+
+
+def sumar_mixto(P: PuntoJacobiano, Q: Punto, a: int, p: int) -> PuntoJacobiano:
+
+    # madd-2007-bl: suma de un punto jacobiano y uno afín (Z2 = 1), que ahorra productos
+    X1, Y1, Z1 = P
+    if Q == INFINITO:
+        return P
+    X2, Y2 = Q
+    if Z1 == 0:
+        return X2, Y2, 1
+
+    Z1Z1 = Z1 * Z1 % p
+    U2 = X2 * Z1Z1 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    r = 2 * (S2 - Y1) % p
+    if H == 0:
+        return duplicar_jacobiano(P, a, p) if r == 0 else INFINITO_JACOBIANO
+
+    HH = H * H % p
+    I = 4 * HH
+    J = H * I % p
+    V = X1 * I % p
+    X3 = (r * r - J - 2 * V) % p
+    Y3 = (r * (V - X3) - 2 * Y1 * J) % p
+    Z3 = ((Z1 + H) ** 2 - Z1Z1 - HH) % p
+
+    return X3, Y3, Z3
+
+
+def a_afin_lote(puntos: Sequence[PuntoJacobiano], p: int) -> List[Punto]:
+
+    # Pasa varios puntos a afín con una sola inversión (truco de Montgomery)
+    prefijos = []
+    acumulado = 1
+    for _, _, Z in puntos:
+        prefijos.append(acumulado)
+        acumulado = acumulado * (Z or 1) % p
+
+    inverso = _invertir(acumulado, p)
+    afines: List[Punto] = [INFINITO] * len(puntos)
+
+    for i in reversed(range(len(puntos))):
+        X, Y, Z = puntos[i]
+        if Z:
+            z_inv = inverso * prefijos[i] % p
+            z_inv2 = z_inv * z_inv % p
+            afines[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+            inverso = inverso * Z % p
+
+    return afines
+
+
+def tabla_multiplos_impares(punto: Punto, ventana: int, a: int, p: int) -> List[Punto]:
+
+    # [P, 3P, 5P, ..., (2^w - 1)P] en forma afín, para sumarlos con la suma mixta
+    actual = a_jacobiano(punto)
+    doble = duplicar_jacobiano(actual, a, p)
+    multiplos = [actual]
+    for _ in range((1 << (ventana - 1)) - 1):
+        actual = sumar_jacobiano(actual, doble, a, p)
+        multiplos.append(actual)
+
+    return a_afin_lote(multiplos, p)
+
+
+def recodificar_regular(k: int, ventana: int, bits: int = n.bit_length()) -> List[int]:
+
+    # Cifras impares d_i en {±1, ±3, ..., ±(2^w - 1)}, de menor a mayor peso, con k = sum(d_i·2^(w·i)).
+    # k debe ser impar y menor que 2^bits; el número de cifras es siempre el mismo.
+    num_cifras = -(-bits // ventana)
+    mascara = (1 << (ventana + 1)) - 1
+    mitad = 1 << ventana
+    digitos = []
+
+    for _ in range(num_cifras - 1):
+        digito = (k & mascara) - mitad
+        digitos.append(digito)
+        k = (k - digito) >> ventana
+    digitos.append(k)
+
+    return digitos
+
+
+def _seleccionar_multiplo(tabla: Sequence[Punto], digito: int, p: int) -> Punto:
+
+    # Entrada |digito|·P de la tabla, negada si el dígito es negativo, recorriendo toda la tabla con
+    # máscaras en lugar de indexarla con el secreto
+    negativo = -(digito < 0)
+    indice = ((digito ^ negativo) - negativo) >> 1
+    x = y = 0
+    for j, (tx, ty) in enumerate(tabla):
+        mascara = -(j == indice)
+        x |= tx & mascara
+        y |= ty & mascara
+
+    return x, y ^ ((y ^ (p - y)) & negativo)
+
+
+def _escalar_impar(escalar: int, orden: int = n) -> Tuple[int, int]:
+
+    # El escalar se reduce módulo el orden (impar) del punto; si es par se usa orden - k, que es impar,
+    # y se devuelve la máscara para negar el resultado
+    k = escalar % orden
+    par = -((k & 1) ^ 1)
+
+    return k ^ ((k ^ (orden - k)) & par), par
+
+
+def _negar_si(punto: PuntoJacobiano, mascara: int, p: int) -> Punto:
+
+    # Forma afín del punto, negada si la máscara está activa
+    x, y = a_afin(punto, p)
+    if (x, y) == INFINITO:
+        return INFINITO
+
+    return x, y ^ ((y ^ (p - y)) & mascara)
+
+
+def _orden_p256(a: int, p: int, orden: Optional[int]) -> Optional[int]:
+
+    # Sin orden explícito solo se conoce el de P-256; para otras curvas se devuelve None
+    if orden is None and p == campo_p256.P and a == campo_p256.P - 3:
+        return n
+
+    return orden
+
+
+def _doble_y_suma(punto: Punto, escalar: int, a: int, p: int) -> Punto:
+
+    # Doble y suma en coordenadas jacobianas, de mayor a menor bit, para curvas cuyo orden no se conoce:
+    # el escalar no se reduce y su duración depende de él
+    if escalar < 0:
+        x, y = _doble_y_suma(punto, -escalar, a, p)
+        return INFINITO if (x, y) == INFINITO else (x, (p - y) % p)
+
+    resultado = INFINITO_JACOBIANO
+    for i in reversed(range(escalar.bit_length())):
+        resultado = duplicar_jacobiano(resultado, a, p)
+        if (escalar >> i) & 1:
+            resultado = sumar_mixto(resultado, punto, a, p)
+
+    return a_afin(resultado, p)
+
+
+def multiplicar_con_tabla(tabla: Sequence[Punto], escalar: int, a: int, p: int, orden: Optional[int] = None) -> Punto:
+
+    # Ventana fija con cifras impares con signo en coordenadas jacobianas a partir de la tabla de múltiplos
+    # impares del punto: w duplicaciones y una suma mixta por cifra, siempre en el mismo orden, y una sola
+    # inversión al final. El ancho de ventana se deduce del tamaño de la tabla (2^(w-1) entradas).
+    # orden es el orden del punto, que debe ser impar; solo puede omitirse en P-256.
+    orden = _orden_p256(a, p, orden)
+    if orden is None:
+        raise ValueError("Para curvas distintas de P-256 hay que indicar el orden del punto")
+    ventana = len(tabla).bit_length()
+    k, par = _escalar_impar(escalar, orden)
+    digitos = recodificar_regular(k, ventana, orden.bit_length())
+    resultado = a_jacobiano(_seleccionar_multiplo(tabla, digitos[-1], p))
+
+    for digito in reversed(digitos[:-1]):
+        for _ in range(ventana):
+            resultado = duplicar_jacobiano(resultado, a, p)
+        resultado = sumar_mixto(resultado, _seleccionar_multiplo(tabla, digito, p), a, p)
+
+    return _negar_si(resultado, par, p)
+
+
+def multiplicar_punto_por_escalar(punto: Punto, escalar: int, a: int, p: int, ventana: int = VENTANA_POR_DEFECTO,
+                                  orden: Optional[int] = None) -> Punto:
     
-    return resultado
+    # La ventana fija reduce el escalar módulo el orden del punto, que se da por conocido en P-256; en otras
+    # curvas sin orden se usa el doble y suma
+    if ventana < 1:
+        raise ValueError("El ancho de ventana debe ser al menos 1")
+    if punto == INFINITO:
+        return INFINITO
+    orden = _orden_p256(a, p, orden)
+    if orden is None:
+        return _doble_y_suma(punto, escalar, a, p)
+
+    return multiplicar_con_tabla(tabla_multiplos_impares(punto, ventana, a, p), escalar, a, p, orden)
+
+
+@lru_cache(maxsize=None)
+def tabla_base_fija() -> Tuple[Tuple[Punto, ...], ...]:
+
+    # Fila i: múltiplos impares 1, 3, ..., 15 de 16^i·G en forma afín. Se construye la primera vez que
+    # se genera una clave y después cada multiplicación por G es una suma por cifra, sin duplicaciones.
+    num_filas = -(-n.bit_length() // VENTANA_BASE_FIJA)
+    base = G
+    tabla = []
+
+    for _ in range(num_filas):
+        tabla.append(tuple(tabla_multiplos_impares(base, VENTANA_BASE_FIJA, a, p)))
+        siguiente = a_jacobiano(base)
+        for _ in range(VENTANA_BASE_FIJA):
+            siguiente = duplicar_jacobiano(siguiente, a, p)
+        base = a_afin(siguiente, p)
+
+    return tuple(tabla)
+
+
+def multiplicar_base(escalar: int) -> Punto:
+
+    # escalar·G con la tabla de base fija: la cifra i se toma de la fila i, así que no hay duplicaciones.
+    # Da el mismo resultado que multiplicar_punto_por_escalar(G, escalar, a, p).
+    k, par = _escalar_impar(escalar)
+    tabla = tabla_base_fija()
+    digitos = recodificar_regular(k, VENTANA_BASE_FIJA)
+    resultado = a_jacobiano(_seleccionar_multiplo(tabla[0], digitos[0], p))
+
+    for fila, digito in zip(tabla[1:], digitos[1:]):
+        resultado = sumar_mixto(resultado, _seleccionar_multiplo(fila, digito, p), a, p)
+
+    return _negar_si(resultado, par, p)
 
 
 def esta_punto_en_curva(punto: Punto, a: int, b: int, p: int) -> bool:
@@ -77,24 +377,37 @@ def esta_punto_en_curva(punto: Punto, a: int, b: int, p: int) -> bool:
 def generar_par_claves_secp256r1() -> Tuple[int, Punto]:
 
     clave_privada = secrets.randbelow(n - 1) + 1
-    clave_publica = multiplicar_punto_por_escalar(G, clave_privada, a, p)
+    clave_publica = multiplicar_base(clave_privada)
 
     return clave_privada, clave_publica
 
 
-def calcular_secreto_compartido_secp256r1(clave_privada, clave_publica):
+def _validar_tipos_y_rango(clave_privada, clave_publica) -> None:
 
+    # Mismo orden que las comprobaciones originales: tipo de la privada, tipo de la pública y rango de la privada
     if not isinstance(clave_privada, int):
         raise TypeError("La clave privada debe ser un entero")
     if not isinstance(clave_publica, tuple) or len(clave_publica) != 2:
         raise TypeError("La clave pública debe ser una tupla de dos elementos")
     if clave_privada <= 0 or clave_privada >= n:
         raise ValueError("La clave privada está fuera del rango válido")
+
+
+def _validar_clave_publica(clave_publica) -> None:
+
+    if not isinstance(clave_publica, tuple) or len(clave_publica) != 2:
+        raise TypeError("La clave pública debe ser una tupla de dos elementos")
     if clave_publica == (0, 0):
         raise ValueError("La clave pública no puede ser el punto en el infinito")
     if not esta_punto_en_curva(clave_publica, a, b, p):
         raise ValueError("La clave pública no está en la curva")
-    punto_compartido = multiplicar_punto_por_escalar(clave_publica, clave_privada, a, p)
+
+
+def calcular_secreto_compartido_secp256r1(clave_privada, clave_publica, ventana: int = VENTANA_POR_DEFECTO):
+
+    _validar_tipos_y_rango(clave_privada, clave_publica)
+    _validar_clave_publica(clave_publica)
+    punto_compartido = multiplicar_punto_por_escalar(clave_publica, clave_privada, a, p, ventana)
 
     return punto_compartido[0]  # Retornamos solo la coordenada x como secreto compartido
 
@@ -0,0 +1,137 @@
+'''
+Servicio ECDH sobre un grupo de procesos persistente
+
+El intercambio de claves es cálculo puro en Python, así que un solo proceso no pasa de unos cientos de
+operaciones por segundo. Este módulo mantiene un ProcessPoolExecutor abierto durante toda la vida del
+servicio; cada trabajador importa el módulo de la curva al arrancar y construye su tabla de base fija,
+de modo que las peticiones ya no pagan ni el arranque del proceso ni las importaciones.
+
+Hay dos formas de uso: futuros para operaciones sueltas (enviar_par_claves, enviar_secreto) y llamadas
+síncronas tipo map para lotes (generar_pares_claves, calcular_secretos_compartidos). Los lotes se parten
+en trozos de tamaño parecido, varios por trabajador, para repartir bien la carga sin multiplicar el
+número de mensajes entre procesos.
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+CURVAS: Tuple[str, ...] = ('25519', 'secp256r1')
+# Trozos por trabajador en las llamadas por lotes: más trozos equilibran mejor, menos ahorran mensajes
+TROZOS_POR_TRABAJADOR: int = 4
+
+# Operaciones de la curva en el proceso trabajador, fijadas por _inicializar_trabajador
+_operaciones: Dict[str, Callable] = {}
+
+
+def _cargar_operaciones(curva: str) -> Dict[str, Callable]:
+
+    if curva == '25519':
+        from .curve25519 import (generar_par_claves_25519, calcular_secreto_compartido_25519,
+                                 generar_pares_claves_25519, calcular_secretos_compartidos_25519, tabla_base_edwards)
+        tabla_base_edwards()
+        return {
+            'par': generar_par_claves_25519,
+            'secreto': calcular_secreto_compartido_25519,
+            'pares': generar_pares_claves_25519,
+            'secretos': calcular_secretos_compartidos_25519,
+        }
+
+    from .secp256r1 import generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1, tabla_base_fija
+    tabla_base_fija()
+    return {
+        'par': generar_par_claves_secp256r1,
+        'secreto': calcular_secreto_compartido_secp256r1,
+        'pares': lambda cantidad: [generar_par_claves_secp256r1() for _ in range(cantidad)],
+        'secretos': lambda pares: [calcular_secreto_compartido_secp256r1(privada, publica) for privada, publica in pares],
+    }
+
+
+def _inicializar_trabajador(curva: str) -> None:
+    # Se ejecuta una vez en cada proceso trabajador al arrancar
+
+    _operaciones.update(_cargar_operaciones(curva))
+
+
+def _ejecutar(operacion: str, *argumentos) -> Any:
+
+    return _operaciones[operacion](*argumentos)
+
+
+def dividir_trozos(cantidad: int, trabajadores: int, trozos_por_trabajador: int = TROZOS_POR_TRABAJADOR) -> List[Tuple[int, int]]:
+    # Rangos contiguos [inicio, fin) que cubren cantidad elementos, con tamaños que difieren como mucho en uno
+
+    partes = min(cantidad, trabajadores * trozos_por_trabajador)
+    if partes == 0:
+        return []
+
+    base, resto = divmod(cantidad, partes)
+    rangos = []
+    inicio = 0
+
+    for i in range(partes):
+        fin = inicio + base + (1 if i < resto else 0)
+        rangos.append((inicio, fin))
+        inicio = fin
+
+    return rangos
+
+
+class ServicioECDH:
+
+    def __init__(self, curva: str = '25519', trabajadores: Optional[int] = None):
+
+        if curva not in CURVAS:
+            raise ValueError("Curva no soportada. Usa '25519' o 'secp256r1'.")
+        if trabajadores is None:
+            trabajadores = os.cpu_count() or 1
+        if trabajadores < 1:
+            raise ValueError("El número de trabajadores debe ser al menos 1")
+
+        self.curva = curva
+        self.trabajadores = trabajadores
+        self._ejecutor = ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializar_trabajador,
+                                             initargs=(curva,))
+
+    def enviar_par_claves(self) -> Future:
+        # Futuro con un par (clave privada, clave pública)
+
+        return self._ejecutor.submit(_ejecutar, 'par')
+
+    def enviar_secreto(self, clave_privada, clave_publica) -> Future:
+        # Futuro con el secreto compartido; los errores de validación se lanzan al pedir el resultado
+
+        return self._ejecutor.submit(_ejecutar, 'secreto', clave_privada, clave_publica)
+
+    def generar_pares_claves(self, cantidad: int) -> List[Tuple[Any, Any]]:
+
+        if cantidad < 0:
+            raise ValueError("La cantidad de pares de claves no puede ser negativa")
+
+        tareas = [
+            self._ejecutor.submit(_ejecutar, 'pares', fin - inicio)
+            for inicio, fin in dividir_trozos(cantidad, self.trabajadores)
+        ]
+
+        return [par for tarea in tareas for par in tarea.result()]
+
+    def calcular_secretos_compartidos(self, pares: Sequence[Tuple[Any, Any]]) -> List[Any]:
+        # Mismo resultado, en el mismo orden, que aplicar calcular_secreto_compartido_* a cada par
+
+        pares = list(pares)
+        tareas = [
+            self._ejecutor.submit(_ejecutar, 'secretos', pares[inicio:fin])
+            for inicio, fin in dividir_trozos(len(pares), self.trabajadores)
+        ]
+
+        return [secreto for tarea in tareas for secreto in tarea.result()]
+
+    def cerrar(self) -> None:
+
+        self._ejecutor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
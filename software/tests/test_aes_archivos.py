@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import secrets
+import tempfile
+import subprocess
+import tracemalloc
+from src.aes.aes_archivos import cifrar_archivo, descifrar_archivo
+from src.aes.aes_ctr import cifrar_ctr
+from src.aes.aes_cbc import cifrar_cbc
+from src.aes.aes_ecb import cifrar_ecb
+
+
+def _escribir(ruta, datos):
+
+    with open(ruta, 'wb') as archivo:
+        archivo.write(datos)
+
+
+def _leer(ruta):
+
+    with open(ruta, 'rb') as archivo:
+        return archivo.read()
+
+
+def probar_equivalencia_en_memoria():
+
+    print("\n----- Prueba de equivalencia del cifrado por fragmentos con las funciones en memoria -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    vector_inicial = secrets.token_bytes(16)
+    # Fragmentos pequeños para que el contador y el encadenamiento crucen muchas fronteras
+    tamaño_fragmento = 4096
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, 'entrada')
+        cifrado = os.path.join(directorio, 'cifrado')
+        recuperado = os.path.join(directorio, 'recuperado')
+
+        for longitud in (0, 1, 15, 16, 4095, 4096, 4097, 3 * 4096, 100003):
+            datos = secrets.token_bytes(longitud)
+            _escribir(entrada, datos)
+
+            for modo, valor_inicial, esperado in (
+                ('ctr', nonce, cifrar_ctr(datos, clave, nonce)),
+                ('cbc', vector_inicial, cifrar_cbc(datos, clave, vector_inicial)),
+                ('ecb', None, cifrar_ecb(datos, clave)),
+            ):
+                escritos = cifrar_archivo(modo, entrada, cifrado, clave, valor_inicial, tamaño_fragmento)
+                assert _leer(cifrado) == esperado, f"El cifrado {modo.upper()} por fragmentos no coincide ({longitud} bytes)"
+                assert escritos == len(esperado), "Número de bytes escritos incorrecto"
+                descifrar_archivo(modo, cifrado, recuperado, clave, valor_inicial, tamaño_fragmento)
+                assert _leer(recuperado) == datos, f"El descifrado {modo.upper()} por fragmentos falló ({longitud} bytes)"
+
+    print("Los tres modos coinciden con las funciones en memoria para todas las longitudes")
+
+
+def probar_linea_de_comandos():
+
+    print("\n----- Prueba de la herramienta de línea de comandos -----")
+    clave = secrets.token_bytes(16)
+    vector_inicial = secrets.token_bytes(16)
+    datos = secrets.token_bytes(50000)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, 'entrada')
+        cifrado = os.path.join(directorio, 'cifrado')
+        recuperado = os.path.join(directorio, 'recuperado')
+        _escribir(entrada, datos)
+
+        comun = ['--modo', 'cbc', '--clave', clave.hex(), '--iv', vector_inicial.hex(), '--fragmento', '1024']
+        subprocess.run([sys.executable, '-m', 'src', 'cifrar', entrada, cifrado] + comun, check=True)
+        assert _leer(cifrado) == cifrar_cbc(datos, clave, vector_inicial), "La salida de la herramienta no coincide"
+        resultado = subprocess.run([sys.executable, '-m', 'src', 'descifrar', cifrado, recuperado] + comun,
+                                   check=True, capture_output=True, text=True)
+        assert _leer(recuperado) == datos, "El descifrado con la herramienta falló"
+        print(resultado.stderr.strip())
+
+        # Descifrar sin vector inicial debe fallar con un código distinto de cero
+        resultado = subprocess.run([sys.executable, '-m', 'src', 'descifrar', cifrado, recuperado,
+                                    '--modo', 'cbc', '--clave', clave.hex()], capture_output=True, text=True)
+        assert resultado.returncode != 0, "Se esperaba un error al descifrar sin vector inicial"
+
+    print("Prueba superada con éxito")
+
+
+def probar_misma_ruta_y_errores():
+
+    print("\n----- Prueba de entrada y salida en la misma ruta y de entradas inválidas -----")
+    clave = secrets.token_bytes(16)
+    vector_inicial = secrets.token_bytes(16)
+    datos = secrets.token_bytes(100000)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'archivo')
+        _escribir(ruta, datos)
+        cifrar_archivo('ecb', ruta, ruta, clave, tamaño_fragmento=4096)
+        assert _leer(ruta) == cifrar_ecb(datos, clave), "Cifrar sobre la misma ruta no debe truncar la entrada"
+        descifrar_archivo('ecb', ruta, ruta, clave, tamaño_fragmento=4096)
+        assert _leer(ruta) == datos, "Descifrar sobre la misma ruta no recupera el archivo"
+
+        # Un texto cifrado CBC cuya longitud no es múltiplo de 16 debe dar el ValueError original,
+        # sin tocar la salida existente ni dejar temporales
+        entrada = os.path.join(directorio, 'entrada')
+        salida = os.path.join(directorio, 'salida')
+        _escribir(entrada, secrets.token_bytes(10001))
+        _escribir(salida, b'previo')
+        try:
+            descifrar_archivo('cbc', entrada, salida, clave, vector_inicial, 4096)
+            print("Error: Debería haber rechazado un texto cifrado de longitud inválida")
+        except ValueError as e:
+            print(f"Prueba pasada. Error esperado: {str(e)}")
+        assert _leer(salida) == b'previo', "Un fallo no debe modificar la salida existente"
+        assert sorted(os.listdir(directorio)) == ['archivo', 'entrada', 'salida'], "Quedó un archivo temporal"
+
+        resultado = subprocess.run([sys.executable, '-m', 'src', 'descifrar', entrada, salida, '--modo', 'cbc',
+                                    '--clave', clave.hex(), '--iv', vector_inicial.hex(), '--fragmento', '4096'],
+                                   capture_output=True, text=True)
+        assert resultado.returncode == 1 and resultado.stderr.startswith("Error: "), "La herramienta debe informar del error"
+        print(resultado.stderr.strip())
+
+    print("Prueba superada con éxito")
+
+
+def probar_memoria_constante():
+
+    print("\n----- Prueba de memoria y rendimiento del cifrado de archivos -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    tamaño_fragmento = 256 * 1024
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, 'entrada')
+        cifrado = os.path.join(directorio, 'cifrado')
+
+        for megas in (2, 8):
+            _escribir(entrada, secrets.token_bytes(megas * 1024 * 1024))
+            tracemalloc.start()
+            inicio = time.time()
+            cifrar_archivo('ctr', entrada, cifrado, clave, nonce, tamaño_fragmento)
+            tiempo = time.time() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{megas} MB: {tiempo:.3f} segundos ({megas / tiempo:.2f} MB/s), "
+                  f"pico de memoria {pico / (1024 * 1024):.2f} MB")
+            assert pico < 8 * tamaño_fragmento, "La memoria usada no debería crecer con el tamaño del archivo"
+
+
+def ejecutar_todas_las_pruebas():
+    probar_equivalencia_en_memoria()
+    probar_linea_de_comandos()
+    probar_misma_ruta_y_errores()
+    probar_memoria_constante()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
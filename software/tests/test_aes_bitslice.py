@@ -0,0 +1,81 @@
+import time
+import secrets
+from src.aes.aes_bitslice import cifrar_bloques, transponer, destransponer, _sustituir_bytes
+from src.aes.aes_common import sbox
+from src.aes import aes_tablas
+from src.aes.aes_tablas import expandir_clave_palabras
+
+
+def ejecutar_vectores_prueba():
+
+    print("\n----- Vectores de prueba AES con bitslicing -----")
+    # Vector del apéndice C.1 de FIPS-197
+    texto_plano = bytes.fromhex("00112233445566778899aabbccddeeff")
+    clave = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    texto_cifrado_esperado = "69c4e0d86a7b0430d8cdb78070b4c55a"
+    texto_cifrado = cifrar_bloques(texto_plano, expandir_clave_palabras(clave))
+
+    print(f"Texto cifrado esperado: {texto_cifrado_esperado}")
+    print(f"Texto cifrado real:    {texto_cifrado.hex()}")
+    assert texto_cifrado.hex() == texto_cifrado_esperado, "Fallo en el cifrado con bitslicing"
+    print("Prueba superada con éxito")
+
+
+def probar_transposicion_y_sbox():
+
+    print("\n----- Prueba de transposición y del circuito de la S-box -----")
+
+    for n in (1, 3, 16, 257):
+        datos = secrets.token_bytes(16 * n)
+        assert destransponer(transponer(datos, n), n) == datos, f"La transposición no es reversible para {n} bloques"
+
+    # SubBytes actúa byte a byte, así que basta con pasar los 256 valores por el circuito
+    datos = bytes(range(256))
+    todo = (1 << len(datos)) - 1  # Cada plano tiene un bit por byte
+    sustituidos = destransponer(_sustituir_bytes(transponer(datos, 16), todo), 16)
+    assert sustituidos == bytes(sbox), "El circuito no reproduce la S-box"
+    print("Prueba superada con éxito")
+
+
+def probar_equivalencia_tablas():
+
+    print("\n----- Prueba de equivalencia con las tablas T -----")
+    iteraciones = 50
+
+    for _ in range(iteraciones):
+        palabras_clave = expandir_clave_palabras(secrets.token_bytes(16))
+        datos = secrets.token_bytes(16 * (1 + secrets.randbelow(600)))
+        assert cifrar_bloques(datos, palabras_clave) == aes_tablas.cifrar_bloques(datos, palabras_clave), "El bitslicing no coincide"
+
+    print(f"{iteraciones} lotes aleatorios coinciden con las tablas T")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Prueba de rendimiento: bitslicing frente a tablas T bloque a bloque -----")
+    palabras_clave = expandir_clave_palabras(secrets.token_bytes(16))
+
+    for bloques in (1, 16, 64, 128, 256, 1024, 4096, 16384):
+        datos = secrets.token_bytes(16 * bloques)
+
+        inicio = time.perf_counter()
+        aes_tablas.cifrar_bloques(datos, palabras_clave)
+        tiempo_tablas = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        cifrar_bloques(datos, palabras_clave)
+        tiempo_bitslice = time.perf_counter() - inicio
+
+        print(f"{bloques:6d} bloques: tablas T {len(datos) / tiempo_tablas / 1024:9.1f} KB/s, "
+              f"bitslicing {len(datos) / tiempo_bitslice / 1024:9.1f} KB/s ({tiempo_tablas / tiempo_bitslice:.2f}x)")
+
+
+def ejecutar_todas_las_pruebas():
+    ejecutar_vectores_prueba()
+    probar_transposicion_y_sbox()
+    probar_equivalencia_tablas()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
@@ -1,6 +1,6 @@
 import time
 import secrets
-from src.aes.aes_cbc import cifrar_cbc, descifrar_cbc
+from src.aes.aes_cbc import cifrar_cbc, descifrar_cbc, cifrar_cbc_into, descifrar_cbc_into
 from src.utils.sts_tests import ejecutar_pruebas_sts
 
 def ejecutar_vectores_prueba():
@@ -192,8 +192,33 @@ def probar_propagacion_errores():
             print(f"Byte {i}: {original} -> {descifrado}")
 
 
+def probar_cifrado_en_bufer():
+
+    print("\n----- Prueba de cifrado en búfer AES-CBC -----")
+    clave = secrets.token_bytes(16)
+    iv = secrets.token_bytes(16)
+    
+    for tamaño in [0, 15, 16, 17, 1024 * 1024 + 33]:
+        texto_plano = bytearray(secrets.token_bytes(tamaño))
+        esperado = cifrar_cbc(bytes(texto_plano), clave, iv)
+        destino = bytearray(len(esperado))
+        assert cifrar_cbc_into(memoryview(texto_plano), destino, clave, iv) == len(esperado)
+        assert destino == esperado, f"Fallo en el cifrado en búfer con {tamaño} bytes"
+        longitud = descifrar_cbc_into(destino, destino, clave, iv)
+        assert destino[:longitud] == texto_plano, f"Fallo en el descifrado en búfer con {tamaño} bytes"
+
+    print("El cifrado en búfer coincide con cifrar_cbc.")
+
+    try:
+        cifrar_cbc_into(b'A' * 32, bytearray(32), clave, iv)
+        print("Error: Debería haber rechazado un destino sin espacio para el relleno")
+    except ValueError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+
 def ejecutar_todas_las_pruebas():
     ejecutar_vectores_prueba()
+    probar_cifrado_en_bufer()
     probar_tiempo_ejecucion()
     probar_patron_visual()
     probar_propagacion_errores()
@@ -0,0 +1,89 @@
+import time
+import secrets
+from src.aes import (
+    cifrar_ctr, descifrar_ctr, cifrar_ecb, descifrar_ecb, cifrar_cbc, descifrar_cbc,
+    ClaveAES, estadisticas_cache_claves, limpiar_cache_claves
+)
+
+
+def probar_clave_expandida_en_modos():
+
+    print("\n----- Prueba de ClaveAES en todos los modos -----")
+    clave = secrets.token_bytes(16)
+    clave_aes = ClaveAES(clave)
+    nonce = secrets.token_bytes(8)
+    iv = secrets.token_bytes(16)
+    texto_plano = secrets.token_bytes(1000)
+
+    assert cifrar_ctr(texto_plano, clave_aes, nonce) == cifrar_ctr(texto_plano, clave, nonce), "Fallo en CTR"
+    assert cifrar_ecb(texto_plano, clave_aes) == cifrar_ecb(texto_plano, clave), "Fallo en ECB"
+    assert cifrar_cbc(texto_plano, clave_aes, iv) == cifrar_cbc(texto_plano, clave, iv), "Fallo en CBC"
+    assert descifrar_ctr(cifrar_ctr(texto_plano, clave, nonce), clave_aes, nonce) == texto_plano, "Fallo al descifrar CTR"
+    assert descifrar_ecb(cifrar_ecb(texto_plano, clave), clave_aes) == texto_plano, "Fallo al descifrar ECB"
+    assert descifrar_cbc(cifrar_cbc(texto_plano, clave, iv), clave_aes, iv) == texto_plano, "Fallo al descifrar CBC"
+    print("ClaveAES produce el mismo resultado que la clave en bytes.")
+
+    try:
+        ClaveAES(b'clave_corta')
+        print("Error: Debería haber rechazado una clave corta")
+    except ValueError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+
+def probar_cache_claves():
+
+    print("\n----- Prueba de la caché de claves -----")
+    limpiar_cache_claves()
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+
+    for _ in range(10):
+        cifrar_ctr(b'mensaje corto', clave, nonce)
+
+    estadisticas = estadisticas_cache_claves()
+    print(f"Estadísticas: {estadisticas}")
+    assert estadisticas.misses == 1 and estadisticas.hits == 9, "La caché debería expandir la clave una sola vez"
+    limpiar_cache_claves()
+    assert estadisticas_cache_claves().currsize == 0, "La caché debería quedar vacía"
+    print("La caché reutiliza la clave expandida y se vacía correctamente.")
+
+
+def probar_tiempo_mensajes_cortos():
+
+    print("\n----- Prueba de tiempo con muchos mensajes cortos -----")
+    clave = secrets.token_bytes(16)
+    clave_aes = ClaveAES(clave)
+    nonce = secrets.token_bytes(8)
+    mensaje = secrets.token_bytes(32)
+    iteraciones = 5000
+
+    limpiar_cache_claves()
+    inicio = time.time()
+    for _ in range(iteraciones):
+        limpiar_cache_claves()
+        cifrar_ctr(mensaje, clave, nonce)
+    tiempo_sin_cache = time.time() - inicio
+
+    inicio = time.time()
+    for _ in range(iteraciones):
+        cifrar_ctr(mensaje, clave, nonce)
+    tiempo_con_cache = time.time() - inicio
+
+    inicio = time.time()
+    for _ in range(iteraciones):
+        cifrar_ctr(mensaje, clave_aes, nonce)
+    tiempo_clave_aes = time.time() - inicio
+
+    print(f"Expandiendo la clave en cada mensaje: {tiempo_sin_cache / iteraciones * 1e6:.2f} µs por mensaje")
+    print(f"Clave en bytes con caché:             {tiempo_con_cache / iteraciones * 1e6:.2f} µs por mensaje")
+    print(f"Objeto ClaveAES:                      {tiempo_clave_aes / iteraciones * 1e6:.2f} µs por mensaje")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_clave_expandida_en_modos()
+    probar_cache_claves()
+    probar_tiempo_mensajes_cortos()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
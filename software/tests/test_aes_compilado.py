@@ -0,0 +1,117 @@
+import time
+import struct
+import secrets
+from src.aes.aes_clave import ClaveAES, obtener_clave
+from src.aes.aes_compilado import funciones_compiladas, generar_codigo
+from src.aes.aes_common import expandir_clave, cifrar_bloque_referencia
+from src.aes import aes_tablas
+from src.aes.aes_cbc import cifrar_cbc
+
+
+def ejecutar_vectores_prueba():
+
+    print("\n----- Vectores de prueba AES con funciones compiladas -----")
+    # Vector del apéndice C.1 de FIPS-197
+    texto_plano = bytes.fromhex("00112233445566778899aabbccddeeff")
+    clave_aes = ClaveAES(bytes.fromhex("000102030405060708090a0b0c0d0e0f"))
+    texto_cifrado_esperado = "69c4e0d86a7b0430d8cdb78070b4c55a"
+    cifrar_palabras, cifrar_bloques = funciones_compiladas(clave_aes)
+
+    print(f"Texto cifrado esperado: {texto_cifrado_esperado}")
+    print(f"Texto cifrado real:    {cifrar_bloques(texto_plano).hex()}")
+    assert cifrar_bloques(texto_plano).hex() == texto_cifrado_esperado, "Fallo en el cifrado compilado"
+    palabras = cifrar_palabras(*struct.unpack('>4I', texto_plano))
+    assert struct.pack('>4I', *palabras).hex() == texto_cifrado_esperado, "Fallo en el cifrado compilado de un bloque"
+    print("Prueba superada con éxito")
+
+
+def probar_codigo_generado():
+
+    print("\n----- Prueba del código generado -----")
+    clave_aes = ClaveAES(secrets.token_bytes(16))
+    codigo = generar_codigo(clave_aes.palabras_cifrado)
+
+    # Las claves de ronda son constantes y no queda bucle de rondas
+    assert "range" not in codigo and "rk[" not in codigo, "El código generado no está desenrollado"
+    for palabra in clave_aes.palabras_cifrado:
+        assert f"0x{palabra:08x}" in codigo, "Falta una clave de ronda en el código generado"
+
+    # Las funciones se compilan una sola vez por clave
+    assert funciones_compiladas(clave_aes) is funciones_compiladas(clave_aes), "Las funciones no se guardan en la clave"
+    print(f"Código generado: {len(codigo.splitlines())} líneas")
+    print("Prueba superada con éxito")
+
+
+def probar_equivalencia():
+
+    print("\n----- Prueba de equivalencia con el motor interpretado -----")
+    iteraciones = 100
+
+    for _ in range(iteraciones):
+        clave = secrets.token_bytes(16)
+        clave_aes = obtener_clave(clave)
+        datos = secrets.token_bytes(16 * (1 + secrets.randbelow(64)))
+        vector_inicial = secrets.token_bytes(16)
+        esperado = aes_tablas.cifrar_bloques(datos, clave_aes.palabras_cifrado)
+        assert funciones_compiladas(clave_aes)[1](datos) == esperado, "El cifrado compilado no coincide"
+        assert cifrar_cbc(datos, clave, vector_inicial, 'compilado') == cifrar_cbc(datos, clave, vector_inicial), "Fallo en CBC"
+
+    print(f"{iteraciones} claves aleatorias coinciden con el motor interpretado")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Prueba de rendimiento: función compilada frente a motor interpretado -----")
+    clave = secrets.token_bytes(16)
+    clave_aes = ClaveAES(clave)
+    clave_expandida = expandir_clave(list(clave))
+    datos = secrets.token_bytes(16 * 4096)
+
+    inicio = time.perf_counter()
+    cifrar_palabras, cifrar_bloques = funciones_compiladas(clave_aes)
+    print(f"Tiempo de compilación: {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+    inicio = time.perf_counter()
+    for i in range(0, len(datos) // 8, 16):
+        cifrar_bloque_referencia(list(datos[i:i + 16]), clave_expandida)
+    tiempo_referencia = (time.perf_counter() - inicio) * 8
+
+    inicio = time.perf_counter()
+    aes_tablas.cifrar_bloques(datos, clave_aes.palabras_cifrado)
+    tiempo_tablas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    cifrar_bloques(datos)
+    tiempo_compilado = time.perf_counter() - inicio
+
+    print(f"Tamaño de entrada: {len(datos)} bytes")
+    print(f"Funciones de ronda: {len(datos) / tiempo_referencia / 1024:9.1f} KB/s")
+    print(f"Tablas T:           {len(datos) / tiempo_tablas / 1024:9.1f} KB/s")
+    print(f"Compilado:          {len(datos) / tiempo_compilado / 1024:9.1f} KB/s "
+          f"({tiempo_tablas / tiempo_compilado:.2f}x frente a tablas T)")
+
+    # Bloque a bloque, como en CBC, se evita además la indexación de la clave en cada ronda
+    bloques = list(struct.iter_unpack('>4I', datos))
+    inicio = time.perf_counter()
+    for palabras in bloques:
+        aes_tablas.cifrar_palabras(*palabras, clave_aes.palabras_cifrado)
+    tiempo_tablas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for palabras in bloques:
+        cifrar_palabras(*palabras)
+    tiempo_compilado = time.perf_counter() - inicio
+
+    print(f"Un bloque por llamada: tablas T {len(bloques) / tiempo_tablas:9.0f} bloques/s, "
+          f"compilado {len(bloques) / tiempo_compilado:9.0f} bloques/s ({tiempo_tablas / tiempo_compilado:.2f}x)")
+
+
+def ejecutar_todas_las_pruebas():
+    ejecutar_vectores_prueba()
+    probar_codigo_generado()
+    probar_equivalencia()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
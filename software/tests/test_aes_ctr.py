@@ -1,6 +1,9 @@
 import time
 import secrets
-from src.aes.aes_ctr import cifrar_ctr, descifrar_ctr
+import tracemalloc
+from src.aes.aes_ctr import cifrar_ctr, descifrar_ctr, descifrar_ctr_rango, generar_flujo_clave, cifrar_ctr_into, descifrar_ctr_into, cifrar_ctr_lote, descifrar_ctr_lote
+from src.aes.aes_clave import ClaveAES
+from src.aes.aes_tablas import expandir_clave_palabras, cifrar_bloque
 from src.utils.sts_tests import ejecutar_pruebas_sts
 
 def ejecutar_vectores_prueba():
@@ -184,12 +187,117 @@ def probar_desbordamiento_contador():
     print("Prueba de desbordamiento del contador superada con éxito")
 
 
+def probar_descifrado_por_rangos():
+
+    print("\n----- Prueba de descifrado por rangos AES-CTR -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    texto_plano = secrets.token_bytes(5000)
+    texto_cifrado = cifrar_ctr(texto_plano, clave, nonce)
+
+    for desplazamiento, longitud in [(0, 0), (0, 5000), (1, 15), (15, 2), (16, 16), (1000, 1234), (4999, 1)]:
+        fragmento = descifrar_ctr_rango(texto_cifrado, clave, nonce, desplazamiento, longitud)
+        assert fragmento == texto_plano[desplazamiento:desplazamiento + longitud], f"Fallo en el rango ({desplazamiento}, {longitud})"
+    print("Los rangos descifrados coinciden con el texto plano.")
+
+    try:
+        descifrar_ctr_rango(texto_cifrado, clave, nonce, 4990, 20)
+        print("Error: Debería haber rechazado un rango fuera del texto cifrado")
+    except ValueError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+    # El contador de 64 bits da la vuelta igual que en incrementar_contador
+    palabras_clave = expandir_clave_palabras(clave)
+    desplazamiento = ((1 << 64) - 1) * 16 + 5
+    esperado = cifrar_bloque(nonce + b'\xff' * 8, palabras_clave)[5:] + cifrar_bloque(nonce + bytes(8), palabras_clave)
+    assert generar_flujo_clave(clave, nonce, desplazamiento, 27) == esperado, "Fallo al dar la vuelta al contador"
+    print("El flujo de clave da la vuelta correctamente en 2^64 bloques.")
+
+    texto_plano = secrets.token_bytes(4 * 1024 * 1024)
+    texto_cifrado = cifrar_ctr(texto_plano, clave, nonce)
+    inicio = time.time()
+    descifrar_ctr_rango(texto_cifrado, clave, nonce, 3 * 1024 * 1024, 4096)
+    tiempo_rango = time.time() - inicio
+    print(f"Descifrar 4 KB del centro de 4 MB: {tiempo_rango:.6f} segundos")
+
+
+def probar_cifrado_en_bufer():
+
+    print("\n----- Prueba de cifrado en búfer AES-CTR -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    texto_plano = bytearray(secrets.token_bytes(8 * 1024 * 1024 + 7))
+    esperado = cifrar_ctr(bytes(texto_plano), clave, nonce)
+
+    destino = bytearray(len(texto_plano))
+    assert cifrar_ctr_into(memoryview(texto_plano), destino, clave, nonce) == len(texto_plano)
+    assert destino == esperado, "Fallo en el cifrado en búfer"
+
+    # Descifrado en el mismo búfer
+    assert descifrar_ctr_into(destino, destino, clave, nonce) == len(texto_plano)
+    assert destino == texto_plano, "Fallo en el descifrado en el mismo búfer"
+    print("El cifrado en búfer coincide con cifrar_ctr.")
+
+    tracemalloc.start()
+    cifrar_ctr_into(texto_plano, destino, clave, nonce)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Memoria adicional máxima para {len(texto_plano)} bytes: {pico / 1024:.0f} KB")
+    assert pico < len(texto_plano) // 2, "La memoria adicional debería ser independiente del tamaño de los datos"
+
+    try:
+        cifrar_ctr_into(texto_plano, bytes(len(texto_plano)), clave, nonce)
+        print("Error: Debería haber rechazado un destino de solo lectura")
+    except TypeError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+
+def probar_cifrado_por_lotes():
+
+    print("\n----- Prueba de cifrado por lotes con claves distintas -----")
+    claves = [secrets.token_bytes(16) for _ in range(200)]
+    # Claves en bytes y como ClaveAES, repetidas, nonces de varias longitudes y mensajes vacíos
+    mensajes = [
+        (secrets.choice(claves + [ClaveAES(claves[0])]), secrets.token_bytes(secrets.choice((8, 12, 16))),
+         secrets.token_bytes(secrets.randbelow(300)))
+        for _ in range(2000)
+    ]
+    textos_cifrados = cifrar_ctr_lote(mensajes)
+
+    for (clave, nonce, texto_plano), texto_cifrado in zip(mensajes, textos_cifrados):
+        assert texto_cifrado == cifrar_ctr(texto_plano, clave, nonce), "El lote no coincide con cifrar_ctr"
+
+    descifrados = descifrar_ctr_lote([(c, n, t) for (c, n, _), t in zip(mensajes, textos_cifrados)])
+    assert descifrados == [texto_plano for _, _, texto_plano in mensajes], "Fallo en el descifrado por lotes"
+    assert cifrar_ctr_lote([]) == [], "Un lote vacío debe devolver una lista vacía"
+    print(f"{len(mensajes)} mensajes coinciden con cifrar_ctr")
+
+    # Rendimiento: muchos mensajes cortos, cada uno con la clave de un interlocutor distinto
+    for num_mensajes in (100, 1000, 10000):
+        mensajes = [(secrets.token_bytes(16), secrets.token_bytes(8), secrets.token_bytes(64)) for _ in range(num_mensajes)]
+
+        inicio = time.time()
+        for clave, nonce, texto_plano in mensajes:
+            cifrar_ctr(texto_plano, clave, nonce)
+        tiempo_individual = time.time() - inicio
+
+        inicio = time.time()
+        cifrar_ctr_lote(mensajes)
+        tiempo_lote = time.time() - inicio
+
+        print(f"{num_mensajes:6d} mensajes de 64 bytes: individual {num_mensajes / tiempo_individual:9.0f} mensajes/s, "
+              f"lote {num_mensajes / tiempo_lote:9.0f} mensajes/s ({tiempo_individual / tiempo_lote:.1f}x)")
+
+
 def ejecutar_todas_las_pruebas():
     ejecutar_vectores_prueba()
     probar_tiempo_ejecucion()
     probar_patron_visual()
     probar_difusion()
     probar_desbordamiento_contador()
+    probar_descifrado_por_rangos()
+    probar_cifrado_en_bufer()
+    probar_cifrado_por_lotes()
     probar_sensibilidad_clave()
     probar_seguridad_nonce()
     probar_sts()
@@ -1,6 +1,6 @@
 import time
 import secrets
-from src.aes.aes_ecb import cifrar_ecb, descifrar_ecb
+from src.aes.aes_ecb import cifrar_ecb, descifrar_ecb, cifrar_ecb_into, descifrar_ecb_into
 from src.utils.sts_tests import ejecutar_pruebas_sts
 
 def ejecutar_vectores_prueba():
@@ -179,8 +179,32 @@ def probar_sts():
         print("PASA" if p_valor > 0.01 else "FALLA")
 
 
+def probar_cifrado_en_bufer():
+
+    print("\n----- Prueba de cifrado en búfer AES-ECB -----")
+    clave = secrets.token_bytes(16)
+
+    for tamaño in [0, 15, 16, 17, 1024 * 1024 + 33]:
+        texto_plano = bytearray(secrets.token_bytes(tamaño))
+        esperado = cifrar_ecb(bytes(texto_plano), clave)
+        destino = bytearray(len(esperado))
+        assert cifrar_ecb_into(memoryview(texto_plano), destino, clave) == len(esperado)
+        assert destino == esperado, f"Fallo en el cifrado en búfer con {tamaño} bytes"
+        longitud = descifrar_ecb_into(destino, destino, clave)
+        assert destino[:longitud] == texto_plano, f"Fallo en el descifrado en búfer con {tamaño} bytes"
+
+    print("El cifrado en búfer coincide con cifrar_ecb.")
+
+    try:
+        cifrar_ecb_into(b'A' * 32, bytearray(32), clave)
+        print("Error: Debería haber rechazado un destino sin espacio para el relleno")
+    except ValueError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+
 def ejecutar_todas_las_pruebas():
     ejecutar_vectores_prueba()
+    probar_cifrado_en_bufer()
     probar_diferentes_tamaños()
     probar_tiempo_ejecucion()
     probar_patron_visual()
@@ -0,0 +1,162 @@
+import time
+import secrets
+from src.aes.aes_gcm import cifrar_gcm, descifrar_gcm
+from src.aes.aes_ctr import cifrar_ctr
+from src.aes.aes_motores import motores_disponibles
+from src.crypto_system import SistemaCriptografico
+from Crypto.Cipher import AES
+
+TEXTO_PLANO_NIST = ("d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72"
+                    "1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b391aafd255")
+DATOS_ASOCIADOS_NIST = "feedfacedeadbeeffeedfacedeadbeefabaddad2"
+
+
+def ejecutar_vectores_prueba():
+
+    print("\n----- Vectores de prueba AES-GCM (casos 1 a 5 de la especificación de GCM) -----")
+    vectores_prueba = [
+        {
+            "clave": "00000000000000000000000000000000", "vector_inicial": "000000000000000000000000",
+            "texto_plano": "", "datos_asociados": "",
+            "texto_cifrado": "", "etiqueta": "58e2fccefa7e3061367f1d57a4e7455a"
+        },
+        {
+            "clave": "00000000000000000000000000000000", "vector_inicial": "000000000000000000000000",
+            "texto_plano": "00000000000000000000000000000000", "datos_asociados": "",
+            "texto_cifrado": "0388dace60b6a392f328c2b971b2fe78", "etiqueta": "ab6e47d42cec13bdf53a67b21257bddf"
+        },
+        {
+            "clave": "feffe9928665731c6d6a8f9467308308", "vector_inicial": "cafebabefacedbaddecaf888",
+            "texto_plano": TEXTO_PLANO_NIST, "datos_asociados": "",
+            "texto_cifrado": "42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e"
+                             "21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091473f5985",
+            "etiqueta": "4d5c2af327cd64a62cf35abd2ba6fab4"
+        },
+        {
+            "clave": "feffe9928665731c6d6a8f9467308308", "vector_inicial": "cafebabefacedbaddecaf888",
+            "texto_plano": TEXTO_PLANO_NIST[:120], "datos_asociados": DATOS_ASOCIADOS_NIST,
+            "texto_cifrado": "42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e"
+                             "21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091",
+            "etiqueta": "5bc94fbc3221a5db94fae95ae7121a47"
+        },
+        {
+            "clave": "feffe9928665731c6d6a8f9467308308", "vector_inicial": "cafebabefacedbad",
+            "texto_plano": TEXTO_PLANO_NIST[:120], "datos_asociados": DATOS_ASOCIADOS_NIST,
+            "texto_cifrado": "61353b4c2806934a777ff51fa22a4755699b2a714fcdc6f83766e5f97b6c7423"
+                             "73806900e49f24b22b097544d4896b424989b5e1ebac0f07c23f4598",
+            "etiqueta": "3612d2e79e3b0785561be14aaca2fccb"
+        },
+    ]
+
+    for i, vector in enumerate(vectores_prueba, 1):
+        print(f"\nVector de prueba {i}:")
+        clave = bytes.fromhex(vector["clave"])
+        vector_inicial = bytes.fromhex(vector["vector_inicial"])
+        texto_plano = bytes.fromhex(vector["texto_plano"])
+        datos_asociados = bytes.fromhex(vector["datos_asociados"])
+
+        for motor in motores_disponibles():
+            texto_cifrado, etiqueta = cifrar_gcm(texto_plano, clave, vector_inicial, datos_asociados, motor)
+            assert texto_cifrado.hex() == vector["texto_cifrado"], f"Fallo en el cifrado GCM con {motor}"
+            assert etiqueta.hex() == vector["etiqueta"], f"Fallo en la etiqueta GCM con {motor}"
+            assert descifrar_gcm(texto_cifrado, clave, vector_inicial, etiqueta, datos_asociados, motor) == texto_plano
+
+        print(f"Etiqueta esperada: {vector['etiqueta']}")
+        print(f"Etiqueta real:     {etiqueta.hex()}")
+        print("Prueba superada con éxito")
+
+
+def probar_equivalencia_libreria():
+
+    print("\n----- Prueba de equivalencia con AES-GCM de pycryptodome -----")
+    iteraciones = 200
+
+    for _ in range(iteraciones):
+        clave = secrets.token_bytes(16)
+        # Vectores iniciales de 96 bits y de otras longitudes, que pasan por GHASH para obtener J0
+        vector_inicial = secrets.token_bytes(secrets.choice((12, 1, 8, 16, 60)))
+        datos_asociados = secrets.token_bytes(secrets.randbelow(64))
+        texto_plano = secrets.token_bytes(secrets.randbelow(2000))
+        cifrador = AES.new(clave, AES.MODE_GCM, nonce=vector_inicial)
+        cifrador.update(datos_asociados)
+        esperado = cifrador.encrypt_and_digest(texto_plano)
+        assert cifrar_gcm(texto_plano, clave, vector_inicial, datos_asociados) == esperado, "GCM no coincide con pycryptodome"
+
+    print(f"{iteraciones} mensajes aleatorios coinciden con pycryptodome")
+
+
+def probar_manipulacion():
+
+    print("\n----- Prueba de detección de manipulaciones -----")
+    clave = secrets.token_bytes(16)
+    vector_inicial = secrets.token_bytes(12)
+    datos_asociados = b"cabecera"
+    texto_cifrado, etiqueta = cifrar_gcm(b"Transferir 100 euros a Bob", clave, vector_inicial, datos_asociados)
+
+    manipulaciones = {
+        "texto cifrado": (bytes([texto_cifrado[0] ^ 1]) + texto_cifrado[1:], etiqueta, datos_asociados),
+        "etiqueta": (texto_cifrado, etiqueta[:-1] + bytes([etiqueta[-1] ^ 1]), datos_asociados),
+        "datos asociados": (texto_cifrado, etiqueta, b"cabecerA"),
+    }
+
+    for nombre, (cifrado, etiqueta_prueba, asociados) in manipulaciones.items():
+        try:
+            descifrar_gcm(cifrado, clave, vector_inicial, etiqueta_prueba, asociados)
+            assert False, f"No se detectó la manipulación de {nombre}"
+        except ValueError:
+            print(f"Manipulación de {nombre} detectada")
+
+
+def probar_sistema_gcm():
+
+    print("\n----- Prueba de mensajes autenticados en el sistema criptográfico -----")
+
+    for curva in ('25519', 'secp256r1'):
+        sistema = SistemaCriptografico(curva=curva)
+        privada_a, publica_a = sistema.generar_claves()
+        privada_b, publica_b = sistema.generar_claves()
+        mensaje = f"Mensaje autenticado con {curva}"
+        nonce, texto_cifrado, etiqueta = sistema.cifrar_mensaje_gcm(privada_a, publica_b, mensaje, b"sesion-1")
+        assert sistema.descifrar_mensaje_gcm(privada_b, publica_a, nonce, texto_cifrado, etiqueta, b"sesion-1") == mensaje
+
+        try:
+            sistema.descifrar_mensaje_gcm(privada_b, publica_a, nonce, texto_cifrado, etiqueta, b"sesion-2")
+            assert False, "Se esperaba un error con datos asociados distintos"
+        except ValueError:
+            pass
+
+        print(f"{curva}: prueba superada con éxito")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Prueba de rendimiento: GCM frente a CTR -----")
+    clave = secrets.token_bytes(16)
+    vector_inicial = secrets.token_bytes(12)
+
+    for tamaño in (1024, 64 * 1024, 1024 * 1024):
+        datos = secrets.token_bytes(tamaño)
+
+        for motor in motores_disponibles():
+            inicio = time.time()
+            cifrar_ctr(datos, clave, vector_inicial[:8], motor)
+            tiempo_ctr = time.time() - inicio
+
+            inicio = time.time()
+            cifrar_gcm(datos, clave, vector_inicial, motor=motor)
+            tiempo_gcm = time.time() - inicio
+
+            print(f"{tamaño:8d} bytes, {motor:13s}: CTR {tamaño / tiempo_ctr / (1024 * 1024):8.2f} MB/s, "
+                  f"GCM {tamaño / tiempo_gcm / (1024 * 1024):8.2f} MB/s")
+
+
+def ejecutar_todas_las_pruebas():
+    ejecutar_vectores_prueba()
+    probar_equivalencia_libreria()
+    probar_manipulacion()
+    probar_sistema_gcm()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
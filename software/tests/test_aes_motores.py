@@ -0,0 +1,123 @@
+import os
+import time
+import secrets
+from src.aes.aes_motores import motores_disponibles, obtener_motor, VARIABLE_ENTORNO_MOTOR
+from src.aes.aes_clave import obtener_clave
+from src.aes.aes_ctr import cifrar_ctr, descifrar_ctr
+from src.aes.aes_cbc import cifrar_cbc, descifrar_cbc
+from src.aes.aes_ecb import cifrar_ecb, descifrar_ecb
+from src.crypto_system import SistemaCriptografico
+
+
+def probar_equivalencia_motores():
+
+    print("\n----- Prueba de equivalencia entre motores -----")
+    motores = motores_disponibles()
+    print(f"Motores disponibles: {', '.join(motores)}")
+    iteraciones = 100
+
+    for _ in range(iteraciones):
+        clave = secrets.token_bytes(16)
+        vector_inicial = secrets.token_bytes(16)
+        nonce = secrets.token_bytes(secrets.choice((8, 12, 16)))
+        datos = secrets.token_bytes(secrets.randbelow(5000))
+
+        referencia = None
+        for motor in motores:
+            resultado = (cifrar_ctr(datos, clave, nonce, motor), cifrar_cbc(datos, clave, vector_inicial, motor),
+                         cifrar_ecb(datos, clave, motor))
+            if referencia is None:
+                referencia = resultado
+            assert resultado == referencia, f"El motor {motor} no coincide con {motores[0]} ({len(datos)} bytes)"
+            assert descifrar_ctr(resultado[0], clave, nonce, motor) == datos, f"Fallo del descifrado CTR con {motor}"
+            assert descifrar_cbc(resultado[1], clave, vector_inicial, motor) == datos, f"Fallo del descifrado CBC con {motor}"
+            assert descifrar_ecb(resultado[2], clave, motor) == datos, f"Fallo del descifrado ECB con {motor}"
+
+    print(f"{iteraciones} mensajes aleatorios producen la misma salida en todos los motores")
+
+
+def probar_vuelta_contador():
+
+    print("\n----- Prueba de vuelta del contador entre motores -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    datos = secrets.token_bytes(100)
+    clave_aes = obtener_clave(clave)
+    motor_python = obtener_motor('python')
+
+    for motor in motores_disponibles():
+        for contador_inicial in (0, (1 << 64) - 7, (1 << 64) - 1):
+            resultado = obtener_motor(motor).aplicar_flujo_ctr(datos, clave_aes, nonce, contador_inicial)
+            esperado = motor_python.aplicar_flujo_ctr(datos, clave_aes, nonce, contador_inicial)
+            assert resultado == esperado, f"El motor {motor} no da la vuelta al contador igual que el de referencia"
+
+    print("Prueba superada con éxito")
+
+
+def probar_seleccion_motor():
+
+    print("\n----- Prueba de selección de motor -----")
+    anterior = os.environ.get(VARIABLE_ENTORNO_MOTOR)
+
+    try:
+        os.environ[VARIABLE_ENTORNO_MOTOR] = 'inexistente'
+        try:
+            cifrar_ctr(b"mensaje", secrets.token_bytes(16), secrets.token_bytes(8))
+            assert False, "Se esperaba un error con un motor desconocido en AES_MOTOR"
+        except ValueError as e:
+            print(f"Error esperado: {e}")
+
+        os.environ[VARIABLE_ENTORNO_MOTOR] = 'python'
+        assert obtener_motor().nombre == 'python', "AES_MOTOR no selecciona el motor"
+    finally:
+        if anterior is None:
+            os.environ.pop(VARIABLE_ENTORNO_MOTOR, None)
+        else:
+            os.environ[VARIABLE_ENTORNO_MOTOR] = anterior
+
+    try:
+        SistemaCriptografico(motor='inexistente')
+        assert False, "Se esperaba un error al crear el sistema con un motor desconocido"
+    except ValueError:
+        pass
+
+    # Un mensaje cifrado con un motor se descifra con cualquier otro
+    for motor_emisor in motores_disponibles():
+        for motor_receptor in motores_disponibles():
+            emisor = SistemaCriptografico(motor=motor_emisor)
+            receptor = SistemaCriptografico(motor=motor_receptor)
+            privada_a, publica_a = emisor.generar_claves()
+            privada_b, publica_b = receptor.generar_claves()
+            nonce, texto_cifrado = emisor.cifrar_mensaje(privada_a, publica_b, "Mensaje entre motores")
+            assert receptor.descifrar_mensaje(privada_b, publica_a, nonce, texto_cifrado) == "Mensaje entre motores"
+
+    print("Prueba superada con éxito")
+
+
+def probar_rendimiento_motores():
+
+    print("\n----- Prueba de rendimiento por motor -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    vector_inicial = secrets.token_bytes(16)
+    datos = secrets.token_bytes(1024 * 1024)
+
+    for motor in motores_disponibles():
+        for nombre, funcion in (('CTR', lambda: cifrar_ctr(datos, clave, nonce, motor)),
+                                ('CBC', lambda: cifrar_cbc(datos, clave, vector_inicial, motor)),
+                                ('ECB', lambda: cifrar_ecb(datos, clave, motor))):
+            inicio = time.time()
+            funcion()
+            tiempo = time.time() - inicio
+            print(f"{motor:13s} {nombre}: {tiempo:.4f} segundos ({len(datos) / tiempo / (1024 * 1024):.2f} MB/s)")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_equivalencia_motores()
+    probar_vuelta_contador()
+    probar_seleccion_motor()
+    probar_rendimiento_motores()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
@@ -0,0 +1,110 @@
+import time
+import secrets
+import numpy as np
+from src.aes import cifrar_ctr, cifrar_ecb, cifrar_cbc, descifrar_cbc, descifrar_ecb
+from src.aes.aes_ctr import generar_bloques_contador
+from src.aes.aes_tablas import expandir_clave_palabras, expandir_clave_descifrado, cifrar_bloques, descifrar_bloques
+from src.aes import aes_numpy
+
+
+def ejecutar_vectores_prueba():
+
+    print("\n----- Vectores de prueba AES vectorizado -----")
+    # Vectores de F.1.1 de NIST SP 800-38A
+    clave = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+    texto_plano = bytes.fromhex("6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51")
+    texto_cifrado_esperado = "3ad77bb40d7a3660a89ecaf32466ef97f5d3d58503b9699de785895a96fdbaaf"
+    palabras_clave = expandir_clave_palabras(clave)
+    lote = np.frombuffer(texto_plano, dtype=np.uint8).reshape(-1, 16)
+    texto_cifrado = aes_numpy.cifrar_lote(lote, palabras_clave).tobytes()
+
+    print(f"Texto cifrado esperado: {texto_cifrado_esperado}")
+    print(f"Texto cifrado real:    {texto_cifrado.hex()}")
+    assert texto_cifrado.hex() == texto_cifrado_esperado, "Fallo en el cifrado vectorizado"
+
+    palabras = lote.view('>u4').astype(np.uint32)
+    salida_palabras = aes_numpy.cifrar_lote(palabras, palabras_clave)
+    assert salida_palabras.astype('>u4').tobytes().hex() == texto_cifrado_esperado, "Fallo con la entrada en palabras"
+    print("Prueba superada con éxito")
+
+
+def probar_equivalencia_tablas():
+
+    print("\n----- Prueba de equivalencia con el motor de tablas T -----")
+    tamaños = [1, 47, 48, 49, 100, 1000]
+
+    for num_bloques in tamaños:
+        palabras_clave = expandir_clave_palabras(secrets.token_bytes(16))
+        datos = secrets.token_bytes(16 * num_bloques)
+        assert aes_numpy.cifrar_bloques(datos, palabras_clave) == cifrar_bloques(datos, palabras_clave), f"Fallo con {num_bloques} bloques"
+        palabras_descifrado = expandir_clave_descifrado(palabras_clave)
+        assert aes_numpy.descifrar_bloques(datos, palabras_descifrado) == descifrar_bloques(datos, palabras_descifrado), f"Fallo al descifrar {num_bloques} bloques"
+
+    print(f"El motor vectorizado coincide con las tablas T para {tamaños} bloques")
+
+
+def probar_desbordamiento_contador():
+
+    print("\n----- Prueba de desbordamiento del contador vectorizado -----")
+    contador_inicial = (1 << 64) - 5
+
+    for nonce in (secrets.token_bytes(8), secrets.token_bytes(12), secrets.token_bytes(16)):
+        esperado = generar_bloques_contador(nonce, contador_inicial, 10)
+        obtenido = aes_numpy.bloques_contador(nonce, contador_inicial, 10).tobytes()
+        assert obtenido == esperado, f"Fallo con un nonce de {len(nonce)} bytes"
+
+    print("Los bloques de contador coinciden al dar la vuelta a 2^64")
+
+
+def probar_expansion_claves():
+
+    print("\n----- Prueba de expansión vectorizada de claves -----")
+    claves = [secrets.token_bytes(16) for _ in range(100)]
+    lote = np.frombuffer(b''.join(claves), dtype=np.uint8).reshape(-1, 16)
+    expandidas = aes_numpy.expandir_claves(lote)
+
+    for clave, palabras in zip(claves, expandidas):
+        assert list(palabras) == expandir_clave_palabras(clave), "La expansión vectorizada no coincide"
+
+    print(f"{len(claves)} claves expandidas a la vez coinciden con expandir_clave_palabras")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Prueba de rendimiento AES vectorizado -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+
+    for megas in (1, 4, 16):
+        texto_plano = secrets.token_bytes(megas * 1024 * 1024)
+        inicio = time.time()
+        cifrar_ctr(texto_plano, clave, nonce)
+        tiempo_ctr = time.time() - inicio
+        inicio = time.time()
+        cifrar_ecb(texto_plano, clave)
+        tiempo_ecb = time.time() - inicio
+        texto_cifrado = cifrar_cbc(texto_plano, clave, nonce * 2)
+        inicio = time.time()
+        descifrar_cbc(texto_cifrado, clave, nonce * 2)
+        tiempo_cbc = time.time() - inicio
+        inicio = time.time()
+        descifrar_ecb(texto_cifrado, clave)
+        tiempo_ecb_descifrado = time.time() - inicio
+        print(f"Tamaño de entrada: {megas} MB")
+        print(f"CTR: {megas / tiempo_ctr:.2f} MB/s")
+        print(f"ECB: {megas / tiempo_ecb:.2f} MB/s")
+        print(f"Descifrado CBC: {megas / tiempo_cbc:.2f} MB/s")
+        print(f"Descifrado ECB: {megas / tiempo_ecb_descifrado:.2f} MB/s")
+        print("--------------------")
+
+
+def ejecutar_todas_las_pruebas():
+    ejecutar_vectores_prueba()
+    probar_equivalencia_tablas()
+    probar_desbordamiento_contador()
+    probar_expansion_claves()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
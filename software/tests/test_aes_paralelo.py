@@ -0,0 +1,88 @@
+import os
+import time
+import secrets
+from src.aes import cifrar_ctr, cifrar_cbc, descifrar_cbc
+from src.aes.aes_paralelo import cifrar_ctr_paralelo, descifrar_ctr_paralelo, descifrar_cbc_paralelo, dividir_bloques
+
+
+def probar_division_rangos():
+
+    print("\n----- Prueba de división del espacio de contadores -----")
+
+    for num_bloques, partes in [(10, 3), (3, 8), (1000, 4), (0, 2)]:
+        rangos = dividir_bloques(num_bloques, partes)
+        cubiertos = [bloque for inicio, fin in rangos for bloque in range(inicio, fin)]
+        assert cubiertos == list(range(num_bloques)), f"Los rangos no cubren {num_bloques} bloques"
+        print(f"{num_bloques} bloques en {partes} partes: {rangos}")
+
+
+def probar_equivalencia_serie():
+
+    print("\n----- Prueba de equivalencia con cifrar_ctr -----")
+    clave = secrets.token_bytes(16)
+
+    for tamaño in [0, 100, 2 * 1024 * 1024 + 7]:
+        for nonce in (secrets.token_bytes(8), b'\xff' * 16):
+            texto_plano = secrets.token_bytes(tamaño)
+            texto_cifrado = cifrar_ctr_paralelo(texto_plano, clave, nonce, trabajadores=3)
+            assert texto_cifrado == cifrar_ctr(texto_plano, clave, nonce), f"Fallo con {tamaño} bytes"
+            assert descifrar_ctr_paralelo(texto_cifrado, clave, nonce, trabajadores=2) == texto_plano, "Fallo en el descifrado"
+
+    print("El cifrado paralelo coincide con el cifrado en serie.")
+
+
+def probar_descifrado_cbc_paralelo():
+
+    print("\n----- Prueba de descifrado CBC paralelo -----")
+    clave = secrets.token_bytes(16)
+    iv = secrets.token_bytes(16)
+
+    for tamaño in [0, 100, 3 * 1024 * 1024 + 5]:
+        texto_plano = secrets.token_bytes(tamaño)
+        texto_cifrado = cifrar_cbc(texto_plano, clave, iv)
+        assert descifrar_cbc_paralelo(texto_cifrado, clave, iv, trabajadores=3) == texto_plano, f"Fallo con {tamaño} bytes"
+        assert descifrar_cbc(texto_cifrado, clave, iv) == texto_plano, f"Fallo vectorizado con {tamaño} bytes"
+
+    print("El descifrado CBC paralelo y vectorizado coincide con el texto plano.")
+
+
+def probar_escalado():
+
+    print("\n----- Prueba de escalado CTR paralelo -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    texto_plano = secrets.token_bytes(64 * 1024 * 1024)
+    megas = len(texto_plano) / (1024 * 1024)
+    nucleos = os.cpu_count() or 1
+    tiempo_base = None
+
+    for trabajadores in range(1, nucleos + 1):
+        inicio = time.time()
+        cifrar_ctr_paralelo(texto_plano, clave, nonce, trabajadores=trabajadores)
+        tiempo = time.time() - inicio
+        tiempo_base = tiempo_base or tiempo
+        print(f"{trabajadores} proceso(s): {tiempo:.3f} segundos, {megas / tiempo:.2f} MB/s, aceleración {tiempo_base / tiempo:.2f}x")
+
+    print("\nDescifrado CBC:")
+    iv = secrets.token_bytes(16)
+    # Cifrar 64 MB en CBC es secuencial y lento; para medir basta cualquier secuencia de bloques
+    texto_cifrado = cifrar_ctr(texto_plano, clave, nonce)
+    tiempo_base = None
+
+    for trabajadores in range(1, nucleos + 1):
+        inicio = time.time()
+        descifrar_cbc_paralelo(texto_cifrado, clave, iv, trabajadores=trabajadores)
+        tiempo = time.time() - inicio
+        tiempo_base = tiempo_base or tiempo
+        print(f"{trabajadores} proceso(s): {tiempo:.3f} segundos, {megas / tiempo:.2f} MB/s, aceleración {tiempo_base / tiempo:.2f}x")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_division_rangos()
+    probar_equivalencia_serie()
+    probar_descifrado_cbc_paralelo()
+    probar_escalado()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
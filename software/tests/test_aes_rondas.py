@@ -0,0 +1,80 @@
+import time
+import secrets
+from src.aes.aes_rondas import cifrar_bloques, UMBRAL_BLOQUES_RONDAS, MAXIMO_BLOQUES_RONDAS
+from src.aes import aes_tablas, aes_numpy
+from src.aes.aes_tablas import expandir_clave_palabras
+from src.aes.aes_ctr import cifrar_ctr
+from src.aes.aes_ecb import cifrar_ecb
+
+
+def ejecutar_vectores_prueba():
+
+    print("\n----- Vectores de prueba AES ronda a ronda -----")
+    # Vector del apéndice C.1 de FIPS-197
+    texto_plano = bytes.fromhex("00112233445566778899aabbccddeeff")
+    clave = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    texto_cifrado_esperado = "69c4e0d86a7b0430d8cdb78070b4c55a"
+    texto_cifrado = cifrar_bloques(texto_plano, expandir_clave_palabras(clave))
+
+    print(f"Texto cifrado esperado: {texto_cifrado_esperado}")
+    print(f"Texto cifrado real:    {texto_cifrado.hex()}")
+    assert texto_cifrado.hex() == texto_cifrado_esperado, "Fallo en el cifrado ronda a ronda"
+    print("Prueba superada con éxito")
+
+
+def probar_equivalencia_tablas():
+
+    print("\n----- Prueba de equivalencia con las tablas T -----")
+    iteraciones = 50
+
+    for _ in range(iteraciones):
+        clave = secrets.token_bytes(16)
+        palabras_clave = expandir_clave_palabras(clave)
+        datos = secrets.token_bytes(16 * (1 + secrets.randbelow(600)))
+        assert cifrar_bloques(datos, palabras_clave) == aes_tablas.cifrar_bloques(datos, palabras_clave), "Las rondas no coinciden"
+
+        # Los modos eligen el motor según el tamaño; el resultado no cambia
+        nonce = secrets.token_bytes(8)
+        assert cifrar_ctr(datos, clave, nonce, 'rondas') == cifrar_ctr(datos, clave, nonce), "Fallo en CTR"
+        assert cifrar_ecb(datos, clave, 'rondas') == cifrar_ecb(datos, clave), "Fallo en ECB"
+
+    print(f"{iteraciones} lotes aleatorios coinciden con las tablas T")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Prueba de rendimiento: rondas sobre el búfer frente a tablas T y NumPy -----")
+    print(f"Umbral de uso: {UMBRAL_BLOQUES_RONDAS} bloques; con NumPy, hasta {MAXIMO_BLOQUES_RONDAS} bloques")
+    palabras_clave = expandir_clave_palabras(secrets.token_bytes(16))
+
+    for bloques in (1, 4, 8, 16, 64, 256, 512, 1024, 4096):
+        datos = secrets.token_bytes(16 * bloques)
+
+        inicio = time.perf_counter()
+        aes_tablas.cifrar_bloques(datos, palabras_clave)
+        tiempo_tablas = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        cifrar_bloques(datos, palabras_clave)
+        tiempo_rondas = time.perf_counter() - inicio
+
+        linea = (f"{bloques:6d} bloques: tablas T {len(datos) / tiempo_tablas / 1024:9.1f} KB/s, "
+                 f"rondas {len(datos) / tiempo_rondas / 1024:9.1f} KB/s ({tiempo_tablas / tiempo_rondas:.2f}x)")
+
+        if aes_numpy.NUMPY_DISPONIBLE:
+            inicio = time.perf_counter()
+            aes_numpy.cifrar_bloques(datos, palabras_clave)
+            tiempo_numpy = time.perf_counter() - inicio
+            linea += f", NumPy {len(datos) / tiempo_numpy / 1024:9.1f} KB/s"
+
+        print(linea)
+
+
+def ejecutar_todas_las_pruebas():
+    ejecutar_vectores_prueba()
+    probar_equivalencia_tablas()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
@@ -0,0 +1,196 @@
+import gc
+import time
+import secrets
+import threading
+import weakref
+from src.aes import aes_sesion
+from src.aes.aes_sesion import SesionCTR
+from src.aes.aes_ctr import cifrar_ctr, generar_flujo_clave, descifrar_ctr_rango
+
+
+def probar_equivalencia_flujo():
+
+    print("\n----- Prueba de equivalencia de la sesión CTR con el flujo de clave -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    mensajes = [secrets.token_bytes(secrets.randbelow(3000)) for _ in range(50)]
+    # Un mensaje mayor que la capacidad obliga a consumir el anillo en varias vueltas
+    mensajes.append(secrets.token_bytes(20000))
+    cifrados = []
+
+    with SesionCTR(clave, nonce, capacidad=8192, bytes_por_relleno=1024) as sesion:
+        for mensaje in mensajes:
+            desplazamiento = sesion.posicion
+            texto_cifrado = sesion.cifrar(mensaje)
+            esperado = bytes(a ^ b for a, b in zip(mensaje, generar_flujo_clave(clave, nonce, desplazamiento, len(mensaje))))
+            assert texto_cifrado == esperado, "La sesión no coincide con el flujo de clave"
+            cifrados.append(texto_cifrado)
+        estadisticas = sesion.estadisticas()
+
+    total = sum(len(m) for m in mensajes)
+    assert estadisticas['consumido'] == total, "El flujo consumido no coincide con los bytes cifrados"
+    # El flujo completo de la sesión es el de cifrar_ctr sobre la concatenación de los mensajes
+    assert b''.join(cifrados) == cifrar_ctr(b''.join(mensajes), clave, nonce), "La sesión no equivale a cifrar_ctr"
+
+    with SesionCTR(clave, nonce) as receptor:
+        for mensaje, texto_cifrado in zip(mensajes, cifrados):
+            assert receptor.descifrar(texto_cifrado) == mensaje, "El receptor no recupera el mensaje"
+
+    print(f"{len(mensajes)} mensajes ({total} bytes) coinciden; estadísticas: {estadisticas}")
+
+
+def probar_no_reutilizacion():
+
+    print("\n----- Prueba de no reutilización del flujo de clave -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+
+    with SesionCTR(clave, nonce) as sesion:
+        primero = sesion.cifrar(bytes(64))
+        segundo = sesion.cifrar(bytes(64))
+        assert primero != segundo, "Dos mensajes no deben compartir flujo de clave"
+        assert descifrar_ctr_rango(primero + segundo, clave, nonce, 64, 64) == bytes(64), "El segundo mensaje no continúa el flujo"
+
+    try:
+        SesionCTR(clave, secrets.token_bytes(16))
+        assert False, "Un nonce de 16 bytes debería rechazarse"
+    except ValueError:
+        pass
+
+    sesion = SesionCTR(clave, nonce)
+    sesion.cerrar()
+    try:
+        sesion.cifrar(b"mensaje")
+        assert False, "Una sesión cerrada no debe cifrar"
+    except ValueError:
+        pass
+
+    print("Prueba superada con éxito")
+
+
+def probar_abandono_y_fallos():
+
+    print("\n----- Prueba de sesiones abandonadas y fallos del productor -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+
+    # Una sesión que se abandona sin cerrar se recolecta y su hilo termina
+    sesion = SesionCTR(clave, nonce)
+    sesion.cifrar(bytes(64))
+    referencia = weakref.ref(sesion)
+    del sesion
+    gc.collect()
+    assert referencia() is None, "La sesión abandonada no se ha recolectado"
+    for _ in range(100):
+        if not any(hilo.name == "SesionCTR" for hilo in threading.enumerate()):
+            break
+        time.sleep(0.01)
+    assert not any(hilo.name == "SesionCTR" for hilo in threading.enumerate()), "El hilo productor sigue vivo"
+
+    # Si el productor falla, los consumidores reciben su excepción en lugar de esperar para siempre
+    original = aes_sesion.aplicar_flujo_clave
+
+    def fallar(*argumentos):
+        raise RuntimeError("fallo simulado del productor")
+
+    aes_sesion.aplicar_flujo_clave = fallar
+    try:
+        with SesionCTR(clave, nonce) as sesion:
+            try:
+                sesion.cifrar(bytes(64))
+                assert False, "El fallo del productor debería llegar al consumidor"
+            except RuntimeError as e:
+                print(f"Prueba pasada. Error esperado: {str(e)}")
+    finally:
+        aes_sesion.aplicar_flujo_clave = original
+
+    print("Prueba superada con éxito")
+
+
+def probar_varios_hilos_y_agotamiento():
+
+    print("\n----- Prueba de la sesión con varios hilos y con el contador agotado -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    cifrados = []
+    cerrojo = threading.Lock()
+
+    # Con un anillo pequeño los mensajes dan varias vueltas y esperan al productor a mitad de camino
+    with SesionCTR(clave, nonce, capacidad=2048, bytes_por_relleno=512) as sesion:
+        def cifrar_ceros():
+            for _ in range(20):
+                texto_cifrado = sesion.cifrar(bytes(100 + secrets.randbelow(3000)))
+                with cerrojo:
+                    cifrados.append(texto_cifrado)
+
+        hilos = [threading.Thread(target=cifrar_ceros) for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        total = sesion.posicion
+
+    # Cifrar ceros deja el flujo de clave: cada mensaje debe ser un tramo contiguo y juntos deben cubrirlo entero
+    flujo = generar_flujo_clave(clave, nonce, 0, total)
+    tramos = sorted((flujo.find(texto_cifrado), len(texto_cifrado)) for texto_cifrado in cifrados)
+    posicion = 0
+    for desplazamiento, longitud in tramos:
+        assert desplazamiento == posicion, "Un mensaje no recibió un tramo contiguo del flujo de clave"
+        posicion += longitud
+    assert posicion == total, "Los mensajes no cubren el flujo consumido"
+
+    # Con el contador agotado se entrega lo que queda en el anillo y después se informa del agotamiento
+    original = aes_sesion.MASCARA_CONTADOR
+    aes_sesion.MASCARA_CONTADOR = 4096 // 16 - 1
+    try:
+        with SesionCTR(clave, nonce, capacidad=4096, bytes_por_relleno=1024) as sesion:
+            time.sleep(0.05)  # Deja que el productor llegue al final del contador
+            assert sesion.cifrar(bytes(4096)) == generar_flujo_clave(clave, nonce, 0, 4096), "No se entregó el flujo pendiente"
+            try:
+                sesion.cifrar(b"x")
+                assert False, "El contador agotado debería rechazar más mensajes"
+            except ValueError as e:
+                print(f"Prueba pasada. Error esperado: {str(e)}")
+    finally:
+        aes_sesion.MASCARA_CONTADOR = original
+
+    print("Prueba superada con éxito")
+
+
+def probar_latencia():
+
+    print("\n----- Prueba de latencia: sesión con precálculo frente a cifrar_ctr -----")
+    clave = secrets.token_bytes(16)
+    nonce = secrets.token_bytes(8)
+    iteraciones = 200
+
+    for tamaño in (64, 256, 1024):
+        mensaje = secrets.token_bytes(tamaño)
+
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            cifrar_ctr(mensaje, clave, nonce)
+        tiempo_directo = (time.perf_counter() - inicio) / iteraciones
+
+        with SesionCTR(clave, nonce) as sesion:
+            time.sleep(0.05)  # Deja que el productor llene el anillo
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                sesion.cifrar(mensaje)
+            tiempo_sesion = (time.perf_counter() - inicio) / iteraciones
+            esperas = sesion.estadisticas()['esperas']
+
+        print(f"{tamaño:5d} bytes: cifrar_ctr {tiempo_directo * 1e6:8.1f} us, "
+              f"sesión {tiempo_sesion * 1e6:8.1f} us ({tiempo_directo / tiempo_sesion:.2f}x), esperas: {esperas}")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_equivalencia_flujo()
+    probar_no_reutilizacion()
+    probar_abandono_y_fallos()
+    probar_varios_hilos_y_agotamiento()
+    probar_latencia()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
@@ -0,0 +1,91 @@
+import time
+import secrets
+from src.aes.aes_common import expandir_clave, cifrar_bloque_referencia, descifrar_bloque_referencia
+from src.aes.aes_tablas import (
+    expandir_clave_palabras, expandir_clave_descifrado, cifrar_bloque, cifrar_bloques,
+    descifrar_bloque, descifrar_bloques
+)
+
+
+def ejecutar_vectores_prueba():
+
+    print("\n----- Vectores de prueba AES con tablas T -----")
+    # Vector del apéndice C.1 de FIPS-197
+    texto_plano = bytes.fromhex("00112233445566778899aabbccddeeff")
+    clave = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    texto_cifrado_esperado = "69c4e0d86a7b0430d8cdb78070b4c55a"
+    palabras_clave = expandir_clave_palabras(clave)
+    texto_cifrado = cifrar_bloque(texto_plano, palabras_clave)
+    texto_descifrado = descifrar_bloque(texto_cifrado, expandir_clave_descifrado(palabras_clave))
+
+    print(f"Texto cifrado esperado: {texto_cifrado_esperado}")
+    print(f"Texto cifrado real:    {texto_cifrado.hex()}")
+    print(f"Texto descifrado:      {texto_descifrado.hex()}")
+    assert texto_cifrado.hex() == texto_cifrado_esperado, "Fallo en el cifrado con tablas T"
+    assert texto_descifrado == texto_plano, "Fallo en el descifrado con tablas T"
+    print("Prueba superada con éxito")
+
+
+def probar_equivalencia_referencia():
+
+    print("\n----- Prueba de equivalencia con las funciones de ronda -----")
+    iteraciones = 200
+
+    for _ in range(iteraciones):
+        clave = secrets.token_bytes(16)
+        bloque = secrets.token_bytes(16)
+        clave_expandida = expandir_clave(list(clave))
+        palabras_clave = expandir_clave_palabras(clave)
+        esperado = bytes(cifrar_bloque_referencia(list(bloque), clave_expandida))
+        assert cifrar_bloque(bloque, palabras_clave) == esperado, "Las tablas T no coinciden con la referencia"
+        esperado = bytes(descifrar_bloque_referencia(list(bloque), clave_expandida))
+        assert descifrar_bloque(bloque, expandir_clave_descifrado(palabras_clave)) == esperado, "Las tablas Td no coinciden con la referencia"
+
+    print(f"{iteraciones} bloques aleatorios coinciden con la implementación de referencia")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Prueba de tiempo de ejecución: tablas T frente a referencia -----")
+    clave = secrets.token_bytes(16)
+    clave_expandida = expandir_clave(list(clave))
+    palabras_clave = expandir_clave_palabras(clave)
+    palabras_descifrado = expandir_clave_descifrado(palabras_clave)
+    datos = secrets.token_bytes(16 * 1024)
+
+    inicio = time.time()
+    for i in range(0, len(datos), 16):
+        cifrar_bloque_referencia(list(datos[i:i+16]), clave_expandida)
+    tiempo_referencia = time.time() - inicio
+
+    inicio = time.time()
+    cifrar_bloques(datos, palabras_clave)
+    tiempo_tablas = time.time() - inicio
+
+    print(f"Tamaño de entrada: {len(datos)} bytes")
+    print(f"Referencia: {tiempo_referencia:.6f} segundos ({len(datos) / tiempo_referencia / 1024:.1f} KB/s)")
+    print(f"Tablas T:   {tiempo_tablas:.6f} segundos ({len(datos) / tiempo_tablas / 1024:.1f} KB/s)")
+    print(f"Aceleración: {tiempo_referencia / tiempo_tablas:.2f}x")
+
+    inicio = time.time()
+    for i in range(0, len(datos), 16):
+        descifrar_bloque_referencia(list(datos[i:i+16]), clave_expandida)
+    tiempo_referencia = time.time() - inicio
+
+    inicio = time.time()
+    descifrar_bloques(datos, palabras_descifrado)
+    tiempo_tablas = time.time() - inicio
+
+    print(f"Descifrado de referencia: {tiempo_referencia:.6f} segundos ({len(datos) / tiempo_referencia / 1024:.1f} KB/s)")
+    print(f"Descifrado con tablas Td: {tiempo_tablas:.6f} segundos ({len(datos) / tiempo_tablas / 1024:.1f} KB/s)")
+    print(f"Aceleración: {tiempo_referencia / tiempo_tablas:.2f}x")
+
+
+def ejecutar_todas_las_pruebas():
+    ejecutar_vectores_prueba()
+    probar_equivalencia_referencia()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
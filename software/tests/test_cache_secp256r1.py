@@ -0,0 +1,147 @@
+import time
+import secrets
+import threading
+from src.dh import CacheClavesPublicas
+from src.dh.cache_secp256r1 import tamaño_tabla
+from src.dh.secp256r1 import generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1, G, n
+
+
+def probar_equivalencia():
+
+    print("\n----- Prueba de equivalencia de la caché de claves públicas -----")
+    cache = CacheClavesPublicas()
+    pares = [generar_par_claves_secp256r1() for _ in range(5)]
+
+    for _ in range(3):
+        for _, publica in pares:
+            privada = secrets.randbelow(n - 1) + 1
+            assert cache.calcular_secreto_compartido(privada, publica) == \
+                calcular_secreto_compartido_secp256r1(privada, publica), "La caché no coincide con el cálculo directo"
+
+    estadisticas = cache.estadisticas()
+    print(estadisticas)
+    assert (estadisticas.aciertos, estadisticas.fallos, estadisticas.entradas) == (10, 5, 5), "Contadores incorrectos"
+
+    cache.limpiar()
+    assert len(cache) == 0 and cache.estadisticas().fallos == 0, "La caché no se ha vaciado"
+    print("La caché coincide con calcular_secreto_compartido_secp256r1.")
+
+
+def probar_validacion():
+
+    print("\n----- Prueba de validación de la caché de claves públicas -----")
+    cache = CacheClavesPublicas()
+    casos = [
+        (123.45, G, TypeError),
+        (n, G, ValueError),
+        (1, [G[0], G[1]], TypeError),
+        (0, "x", TypeError),
+        (1, (0, 0), ValueError),
+        (1, (G[0], G[1] + 1), ValueError),
+    ]
+
+    for privada, publica, excepcion in casos:
+        try:
+            cache.calcular_secreto_compartido(privada, publica)
+            print("Error: Debería haber rechazado la entrada")
+        except excepcion as e:
+            print(f"Prueba pasada. Error esperado: {str(e)}")
+
+    assert len(cache) == 0, "Una clave inválida no debe quedar en la caché"
+    print("Las claves inválidas no entran en la caché.")
+
+
+def probar_desalojo():
+
+    print("\n----- Prueba de desalojo de la caché de claves públicas -----")
+    publicas = [generar_par_claves_secp256r1()[1] for _ in range(6)]
+
+    cache = CacheClavesPublicas(maximo_entradas=3)
+    for publica in publicas[:3]:
+        cache.obtener_tabla(publica)
+    cache.obtener_tabla(publicas[0])          # publicas[1] pasa a ser la menos reciente
+    cache.obtener_tabla(publicas[3])
+    assert publicas[1] not in cache and publicas[0] in cache, "No se desalojó la entrada menos reciente"
+    assert cache.estadisticas().desalojos == 1, "El desalojo no se ha contado"
+
+    tamaño = tamaño_tabla(publicas[0], cache.obtener_tabla(publicas[0]))
+    cache = CacheClavesPublicas(maximo_bytes=2 * tamaño + tamaño // 2)
+    for publica in publicas:
+        cache.obtener_tabla(publica)
+    estadisticas = cache.estadisticas()
+    print(estadisticas)
+    assert estadisticas.entradas == 2 and estadisticas.memoria <= estadisticas.maximo_bytes, "No se respeta la memoria"
+
+    cache = CacheClavesPublicas(maximo_bytes=tamaño - 1)
+    cache.obtener_tabla(publicas[0])
+    assert len(cache) == 0, "Una tabla que no cabe no debe guardarse"
+
+    print("Prueba superada con éxito")
+
+
+def probar_hilos():
+
+    print("\n----- Prueba de la caché con varios hilos -----")
+    cache = CacheClavesPublicas(maximo_entradas=4)
+    pares = [generar_par_claves_secp256r1() for _ in range(6)]
+    privada = secrets.randbelow(n - 1) + 1
+    esperados = {publica: calcular_secreto_compartido_secp256r1(privada, publica) for _, publica in pares}
+    errores = []
+
+    def trabajar(desplazamiento):
+        for i in range(12):
+            publica = pares[(i + desplazamiento) % len(pares)][1]
+            if cache.calcular_secreto_compartido(privada, publica) != esperados[publica]:
+                errores.append(publica)
+
+    hilos = [threading.Thread(target=trabajar, args=(i,)) for i in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    estadisticas = cache.estadisticas()
+    print(estadisticas)
+    assert not errores, "Un hilo obtuvo un secreto incorrecto"
+    assert estadisticas.aciertos + estadisticas.fallos == 48, "Se han perdido consultas en los contadores"
+    assert estadisticas.entradas <= 4, "Se ha superado el límite de entradas"
+    print("Prueba superada con éxito")
+
+
+def pruebas_rendimiento():
+
+    print("\n----- Rendimiento del ECDH repetido con la caché de claves públicas -----")
+    num_pares = 5
+    repeticiones = 20
+    publicas = [generar_par_claves_secp256r1()[1] for _ in range(num_pares)]
+    privadas = [secrets.randbelow(n - 1) + 1 for _ in range(num_pares * repeticiones)]
+    cache = CacheClavesPublicas()
+    for publica in publicas:
+        cache.obtener_tabla(publica)
+
+    tiempo_inicio = time.perf_counter()
+    for i, privada in enumerate(privadas):
+        calcular_secreto_compartido_secp256r1(privada, publicas[i % num_pares])
+    tiempo_directo = time.perf_counter() - tiempo_inicio
+
+    tiempo_inicio = time.perf_counter()
+    for i, privada in enumerate(privadas):
+        cache.calcular_secreto_compartido(privada, publicas[i % num_pares])
+    tiempo_cache = time.perf_counter() - tiempo_inicio
+
+    print(f"Sin caché: {len(privadas) / tiempo_directo:.2f} secretos por segundo")
+    print(f"Con caché: {len(privadas) / tiempo_cache:.2f} secretos por segundo "
+          f"({tiempo_directo / tiempo_cache:.2f}x, ventana {cache.ventana})")
+    print(f"Memoria por entrada: {cache.estadisticas().memoria // num_pares} bytes")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_equivalencia()
+    probar_validacion()
+    probar_desalojo()
+    probar_hilos()
+    pruebas_rendimiento()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
@@ -0,0 +1,152 @@
+import time
+import secrets
+from src.dh.campo25519 import (P, MASCARA_255, reducir, normalizar, multiplicar, cuadrado, invertir, intercambio_condicional,
+                               escalera_proyectiva, escalera_montgomery)
+
+
+def escalera_referencia(k: int, u: int) -> int:
+
+    # Escalera original: % P tras cada operación, intercambio antes y después de cada paso y pow para invertir
+    x1, x2, z2, x3, z3 = u, 1, 0, u, 1
+
+    for i in reversed(range(256)):
+        kt = (k >> i) & 1
+        x2, z2, x3, z3 = intercambio_condicional(kt, x2, z2, x3, z3)
+        A = (x2 + z2) % P
+        AA = (A * A) % P
+        B = (x2 - z2) % P
+        BB = (B * B) % P
+        E = (AA - BB) % P
+        C = (x3 + z3) % P
+        D = (x3 - z3) % P
+        DA = (D * A) % P
+        CB = (C * B) % P
+        x3 = (DA + CB) % P
+        x3 = (x3 * x3) % P
+        z3 = (DA - CB) % P
+        z3 = (z3 * z3) % P
+        z3 = (z3 * x1) % P
+        x2 = (AA * BB) % P
+        z2 = (E * (AA + 121665 * E % P)) % P
+        x2, z2, x3, z3 = intercambio_condicional(kt, x2, z2, x3, z3)
+
+    return (x2 * pow(z2, P - 2, P)) % P
+
+
+def probar_operaciones():
+
+    print("\n----- Prueba de las operaciones del cuerpo 2^255 - 19 -----")
+
+    for _ in range(1000):
+        a = secrets.randbits(257) - (1 << 256)
+        b = secrets.randbits(257) - (1 << 256)
+        r = reducir(a * b)
+        assert r % P == (a * b) % P, "La reducción no conserva la clase"
+        assert abs(r) < 1 << 256, "La reducción no acota el resultado"
+        assert normalizar(multiplicar(a, b)) == (a * b) % P, "Fallo en el producto"
+        assert normalizar(cuadrado(a)) == (a * a) % P, "Fallo en el cuadrado"
+
+    for _ in range(100):
+        z = secrets.randbelow(P - 1) + 1
+        assert normalizar(invertir(z)) == pow(z, -1, P), "Fallo en la inversión por cadena de adiciones"
+    assert normalizar(invertir(0)) == 0, "El inverso de cero debe ser cero, como pow(0, P - 2, P)"
+
+    print("Prueba superada con éxito")
+
+
+def probar_escalera():
+
+    print("\n----- Prueba de la escalera con reducción perezosa -----")
+    # Secreto compartido de Alice y Bob de RFC 7748, sección 6.1
+    k = int.from_bytes(bytes.fromhex('77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a'), 'little')
+    k = (k & ~7 & ~(1 << 255)) | (1 << 254)
+    u = int.from_bytes(bytes.fromhex('de9edb7d7b7dc1b4d35b61c2ece435373f8343c85b78674dadfc7e146f882b4f'), 'little')
+    esperado = '4a5d9d5ba4ce2de1728e3bf480350f25e07e21c947d19e3376f09b3c1e161742'
+    resultado = escalera_montgomery(k, u).to_bytes(32, 'little').hex()
+    print(f"Resultado esperado: {esperado}")
+    print(f"Resultado real:     {resultado}")
+    assert resultado == esperado, "La escalera no reproduce el vector de RFC 7748"
+
+    for _ in range(200):
+        k = secrets.randbits(256)
+        u = secrets.randbits(256)
+        assert escalera_montgomery(k, u) == escalera_referencia(k, u), "La escalera no coincide con la de referencia"
+
+    print("Prueba superada con éxito")
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Microbenchmarks del cuerpo 2^255 - 19 -----")
+    repeticiones = 20000
+    a = secrets.randbelow(P)
+    producto = a * secrets.randbelow(P)
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        producto % P
+    tiempo_modulo = time.perf_counter() - inicio
+
+    # Los pliegues se escriben en línea, como en la escalera
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        (producto & MASCARA_255) + 19 * (producto >> 255)
+    tiempo_pliegue = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        x = (producto & MASCARA_255) + 19 * (producto >> 255)
+        (x & MASCARA_255) + 19 * (x >> 255)
+    tiempo_dos_pliegues = time.perf_counter() - inicio
+
+    print(f"Reducción de un producto: % P {tiempo_modulo / repeticiones * 1e9:.0f} ns, "
+          f"un pliegue {tiempo_pliegue / repeticiones * 1e9:.0f} ns, "
+          f"dos pliegues {tiempo_dos_pliegues / repeticiones * 1e9:.0f} ns")
+
+    repeticiones = 500
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        pow(a, P - 2, P)
+    tiempo_pow = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        invertir(a)
+    tiempo_cadena = time.perf_counter() - inicio
+
+    print(f"Inversión: pow(z, P - 2, P) {tiempo_pow / repeticiones * 1e6:.1f} µs, "
+          f"cadena de adiciones {tiempo_cadena / repeticiones * 1e6:.1f} µs ({tiempo_pow / tiempo_cadena:.2f}x)")
+
+    repeticiones = 200
+    escalares = [secrets.randbits(256) for _ in range(repeticiones)]
+    u = secrets.randbits(255)
+
+    inicio = time.perf_counter()
+    for k in escalares:
+        escalera_referencia(k, u)
+    tiempo_referencia = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for k in escalares:
+        escalera_proyectiva(k, u)
+    tiempo_proyectiva = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for k in escalares:
+        escalera_montgomery(k, u)
+    tiempo_escalera = time.perf_counter() - inicio
+
+    print(f"Escalera de referencia (% P en cada paso): {tiempo_referencia / repeticiones * 1e3:.3f} ms por secreto")
+    print(f"Escalera con reducción perezosa:           {tiempo_escalera / repeticiones * 1e3:.3f} ms por secreto "
+          f"({tiempo_referencia / tiempo_escalera:.2f}x), de ellos "
+          f"{(tiempo_escalera - tiempo_proyectiva) / repeticiones * 1e3:.3f} ms de inversión")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_operaciones()
+    probar_escalera()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
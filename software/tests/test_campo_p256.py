@@ -0,0 +1,66 @@
+import time
+import secrets
+from src.dh.campo_p256 import P, reducir_solinas, invertir_cadena, invertir_cegado
+from src.dh.secp256r1 import p
+
+
+def probar_operaciones():
+
+    print("\n----- Prueba de las operaciones del cuerpo de P-256 -----")
+    assert P == p, "El primo del cuerpo no coincide con el de la curva"
+
+    for x in [0, 1, P - 1, P, P + 1, (P - 1) ** 2, (1 << 512) - 1]:
+        assert reducir_solinas(x) == x % P, f"Fallo en la reducción de Solinas para {x:x}"
+
+    for _ in range(2000):
+        a = secrets.randbelow(P)
+        b = secrets.randbelow(P)
+        assert reducir_solinas(a * b) == (a * b) % P, "Fallo en la reducción de Solinas"
+
+    for _ in range(100):
+        a = secrets.randbelow(P - 1) + 1
+        assert invertir_cadena(a) == pow(a, -1, P), "Fallo en la inversión por cadena de adiciones"
+        assert invertir_cegado(a) == pow(a, -1, P), "Fallo en la inversión cegada"
+
+    print("Prueba superada con éxito")
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    # Tiempo medio por llamada en microsegundos
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def probar_tiempo_ejecucion():
+
+    print("\n----- Microbenchmarks del cuerpo de P-256 -----")
+    a = secrets.randbelow(P)
+    b = secrets.randbelow(P)
+    producto = a * b
+    repeticiones = 20000
+
+    print(f"Reducción:   % P {_medir(lambda: producto % P, repeticiones):7.3f} µs, "
+          f"Solinas {_medir(lambda: reducir_solinas(producto), repeticiones):7.3f} µs")
+    print(f"Producto:    % P {_medir(lambda: a * b % P, repeticiones):7.3f} µs, "
+          f"Solinas {_medir(lambda: reducir_solinas(a * b), repeticiones):7.3f} µs")
+    print(f"Cuadrado:    % P {_medir(lambda: a * a % P, repeticiones):7.3f} µs, "
+          f"Solinas {_medir(lambda: reducir_solinas(a * a), repeticiones):7.3f} µs")
+
+    repeticiones = 300
+    print(f"Inversión:   pow(x, p - 2, p) {_medir(lambda: pow(a, P - 2, P), repeticiones):7.1f} µs, "
+          f"cadena de adiciones {_medir(lambda: invertir_cadena(a), repeticiones):7.1f} µs, "
+          f"pow(x, -1, p) {_medir(lambda: pow(a, -1, P), repeticiones):7.1f} µs, "
+          f"cegada {_medir(lambda: invertir_cegado(a), repeticiones):7.1f} µs")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_operaciones()
+    probar_tiempo_ejecucion()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()
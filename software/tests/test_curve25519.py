@@ -1,6 +1,8 @@
 import secrets
 import time
 from src.dh.curve25519 import generar_par_claves_25519, calcular_secreto_compartido_25519, x25519, P, ajustar
+from src.dh.curve25519 import x25519_base, recodificar_escalar, tabla_base_edwards
+from src.dh.curve25519 import generar_pares_claves_25519, calcular_secretos_compartidos_25519
 
 
 def prueba_vectores():
@@ -33,6 +35,48 @@ def prueba_vectores():
     print("¡Prueba de vectores pasada con éxito!")
 
 
+def prueba_base_fija():
+
+    print("\n----- Prueba de Multiplicación de Base Fija Curve25519 -----")
+    base = (9).to_bytes(32, 'little')
+    clave_privada_alice = bytes.fromhex('77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a')
+    clave_publica_alice_esperada = bytes.fromhex('8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a')
+    assert x25519_base(clave_privada_alice) == clave_publica_alice_esperada, "La tabla de base fija no reproduce el vector de Alice"
+
+    for _ in range(200):
+        k = secrets.randbits(255)
+        digitos = recodificar_escalar(k)
+        assert sum(d << (4 * i) for i, d in enumerate(digitos)) == k, "La recodificación con signo no conserva el escalar"
+        assert all(-8 <= d <= 8 for d in digitos), "Cifra fuera de rango en la recodificación"
+
+    for clave_privada in [b'\x00' * 32, b'\xff' * 32, b'\x88' * 32] + [secrets.token_bytes(32) for _ in range(200)]:
+        assert x25519_base(clave_privada) == x25519(clave_privada, base), "La clave pública de base fija no coincide con la escalera"
+
+    print("Las claves públicas de base fija coinciden byte a byte con la escalera de Montgomery.")
+
+
+def prueba_lote():
+
+    print("\n----- Prueba de Secretos Compartidos por Lotes Curve25519 -----")
+    pares = [(secrets.token_bytes(32), generar_par_claves_25519()[1]) for _ in range(50)]
+    # u = P equivale a u = 0 sin ser la clave de ceros: su Z final es 0 y no debe estropear el lote
+    pares.insert(10, (secrets.token_bytes(32), P.to_bytes(32, 'little')))
+    esperados = [calcular_secreto_compartido_25519(privada, publica) for privada, publica in pares]
+    assert calcular_secretos_compartidos_25519(pares) == esperados, "Los secretos por lotes no coinciden con los individuales"
+    assert calcular_secretos_compartidos_25519([]) == [], "Un lote vacío debe devolver una lista vacía"
+
+    for clave_privada, clave_publica in generar_pares_claves_25519(50):
+        assert clave_publica == x25519(clave_privada, (9).to_bytes(32, 'little')), "La clave pública por lotes no coincide"
+
+    try:
+        calcular_secretos_compartidos_25519(pares[:3] + [(pares[0][0], b'\x00' * 32)])
+        print("Error: El lote con una clave pública de ceros debería ser rechazado")
+    except ValueError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+    print("Los lotes coinciden byte a byte con las llamadas individuales.")
+
+
 def prueba_integracion():
 
     print("\n----- Prueba de Integración Curve25519 -----")
@@ -116,6 +160,64 @@ def pruebas_rendimiento():
     print(f"Secretos compartidos por segundo: {num_operaciones/tiempo_secreto_compartido:.2f}")
 
 
+def pruebas_rendimiento_base_fija():
+
+    print("\n----- Rendimiento de la Generación de Claves: Base Fija frente a Escalera -----")
+    num_operaciones = 500
+    base = (9).to_bytes(32, 'little')
+    claves = [secrets.token_bytes(32) for _ in range(num_operaciones)]
+
+    tabla_base_edwards.cache_clear()
+    inicio_tiempo = time.perf_counter()
+    tabla_base_edwards()
+    print(f"Construcción de la tabla (una sola vez): {(time.perf_counter() - inicio_tiempo) * 1000:.2f} ms")
+
+    inicio_tiempo = time.perf_counter()
+    for clave in claves:
+        x25519(clave, base)
+    tiempo_escalera = time.perf_counter() - inicio_tiempo
+
+    inicio_tiempo = time.perf_counter()
+    for clave in claves:
+        x25519_base(clave)
+    tiempo_base_fija = time.perf_counter() - inicio_tiempo
+
+    print(f"Escalera de Montgomery: {num_operaciones / tiempo_escalera:.2f} claves por segundo")
+    print(f"Tabla de base fija:     {num_operaciones / tiempo_base_fija:.2f} claves por segundo "
+          f"({tiempo_escalera / tiempo_base_fija:.2f}x)")
+
+
+def pruebas_rendimiento_lote():
+
+    print("\n----- Rendimiento por Lotes Curve25519: una inversión para todo el lote -----")
+    num_operaciones = 300
+    pares = [(secrets.token_bytes(32), generar_par_claves_25519()[1]) for _ in range(num_operaciones)]
+
+    inicio_tiempo = time.perf_counter()
+    for clave_privada, clave_publica in pares:
+        calcular_secreto_compartido_25519(clave_privada, clave_publica)
+    tiempo_individual = time.perf_counter() - inicio_tiempo
+
+    inicio_tiempo = time.perf_counter()
+    calcular_secretos_compartidos_25519(pares)
+    tiempo_lote = time.perf_counter() - inicio_tiempo
+
+    print(f"Secretos uno a uno: {num_operaciones / tiempo_individual:.2f} por segundo")
+    print(f"Secretos por lotes: {num_operaciones / tiempo_lote:.2f} por segundo ({tiempo_individual / tiempo_lote:.2f}x)")
+
+    inicio_tiempo = time.perf_counter()
+    for _ in range(num_operaciones):
+        generar_par_claves_25519()
+    tiempo_individual = time.perf_counter() - inicio_tiempo
+
+    inicio_tiempo = time.perf_counter()
+    generar_pares_claves_25519(num_operaciones)
+    tiempo_lote = time.perf_counter() - inicio_tiempo
+
+    print(f"Pares de claves uno a uno: {num_operaciones / tiempo_individual:.2f} por segundo")
+    print(f"Pares de claves por lotes: {num_operaciones / tiempo_lote:.2f} por segundo ({tiempo_individual / tiempo_lote:.2f}x)")
+
+
 def prueba_manejo_errores():
 
     print("\n----- Prueba de Manejo de Errores Curve25519 -----")
@@ -180,10 +282,14 @@ def prueba_resistencia_timing():
 
 def ejecutar_todas_las_pruebas():
     prueba_vectores()
+    prueba_base_fija()
+    prueba_lote()
     prueba_integracion()
     verificaciones_seguridad()
     prueba_casos_limite()
     pruebas_rendimiento()
+    pruebas_rendimiento_base_fija()
+    pruebas_rendimiento_lote()
     prueba_manejo_errores()
     prueba_multiple_iteracion()
     prueba_resistencia_timing()
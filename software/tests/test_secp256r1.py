@@ -2,10 +2,27 @@ import time
 import secrets
 from src.dh.secp256r1 import (
     generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1, multiplicar_punto_por_escalar,
-    esta_punto_en_curva, sumar_puntos, G, a, b, p, n
+    esta_punto_en_curva, sumar_puntos, G, a, b, p, n, INFINITO,
+    a_jacobiano, a_afin, duplicar_jacobiano, sumar_jacobiano, sumar_mixto, recodificar_regular, VENTANA_POR_DEFECTO,
+    multiplicar_base, tabla_base_fija
 )
 
 
+def multiplicar_afin_referencia(punto, escalar):
+
+    # Doble y suma en coordenadas afines, con una inversión en cada operación
+    resultado = INFINITO
+    actual = punto
+
+    while escalar:
+        if escalar & 1:
+            resultado = sumar_puntos(resultado, actual, a, p)
+        actual = sumar_puntos(actual, actual, a, p)
+        escalar >>= 1
+
+    return resultado
+
+
 def prueba_integracion():
 
     print("\n----- Prueba de Integración Secp256r1 -----")
@@ -74,6 +91,86 @@ def pruebas_casos_limite():
     print("Prueba de multiplicación por orden de la curva exitosa.")
 
 
+def prueba_coordenadas_jacobianas():
+
+    print("\n----- Prueba de Coordenadas Jacobianas Secp256r1 -----")
+    Q = multiplicar_afin_referencia(G, secrets.randbelow(n - 1) + 1)
+    R = multiplicar_afin_referencia(G, secrets.randbelow(n - 1) + 1)
+    menos_Q = (Q[0], p - Q[1])
+    J = a_jacobiano(Q)
+
+    assert a_afin(duplicar_jacobiano(J, a, p), p) == sumar_puntos(Q, Q, a, p), "Duplicación jacobiana incorrecta"
+    assert a_afin(sumar_jacobiano(J, a_jacobiano(R), a, p), p) == sumar_puntos(Q, R, a, p), "Suma jacobiana incorrecta"
+    assert a_afin(sumar_mixto(J, R, a, p), p) == sumar_puntos(Q, R, a, p), "Suma mixta incorrecta"
+    assert a_afin(sumar_mixto(J, Q, a, p), p) == sumar_puntos(Q, Q, a, p), "La suma mixta de un punto consigo mismo debe duplicar"
+    assert a_afin(sumar_mixto(J, menos_Q, a, p), p) == INFINITO, "P + (-P) debe ser el infinito"
+    assert a_afin(sumar_jacobiano(J, a_jacobiano(menos_Q), a, p), p) == INFINITO, "P + (-P) debe ser el infinito"
+
+    for escalar in [1, 2, 3, n - 1, n + 1, 2 * n] + [secrets.randbelow(n) for _ in range(20)]:
+        assert multiplicar_punto_por_escalar(Q, escalar, a, p) == multiplicar_afin_referencia(Q, escalar), \
+            "La multiplicación jacobiana no coincide con la afín"
+
+    print("Las operaciones jacobianas coinciden con las afines.")
+
+
+def prueba_ventana_fija():
+
+    print("\n----- Prueba de Multiplicación con Ventana Fija Secp256r1 -----")
+
+    for ventana in range(1, 8):
+        for _ in range(50):
+            k = secrets.randbelow(n) | 1
+            digitos = recodificar_regular(k, ventana)
+            assert sum(d << (ventana * i) for i, d in enumerate(digitos)) == k, "La recodificación no conserva el escalar"
+            assert all(d & 1 and abs(d) < 1 << ventana for d in digitos), "Cifra no impar o fuera de rango"
+        assert len(recodificar_regular(1, ventana)) == len(recodificar_regular(n - 2, ventana)), "El número de cifras depende del escalar"
+
+        # Escalares pares, cero, n y mayores que n
+        for escalar in [0, 1, 2, n - 1, n, n + 1, 2 * n, secrets.randbelow(n) & ~1, secrets.randbelow(n)]:
+            assert multiplicar_punto_por_escalar(G, escalar, a, p, ventana) == multiplicar_afin_referencia(G, escalar), \
+                f"Fallo con ventana {ventana}"
+
+    # Otra curva (secp256k1, a = 0): el escalar se reduce módulo el orden que se pasa, no módulo n
+    p_k1 = 0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f
+    n_k1 = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
+    G_k1 = (0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
+            0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8)
+    for escalar in [1, 2, n_k1 - 1, n_k1, n_k1 + 5, n, secrets.randbelow(n_k1)]:
+        esperado = INFINITO
+        for bit in bin(escalar % n_k1)[2:]:
+            esperado = sumar_puntos(esperado, esperado, 0, p_k1)
+            if bit == '1':
+                esperado = sumar_puntos(esperado, G_k1, 0, p_k1)
+        assert multiplicar_punto_por_escalar(G_k1, escalar, 0, p_k1, orden=n_k1) == esperado, "Fallo con otra curva"
+    # Sin orden, en otra curva se usa el doble y suma sin reducir el escalar
+    for escalar in [0, 1, 2, 4, 10, 2**200 + 6, n, secrets.randbelow(n_k1), -3]:
+        esperado = INFINITO
+        for bit in bin(abs(escalar))[2:]:
+            esperado = sumar_puntos(esperado, esperado, 0, p_k1)
+            if bit == '1':
+                esperado = sumar_puntos(esperado, G_k1, 0, p_k1)
+        if escalar < 0:
+            esperado = (esperado[0], p_k1 - esperado[1])
+        assert multiplicar_punto_por_escalar(G_k1, escalar, 0, p_k1) == esperado, "Fallo con otra curva sin orden"
+
+    print("La ventana fija coincide con el doble y suma para anchos de 1 a 7.")
+
+
+def prueba_base_fija():
+
+    print("\n----- Prueba de la Tabla de Base Fija Secp256r1 -----")
+    d = 0xC9AFA9D845BA75166B5C215767B1D6934E50C3DB36E89B127B8A622B120F6721
+    Q_esperado = (0x60FED4BA255A9D31C961EB74C6356D68C049B8923B61FA6CE669622E60F29FB6,
+                  0x7903FE1008B8BC99A41AE9E95628BC64F2F1B20C2D7E9F5177A3C294D4462299)
+    assert multiplicar_base(d) == Q_esperado, "La tabla de base fija no reproduce el vector NIST"
+
+    for escalar in [0, 1, 2, 15, 16, 17, n - 2, n - 1, n, n + 1] + [secrets.randbelow(n) for _ in range(100)]:
+        assert multiplicar_base(escalar) == multiplicar_punto_por_escalar(G, escalar, a, p), \
+            "La tabla de base fija no coincide con la multiplicación genérica"
+
+    print("La tabla de base fija coincide con multiplicar_punto_por_escalar(G, k, a, p).")
+
+
 def pruebas_rendimiento():
 
     print("\n----- Pruebas de Rendimiento Secp256r1 -----")
@@ -103,6 +200,70 @@ def pruebas_rendimiento():
     print(f"Cálculos de secreto compartido por segundo: {1/tiempo_promedio:.2f}")
 
 
+def pruebas_rendimiento_coordenadas():
+
+    print("\n----- Rendimiento: Coordenadas Afines frente a Jacobianas Secp256r1 -----")
+    num_operaciones = 20
+    escalares = [secrets.randbelow(n - 1) + 1 for _ in range(num_operaciones)]
+
+    tiempo_inicio = time.perf_counter()
+    for escalar in escalares:
+        multiplicar_afin_referencia(G, escalar)
+    tiempo_afin = time.perf_counter() - tiempo_inicio
+
+    tiempo_inicio = time.perf_counter()
+    for escalar in escalares:
+        multiplicar_punto_por_escalar(G, escalar, a, p)
+    tiempo_jacobiano = time.perf_counter() - tiempo_inicio
+
+    print(f"Afín (una inversión por operación): {tiempo_afin / num_operaciones * 1000:.3f} ms por multiplicación")
+    print(f"Jacobiana (una inversión al final): {tiempo_jacobiano / num_operaciones * 1000:.3f} ms por multiplicación "
+          f"({tiempo_afin / tiempo_jacobiano:.2f}x)")
+
+
+def pruebas_rendimiento_ventanas():
+
+    print("\n----- Rendimiento del Secreto Compartido según el Ancho de Ventana Secp256r1 -----")
+    num_operaciones = 20
+    clave_privada, _ = generar_par_claves_secp256r1()
+    _, clave_publica = generar_par_claves_secp256r1()
+
+    for ventana in range(1, 8):
+        tiempo_inicio = time.perf_counter()
+        for _ in range(num_operaciones):
+            calcular_secreto_compartido_secp256r1(clave_privada, clave_publica, ventana)
+        tiempo_total = time.perf_counter() - tiempo_inicio
+        marca = " (por defecto)" if ventana == VENTANA_POR_DEFECTO else ""
+        print(f"Ventana {ventana}: {tiempo_total / num_operaciones * 1000:.3f} ms por secreto, "
+              f"{num_operaciones / tiempo_total:.2f} secretos por segundo{marca}")
+
+
+def pruebas_rendimiento_base_fija():
+
+    print("\n----- Rendimiento de la Generación de Claves con Base Fija Secp256r1 -----")
+    num_operaciones = 100
+    escalares = [secrets.randbelow(n - 1) + 1 for _ in range(num_operaciones)]
+
+    tabla_base_fija.cache_clear()
+    tiempo_inicio = time.perf_counter()
+    tabla_base_fija()
+    print(f"Construcción de la tabla (una sola vez): {(time.perf_counter() - tiempo_inicio) * 1000:.2f} ms")
+
+    tiempo_inicio = time.perf_counter()
+    for escalar in escalares:
+        multiplicar_punto_por_escalar(G, escalar, a, p)
+    tiempo_generico = time.perf_counter() - tiempo_inicio
+
+    tiempo_inicio = time.perf_counter()
+    for escalar in escalares:
+        multiplicar_base(escalar)
+    tiempo_base_fija = time.perf_counter() - tiempo_inicio
+
+    print(f"Multiplicación genérica por G: {num_operaciones / tiempo_generico:.2f} pares de claves por segundo")
+    print(f"Tabla de base fija:            {num_operaciones / tiempo_base_fija:.2f} pares de claves por segundo "
+          f"({tiempo_generico / tiempo_base_fija:.2f}x)")
+
+
 def prueba_manejo_errores():
 
     print("\n----- Prueba de Manejo de Errores Secp256r1 -----")
@@ -119,6 +280,12 @@ def prueba_manejo_errores():
     except ValueError as e:
         print(f"Prueba pasada. Error esperado: {str(e)}")
 
+    try:
+        calcular_secreto_compartido_secp256r1(0, "x")  # El tipo de la clave pública se comprueba antes que el rango
+        print("Error: Debería haber rechazado una clave pública que no es una tupla")
+    except TypeError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
     try:
         calcular_secreto_compartido_secp256r1(secrets.randbelow(n), (0, 0))
         print("Error: Debería haber rechazado un punto en el infinito como clave pública")
@@ -162,7 +329,13 @@ def ejecutar_todas_las_pruebas():
     verificaciones_seguridad()
     prueba_vectores_nist()
     pruebas_casos_limite()
+    prueba_coordenadas_jacobianas()
+    prueba_ventana_fija()
+    prueba_base_fija()
     pruebas_rendimiento()
+    pruebas_rendimiento_coordenadas()
+    pruebas_rendimiento_ventanas()
+    pruebas_rendimiento_base_fija()
     prueba_manejo_errores()
     prueba_resistencia_timing()
 
@@ -0,0 +1,108 @@
+import os
+import time
+from src.dh import ServicioECDH
+from src.dh.servicio_ecdh import dividir_trozos
+from src.dh.curve25519 import generar_par_claves_25519, calcular_secreto_compartido_25519, x25519_base
+from src.dh.secp256r1 import generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1
+
+
+def probar_division_trozos():
+
+    print("\n----- Prueba de reparto de los lotes -----")
+
+    for cantidad, trabajadores in [(10, 3), (3, 8), (1000, 4), (0, 2)]:
+        rangos = dividir_trozos(cantidad, trabajadores)
+        cubiertos = [i for inicio, fin in rangos for i in range(inicio, fin)]
+        tamaños = [fin - inicio for inicio, fin in rangos]
+        assert cubiertos == list(range(cantidad)), f"Los trozos no cubren {cantidad} elementos"
+        assert not tamaños or max(tamaños) - min(tamaños) <= 1, "Los trozos no están equilibrados"
+        print(f"{cantidad} elementos con {trabajadores} trabajadores: {len(rangos)} trozos de {sorted(set(tamaños))}")
+
+
+def probar_equivalencia_25519():
+
+    print("\n----- Prueba de equivalencia del servicio Curve25519 -----")
+    pares_locales = [generar_par_claves_25519() for _ in range(20)]
+    pares = [(privada, pares_locales[(i + 1) % 20][1]) for i, (privada, _) in enumerate(pares_locales)]
+
+    with ServicioECDH('25519', trabajadores=2) as servicio:
+        esperados = [calcular_secreto_compartido_25519(privada, publica) for privada, publica in pares]
+        assert servicio.calcular_secretos_compartidos(pares) == esperados, "Los secretos del servicio no coinciden"
+
+        privada, publica = pares[0]
+        assert servicio.enviar_secreto(privada, publica).result() == esperados[0], "Fallo en el futuro del secreto"
+
+        privada, publica = servicio.enviar_par_claves().result()
+        assert x25519_base(privada) == publica, "El par de claves del futuro no es coherente"
+        for privada, publica in servicio.generar_pares_claves(9):
+            assert x25519_base(privada) == publica, "Un par de claves generado en lote no es coherente"
+
+        try:
+            servicio.enviar_secreto(privada, b'\x00' * 32).result()
+            print("Error: La clave pública de ceros debería ser rechazada")
+        except ValueError as e:
+            print(f"Prueba pasada. Error esperado: {str(e)}")
+
+    print("El servicio coincide con el cálculo en el proceso principal.")
+
+
+def probar_equivalencia_secp256r1():
+
+    print("\n----- Prueba de equivalencia del servicio secp256r1 -----")
+    pares_locales = [generar_par_claves_secp256r1() for _ in range(6)]
+    pares = [(privada, pares_locales[(i + 1) % 6][1]) for i, (privada, _) in enumerate(pares_locales)]
+
+    with ServicioECDH('secp256r1', trabajadores=2) as servicio:
+        esperados = [calcular_secreto_compartido_secp256r1(privada, publica) for privada, publica in pares]
+        assert servicio.calcular_secretos_compartidos(pares) == esperados, "Los secretos del servicio no coinciden"
+        assert len(servicio.generar_pares_claves(3)) == 3, "No se generaron todos los pares de claves"
+
+    try:
+        ServicioECDH('p384')
+        print("Error: Una curva desconocida debería ser rechazada")
+    except ValueError as e:
+        print(f"Prueba pasada. Error esperado: {str(e)}")
+
+    print("El servicio coincide con el cálculo en el proceso principal.")
+
+
+def probar_rendimiento():
+
+    print("\n----- Rendimiento: intercambios por segundo frente a número de trabajadores -----")
+    # Un intercambio es lo que hace cada extremo: generar su par de claves y calcular el secreto
+    nucleos = os.cpu_count() or 1
+    print(f"Núcleos disponibles: {nucleos}")
+
+    for curva, generar, calcular, intercambios in [
+        ('25519', generar_par_claves_25519, calcular_secreto_compartido_25519, 400),
+        ('secp256r1', generar_par_claves_secp256r1, calcular_secreto_compartido_secp256r1, 40),
+    ]:
+        inicio = time.perf_counter()
+        pares = [generar() for _ in range(intercambios)]
+        for i, (privada, _) in enumerate(pares):
+            calcular(privada, pares[(i + 1) % intercambios][1])
+        tiempo_serie = time.perf_counter() - inicio
+        print(f"{curva:9s} en el proceso principal: {intercambios / tiempo_serie:9.2f} intercambios/s")
+
+        for trabajadores in sorted({1, 2, nucleos, 2 * nucleos}):
+            with ServicioECDH(curva, trabajadores) as servicio:
+                servicio.generar_pares_claves(trabajadores)  # Espera a que arranquen los trabajadores
+                inicio = time.perf_counter()
+                pares = servicio.generar_pares_claves(intercambios)
+                servicio.calcular_secretos_compartidos(
+                    [(privada, pares[(i + 1) % intercambios][1]) for i, (privada, _) in enumerate(pares)]
+                )
+                tiempo = time.perf_counter() - inicio
+            print(f"{curva:9s} con {trabajadores:2d} trabajadores:    {intercambios / tiempo:9.2f} intercambios/s "
+                  f"({tiempo_serie / tiempo:.2f}x)")
+
+
+def ejecutar_todas_las_pruebas():
+    probar_division_trozos()
+    probar_equivalencia_25519()
+    probar_equivalencia_secp256r1()
+    probar_rendimiento()
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()